@@ -1,14 +1,10 @@
 import os
-import pandas as pd
 import numpy as np
-import time
 from datetime import datetime
-import feedparser
 import ssl
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import sys
+import time
 from dotenv import load_dotenv
-from supabase import create_client
 
 # --- 1. CONFIGURATION & CLOUD HANDSHAKE ---
 load_dotenv()  # Loads variables from .env
@@ -16,22 +12,56 @@ load_dotenv()  # Loads variables from .env
 # Supabase Credentials
 URL = os.getenv("SUPABASE_URL")
 KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(URL, KEY)
 
 # Local Path Management (Institutional Backup)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 LOGS_DIR = os.path.normpath(os.path.join(BASE_DIR, "../../../../logs"))
-LOG_PATH = os.path.join(LOGS_DIR, "integrated_audit.csv")
+AUDIT_DIR = os.path.join(LOGS_DIR, "integrated_audit")
+
+# Shared engine modules (feed crawler, audit store, governance, metrics)
+ENGINE_DIR = os.path.normpath(os.path.join(BASE_DIR, "../../../../engine/scripts"))
+sys.path.insert(0, ENGINE_DIR)
+from startup import Lazy, StartupProfile, preload
+from feed_crawler import FeedCrawler, published_epoch
+from governance import DivergenceGovernance, ai_market_state
+from metrics import timer, incr, start_exporter
+from signal_bus import SignalBus
+from inference_cache import HeadlineCache
+from sentiment_pipeline import SentimentPipeline, ALL, DESK_PER_FEED
 
 if not os.path.exists(LOGS_DIR):
     os.makedirs(LOGS_DIR, exist_ok=True)
 
-# --- 2. AI SETUP (FinBERT) ---
+profile = StartupProfile("ai_sentinel")
+
+def connect_vault():
+    from supabase import create_client
+    return create_client(URL, KEY)
+
+supabase = Lazy(connect_vault, "vault", profile)
+
+# --- 2. AI SETUP (FinBERT, loaded lazily from a local snapshot) ---
 if hasattr(ssl, '_create_unverified_context'):
     ssl._create_default_https_context = ssl._create_unverified_context
 
-tokenizer = AutoTokenizer.from_pretrained("ProsusAI/finbert")
-model = AutoModelForSequenceClassification.from_pretrained("ProsusAI/finbert")
+MODEL_ID = "ProsusAI/finbert"
+SNAPSHOT_DIR = os.path.join(LOGS_DIR, "finbert_snapshot")
+
+# CPU Inference Backend: eager | int8 | onnx
+BACKEND = os.getenv("FINBERT_BACKEND", "eager")
+THREADS = int(os.getenv("FINBERT_THREADS", "0")) or None
+ONNX_PATH = os.path.join(LOGS_DIR, "finbert.onnx")
+
+def load_finbert():
+    from finbert_backends import load_backend, load_pretrained
+    tokenizer, model = load_pretrained(MODEL_ID, SNAPSHOT_DIR)
+    return load_backend(BACKEND, tokenizer, model, threads=THREADS, export_path=ONNX_PATH)
+
+finbert = Lazy(load_finbert, "model", profile)
+
+# Headline -> probability cache: RSS feeds barely change between polls
+CACHE_PATH = os.path.join(LOGS_DIR, "finbert_cache.sqlite")
+headline_cache = HeadlineCache(f"{MODEL_ID}:{BACKEND}", capacity=4096, path=CACHE_PATH)
 
 FEEDS = {
     'Yahoo Finance': "https://finance.yahoo.com/news/rssindex",
@@ -40,75 +70,120 @@ FEEDS = {
 }
 
 # --- 3. GOVERNANCE LOGIC ---
-class HumanGovernance:
-    def __init__(self):
-        self.anomaly_counter = 0
-        self.cooldown_active = False
-        self.cooldown_start_time = None
-        self.cooldown_duration = 300 
-
-    def evaluate_risk(self, market_state, sentiment_score):
-        if self.cooldown_active:
-            elapsed = time.time() - self.cooldown_start_time
-            if elapsed < self.cooldown_duration:
-                return f"⛔ LOCK ACTIVE. [{int(self.cooldown_duration-elapsed)}s]"
-            self.cooldown_active = False
-            self.anomaly_counter = 0
-
-        # Divergence Logic: High volatility without high sentiment
-        if market_state == "ANOMALY" and abs(sentiment_score) < 0.2:
-            self.anomaly_counter += 2 
-        elif market_state == "ANOMALY":
-            self.anomaly_counter += 1
-        else:
-            self.anomaly_counter = max(0, self.anomaly_counter - 1)
-
-        if self.anomaly_counter >= 5:
-            self.cooldown_active = True
-            self.cooldown_start_time = time.time()
-            return "🚨 ALERT: SYSTEM LOCKING - High Divergence Detected."
-        
-        return "🟢 State: Nominal"
+HumanGovernance = DivergenceGovernance
 
-def get_live_sentiment():
+crawler = FeedCrawler(FEEDS, timeout=8.0, index_path=os.path.join(LOGS_DIR, "feed_index.sqlite"))
+
+def fetch_headlines():
     headlines = []
-    for url in FEEDS.values():
-        try:
-            feed = feedparser.parse(url)
-            headlines.extend([entry.title for entry in feed.entries[:3]])
-        except: continue
-    
+    for feed in crawler.crawl_sync().values():
+        headlines.extend(feed.titles[:DESK_PER_FEED])
+    return headlines
+
+def fetch_new_headlines(seed=False):
+    """One crawl: every headline not seen before (every current one when seeding) with its
+    publish time, plus the top headlines per feed the divergence desk scores."""
+    now = time.time()
+    titles, times, current = [], [], []
+    for feed in crawler.crawl_sync().values():
+        current.extend(feed.titles[:DESK_PER_FEED])
+        for entry in (feed.latest if seed else feed.new):
+            titles.append(entry['title'])
+            times.append(published_epoch(entry.get('published'), now))
+    return titles, times, current
+
+def run_finbert(headlines):
+    """Probability rows [positive, negative, neutral] for each headline (waits for the warm-up if needed)."""
+    return finbert.get().predict(headlines)
+
+# Per-asset, time-decayed sentiment over every new headline (micro-batched FinBERT)
+pipeline = SentimentPipeline(run_finbert, cache=headline_cache, max_batch=32, max_latency=0.05)
+
+def score_headlines(headlines, cache=headline_cache):
     if not headlines: return 0.0
-    
-    inputs = tokenizer(headlines, padding=True, truncation=True, return_tensors='pt')
-    with torch.no_grad():
-        outputs = model(**inputs)
-        probs = torch.nn.functional.softmax(outputs.logits, dim=-1)
-    
-    avg_pos = probs[:, 0].mean().item()
-    avg_neg = probs[:, 1].mean().item()
-    return round(avg_pos - avg_neg, 4)
+
+    if cache is None:
+        probs = run_finbert(headlines)
+    else:
+        known, missing = cache.lookup(headlines)
+        incr("finbert.cache_hits", len(headlines) - len(missing))
+        if missing:
+            incr("finbert.cache_misses", len(missing))
+            fresh = dict(zip(missing, run_finbert(missing)))
+            cache.store(fresh)
+            known.update(fresh)
+        probs = [known[h] for h in headlines]
+
+    probs = np.asarray(probs)
+    avg_pos = probs[:, 0].mean()
+    avg_neg = probs[:, 1].mean()
+    return round(float(avg_pos - avg_neg), 4)
+
+def get_live_sentiment(seed=False):
+    """Ingests the crawl's new headlines into the per-asset book; returns the desk's score,
+    the plain mean over the current top headlines (what its thresholds were tuned on)."""
+    with timer("sentiment"):
+        titles, times, current = fetch_new_headlines(seed)
+        pipeline.ingest(titles, times)
+        return pipeline.crawl_mean(current).get(ALL, {}).get("sentiment", 0.0)
+
+def verify_cache_parity():
+    """Scores the live headlines cold, warm and uncached; all three must agree."""
+    headlines = fetch_headlines()
+    probe = HeadlineCache(f"{MODEL_ID}:{BACKEND}")
+    cold, warm = score_headlines(headlines, probe), score_headlines(headlines, probe)
+    uncached = score_headlines(headlines, cache=None)
+    print(f"Uncached: {uncached} | Cold cache: {cold} | Warm cache: {warm} | {probe.stats}")
+    return abs(uncached - warm) <= 1e-4 and cold == warm
 
 # --- 4. MAIN ENGINE EXECUTION ---
 def run_sentinel_prime():
+    startup = profile
+    startup.mark("imports")
+    # torch/transformers and the model load while the first crawl runs; fully cached
+    # headlines are scored before the model is even ready
+    finbert.warm()
+    preload("supabase")
+    import pyarrow as pa
+    from forensic_store import ForensicStore
     gov = HumanGovernance()
+    audit = ForensicStore(AUDIT_DIR, {
+        "timestamp": pa.string(),
+        "z_score": pa.float64(),
+        "sentiment": pa.float64(),
+        "state": pa.string(),
+        "governance": pa.string()
+    }, flush_rows=10)
+    asset_audit = ForensicStore(os.path.join(LOGS_DIR, "asset_sentiment"), {
+        "timestamp": pa.string(),
+        "asset": pa.string(),
+        "sentiment": pa.float64(),
+        "weight": pa.float64(),
+        "headlines": pa.int64()
+    }, flush_rows=50)
     print(f"\n{'='*60}\n{'SENTINEL PRIME v2.0 | CLOUD-INTEGRATED ENGINE':^60}\n{'='*60}")
     print(f"📡 Cloud Node: {URL}")
-    print(f"📁 Local Backup: {LOG_PATH}\n")
+    print(f"📁 Local Backup: {AUDIT_DIR}\n")
+    start_exporter("ai_sentinel")
+    signals = SignalBus().subscribe()
+    startup.mark("setup")
 
     while True:
         # A. Quant Telemetry
         mock_z = np.random.uniform(0, 4.0) 
-        market_state = "ANOMALY" if mock_z > 3.0 else "STRESS" if mock_z > 2.0 else "STABLE"
+        market_state = ai_market_state(mock_z)
         
-        # B. AI Narrative Analysis
-        sentiment_score = get_live_sentiment()
+        # B. AI Narrative Analysis (first cycle seeds the book with every current headline)
+        sentiment_score = get_live_sentiment(seed=startup is not None)
         
         # C. Governance Decision
         report = gov.evaluate_risk(market_state, sentiment_score)
         ts = datetime.now().strftime("%H:%M:%S")
 
         print(f"[{ts}] Market: {market_state} ({mock_z:.2f}) | Sentiment: {sentiment_score}")
+        print(f"🧠 FinBERT Cache: {headline_cache.stats} | Batches: {pipeline.batcher.stats}")
+        asset_rows = pipeline.rows(ts)
+        print("📰 " + " | ".join(f"{r['asset']}: {r['sentiment']:+.3f} ({r['headlines']})" for r in asset_rows))
         print(f"👉 {report}")
 
         # D. Cloud Data Payload (Supabase)
@@ -121,20 +196,37 @@ def run_sentinel_prime():
         }
 
         # E. Dual Persistence Strategy
+        # 1. Local Backup (buffered columnar store; kept even when the cloud push fails)
+        audit.append(cloud_data)
+        for row in asset_rows:
+            asset_audit.append(row)
         try:
-            # 1. Push to Supabase
-            supabase.table("sentinel_logs").insert(cloud_data).execute()
+            # 2. Push to Supabase
+            with timer("cloud_insert"):
+                supabase.get().table("sentinel_logs").insert(cloud_data).execute()
             print("☁️ Sync Successful: Cloud Vault Updated.")
-            
-            # 2. Local Backup (CSV)
-            log_entry = pd.DataFrame([cloud_data])
-            log_entry.to_csv(LOG_PATH, mode='a', index=False, header=not os.path.exists(LOG_PATH))
-            
         except Exception as e:
+            incr("cloud_insert.errors")
             print(f"⚠️ Persistence Error: {e}")
+        if asset_rows:
+            try:  # Separate push: a vault without sentiment_by_asset (engine/sql/003) keeps sentinel_logs
+                with timer("cloud_insert"):
+                    supabase.get().table("sentiment_by_asset").insert(asset_rows).execute()
+            except Exception as e:
+                incr("cloud_insert.asset_errors")
+                print(f"⚠️ Asset Sentiment Persistence Error: {e}")
+
+        if startup is not None:
+            startup.mark("first_cycle")
+            startup.report()
+            startup = None
 
         print("-" * 60)
-        time.sleep(30)
+        signal = signals.sleep(30)
+        if signal:
+            print(f"⚡ KILL-SWITCH SIGNAL #{signal.seq}: {signal.level} ({signal.reason})")
 
 if __name__ == "__main__":
+    if "--verify-cache" in sys.argv:
+        sys.exit(0 if verify_cache_parity() else 1)
     run_sentinel_prime()
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""
+FinBERT Backend Benchmark
+Headlines/s, p50/p99 cycle latency and score drift vs fp32 eager for each CPU backend.
+Usage: python bench_finbert_backends.py [--backends eager,int8,onnx] [--threads 4] [--cycles 50] [--batch 9]
+"""
+import argparse
+import os
+import time
+import numpy as np
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from finbert_backends import load_backend
+
+MODEL_ID = "ProsusAI/finbert"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ONNX_PATH = os.path.normpath(os.path.join(BASE_DIR, "../../../../logs/finbert.onnx"))
+
+SAMPLE_HEADLINES = [
+    "Gold hits record high as dollar slides on rate-cut bets",
+    "Silver futures tumble after stronger-than-expected jobs data",
+    "Bitcoin rallies past key resistance as ETF inflows accelerate",
+    "Central bank signals patience, markets shrug",
+    "Sanctions on major producer rattle metals markets",
+    "Mining output steady in third quarter, company says",
+    "Geopolitical tensions push investors toward safe havens",
+    "Crypto exchange halts withdrawals amid liquidity crisis",
+    "Indian gold ETF demand climbs ahead of festival season",
+    "Treasury yields edge lower as inflation cools for a third month",
+    "Conflict escalation sends oil and gold sharply higher while equities sink across Asia and Europe",
+    "Quarterly earnings beat estimates on robust trading revenue",
+]
+
+
+def score(probs):
+    probs = np.asarray(probs)
+    return probs[:, 0].mean() - probs[:, 1].mean()
+
+
+def bench(backend, headlines, cycles, batch):
+    latencies = []
+    for c in range(cycles):
+        chunk = [headlines[(c * batch + i) % len(headlines)] for i in range(batch)]
+        t0 = time.perf_counter()
+        backend.predict(chunk)
+        latencies.append(time.perf_counter() - t0)
+    lat = np.array(latencies) * 1000
+    return cycles * batch / lat.sum() * 1000, np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main(args):
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
+    headlines = SAMPLE_HEADLINES
+    reference = None
+    print(f"{'backend':<8} | {'headlines/s':>11} | {'p50 ms':>8} | {'p99 ms':>8} | {'max |dp|':>9} | {'score drift':>11}")
+    for name in args.backends.split(","):
+        model = AutoModelForSequenceClassification.from_pretrained(MODEL_ID)
+        backend = load_backend(name, tokenizer, model, threads=args.threads, export_path=ONNX_PATH)
+        probs = np.asarray(backend.predict(headlines))
+        if reference is None:
+            fp32 = load_backend("eager", tokenizer, AutoModelForSequenceClassification.from_pretrained(MODEL_ID),
+                                threads=args.threads, warmup=False)
+            reference = np.asarray(fp32.predict(headlines))
+        rate, p50, p99 = bench(backend, headlines, args.cycles, args.batch)
+        drift = np.abs(probs - reference).max()
+        print(f"{name:<8} | {rate:>11.1f} | {p50:>8.2f} | {p99:>8.2f} | {drift:>9.5f} | {score(probs) - score(reference):>+11.5f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backends", default="eager,int8,onnx")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--cycles", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=9, help="Headlines per cycle (live loop scores 9)")
+    main(parser.parse_args())
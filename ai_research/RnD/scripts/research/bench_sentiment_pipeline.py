@@ -0,0 +1,110 @@
+"""
+Sentiment Pipeline Benchmark
+Pushes bursts of synthetic headlines (100 .. 2000 per cycle) through SentimentPipeline
+with a FinBERT stand-in whose forward pass costs a fixed overhead plus a per padded
+token slot, and compares against the previous path (every headline in one padded call).
+Reports headlines/s, batches, headline latency and the per-asset routing split.
+Usage: python bench_sentiment_pipeline.py [--volumes 100 500 2000] [--overhead 0.004] [--per-slot 0.00002]
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from sentiment_pipeline import SentimentPipeline, MicroBatcher, approx_tokens, LENGTH_BUCKETS
+
+SUBJECTS = ["Gold", "Silver", "Bitcoin", "Crypto markets", "MCX gold", "Rupee", "Oil", "Treasury yields",
+            "Equities", "The dollar", "Spot bitcoin ETF flows", "Precious metals", "Comex silver"]
+VERBS = ["rallies", "slides", "steadies", "jumps", "falls", "rebounds", "extends losses", "hits record"]
+TAILS = ["as traders weigh central bank guidance", "after inflation data", "on safe-haven demand",
+         "amid geopolitical tension in the Middle East and renewed sanctions talk", "ahead of the Fed decision",
+         "as investors rotate out of risk assets following a sharp selloff in technology stocks and bonds"]
+
+
+def synthetic_headlines(n, seed):
+    rng = random.Random(seed)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(TAILS)} ({seed}-{i})" for i in range(n)]
+
+
+class CostModelFinbert:
+    """predict() sleeps overhead + batch x padded length x per_slot, like a CPU forward pass."""
+
+    def __init__(self, overhead, per_slot):
+        self.overhead = overhead
+        self.per_slot = per_slot
+        self.calls = 0
+
+    def predict(self, headlines):
+        self.calls += 1
+        longest = max(approx_tokens(h) for h in headlines)
+        padded = next((b for b in LENGTH_BUCKETS if longest <= b), LENGTH_BUCKETS[-1])
+        time.sleep(self.overhead + len(headlines) * padded * self.per_slot)
+        rng = random.Random(hash(headlines[0]))
+        return [[p, q, 1 - p - q] for p, q in ((rng.uniform(0, 0.6), rng.uniform(0, 0.4)) for _ in headlines)]
+
+
+def legacy(headlines, model):
+    """Previous path: one padded call with every headline, one global mean."""
+    start = time.perf_counter()
+    probs = model.predict(headlines)
+    score = sum(p - q for p, q, _ in probs) / len(probs)
+    return time.perf_counter() - start, score
+
+
+def latencies(batcher, headlines):
+    """Per-headline submit -> result latency through the batcher."""
+    done = []
+    start = time.perf_counter()
+    for f in [batcher.submit(h) for h in headlines]:
+        f.add_done_callback(lambda _f: done.append(time.perf_counter() - start))
+    while len(done) < len(headlines):
+        time.sleep(0.001)
+    return sorted(done)
+
+
+def run(volume, args):
+    headlines = synthetic_headlines(volume, seed=volume)
+    old_model = CostModelFinbert(args.overhead, args.per_slot)
+    legacy_s, _ = legacy(headlines, old_model)
+
+    model = CostModelFinbert(args.overhead, args.per_slot)
+    pipeline = SentimentPipeline(model.predict, max_batch=args.max_batch, max_latency=args.max_latency)
+    start = time.perf_counter()
+    pipeline.ingest(headlines)
+    elapsed = time.perf_counter() - start
+    snapshot = pipeline.snapshot()
+    stats = dict(pipeline.batcher.stats)
+    pipeline.close()
+
+    batcher = MicroBatcher(CostModelFinbert(args.overhead, args.per_slot).predict,
+                           max_batch=args.max_batch, max_latency=args.max_latency)
+    lat = latencies(batcher, synthetic_headlines(volume, seed=volume + 1))
+    batcher.close()
+
+    router = pipeline.router
+    t0 = time.perf_counter()
+    for h in headlines:
+        router.route(h)
+    route_us = (time.perf_counter() - t0) / volume * 1e6
+    return {
+        "headlines": volume,
+        "pipeline_headlines_per_s": round(volume / elapsed, 1),
+        "legacy_headlines_per_s": round(volume / legacy_s, 1),
+        "batches": stats["batches"],
+        "mean_batch": round(stats["headlines"] / max(stats["batches"], 1), 1),
+        "headline_latency_p50_ms": round(statistics.median(lat) * 1000, 1),
+        "headline_latency_max_ms": round(lat[-1] * 1000, 1),
+        "route_us_per_headline": round(route_us, 2),
+        "coverage": {a: agg["headlines"] for a, agg in sorted(snapshot.items())},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--volumes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--overhead", type=float, default=0.004, help="Fixed cost per forward pass (s)")
+    parser.add_argument("--per-slot", type=float, default=0.00002, help="Cost per padded token slot (s)")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-latency", type=float, default=0.05)
+    args = parser.parse_args()
+    print(json.dumps([run(v, args) for v in args.volumes], indent=2))
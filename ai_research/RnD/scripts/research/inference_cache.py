@@ -0,0 +1,71 @@
+"""
+Headline Inference Cache v1.0
+Content-addressed FinBERT results: sha256(model + normalized headline) -> probability vector.
+In-memory LRU tier, optionally backed by a SQLite tier that survives restarts.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+
+def headline_key(text, model_id):
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{model_id}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class HeadlineCache:
+    """Only headlines absent from both tiers need to go through the tokenizer and model."""
+
+    def __init__(self, model_id, capacity=4096, path=None):
+        self.model_id = model_id
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS probs (key TEXT PRIMARY KEY, vec TEXT NOT NULL)")
+            self.db.commit()
+
+    def _remember(self, key, vec):
+        self.memory[key] = vec
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def lookup(self, headlines):
+        """Returns ({headline: vec} for known headlines, [headlines still to score])."""
+        found, missing = {}, []
+        for text in dict.fromkeys(headlines):
+            key = headline_key(text, self.model_id)
+            vec = self.memory.get(key)
+            if vec is not None:
+                self.memory.move_to_end(key)
+                self.stats["hits"] += 1
+            elif self.db is not None:
+                row = self.db.execute("SELECT vec FROM probs WHERE key = ?", (key,)).fetchone()
+                if row:
+                    vec = json.loads(row[0])
+                    self._remember(key, vec)
+                    self.stats["disk_hits"] += 1
+            if vec is None:
+                self.stats["misses"] += 1
+                missing.append(text)
+            else:
+                found[text] = vec
+        return found, missing
+
+    def store(self, scored):
+        """scored: {headline: probability vector (list of floats)}."""
+        rows = []
+        for text, vec in scored.items():
+            key = headline_key(text, self.model_id)
+            self._remember(key, vec)
+            rows.append((key, json.dumps(vec)))
+        if self.db is not None and rows:
+            self.db.executemany("INSERT OR REPLACE INTO probs (key, vec) VALUES (?, ?)", rows)
+            self.db.commit()
@@ -0,0 +1,287 @@
+"""
+Micro-Batched Sentiment Pipeline v1.0
+Turns every new headline of a crawl (hundreds per cycle, not the top 3 per feed) into
+per-asset sentiment:
+  - a keyword index routes each headline to the assets it mentions (XAU, XAG, BTC, MCX)
+  - cache misses stream through a micro-batcher that groups headlines by token length
+    and flushes a group when it is full or its oldest headline has waited max_latency
+  - each asset keeps an exponentially time-decayed mean of its headline scores (pos - neg)
+"ALL" aggregates every headline, routed or not. The divergence desk keeps its own input:
+crawl_mean() is the plain mean over the headlines currently on the feeds (top 3 per feed),
+so its +2 threshold (|score| < 0.2) reads the same scale it was calibrated on.
+"""
+import math
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    from metrics import incr, observe
+except ImportError:  # Standalone research runs without engine/scripts on sys.path: metrics off
+    def incr(name, n=1):
+        pass
+
+    def observe(name, seconds):
+        pass
+
+LENGTH_BUCKETS = (16, 32, 64, 128)  # Same as finbert_backends.DEFAULT_BUCKETS: one padded shape per group
+HALF_LIFE = 1800.0                  # Seconds for a headline's weight to halve
+ALL = "ALL"
+DESK_PER_FEED = 3                   # Headlines per feed behind the divergence desk's score
+
+# Lower-case words and phrases (up to two words) -> assets
+ASSET_KEYWORDS = {
+    "XAU": ["gold", "bullion", "xau", "comex gold", "gold price", "gold futures", "precious metals"],
+    "XAG": ["silver", "xag", "comex silver", "silver price", "silver futures", "precious metals"],
+    "BTC": ["bitcoin", "btc", "crypto", "cryptocurrency", "cryptocurrencies", "spot bitcoin", "bitcoin etf"],
+    "MCX_GOLD": ["mcx", "goldbees", "mcx gold", "indian gold", "gold etf", "rbi", "rupee", "sensex", "nifty"],
+    "MCX_SILVER": ["mcx", "silverbees", "mcx silver", "indian silver", "silver etf", "rbi", "rupee"],
+}
+
+_WORD = re.compile(r"[a-z0-9$]+")
+_DRAIN = object()  # Inbox marker: the submitter is waiting, flush every partial bucket now
+
+
+def approx_tokens(text):
+    """WordPiece length estimate (~4/3 pieces per word plus [CLS]/[SEP]), no tokenizer needed."""
+    return len(text.split()) * 4 // 3 + 2
+
+
+# --- 1. ASSET ROUTING ---
+class AssetRouter:
+    """Keyword index over unigrams and bigrams: routing costs a few dict lookups per word."""
+
+    def __init__(self, keywords=ASSET_KEYWORDS):
+        self.index = {}
+        for asset, words in keywords.items():
+            for word in words:
+                self.index.setdefault(word.lower(), set()).add(asset)
+        self.assets = tuple(keywords)
+
+    def route(self, headline):
+        words = _WORD.findall(headline.lower())
+        hits = set()
+        for i, word in enumerate(words):
+            hits.update(self.index.get(word, ()))
+            if i:
+                hits.update(self.index.get(f"{words[i - 1]} {word}", ()))
+        return hits
+
+
+# --- 2. MICRO-BATCHER ---
+class MicroBatcher:
+    """
+    Background thread in front of a batch predictor. Headlines wait in per-length-bucket
+    queues; a bucket goes to the model when it holds max_batch headlines or its oldest one
+    has waited max_latency seconds, so each forward pass pads to one short shape.
+    """
+
+    def __init__(self, predict, max_batch=32, max_latency=0.05, buckets=LENGTH_BUCKETS, length=approx_tokens):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.buckets = tuple(sorted(buckets))
+        self.length = length
+        self.stats = {"batches": 0, "headlines": 0, "full": 0, "timed_out": 0, "drained": 0}
+        self._inbox = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._thread.start()
+
+    def _bucket(self, text):
+        n = self.length(text)
+        for b in self.buckets:
+            if n <= b:
+                return b
+        return self.buckets[-1]
+
+    def submit(self, headline):
+        """Future resolving to the probability row [positive, negative, neutral]."""
+        future = Future()
+        self._inbox.put((headline, future))
+        return future
+
+    def score(self, headlines):
+        """Blocking burst: the tail is flushed right away instead of waiting out max_latency."""
+        futures = [self.submit(h) for h in headlines]
+        self._inbox.put(_DRAIN)
+        return [f.result() for f in futures]
+
+    def _flush(self, pending, bucket, reason):
+        items = pending.pop(bucket)
+        self.stats["batches"] += 1
+        self.stats["headlines"] += len(items)
+        self.stats[reason] += 1
+        incr("sentiment.batches")
+        observe("sentiment.queue_wait", time.perf_counter() - items[0][2])
+        try:
+            probs = self.predict([h for h, _, _ in items])
+        except Exception as e:
+            for _, future, _ in items:
+                future.set_exception(e)
+            return
+        for (_, future, _), row in zip(items, probs):
+            future.set_result(row)
+
+    def _run(self):
+        pending = {}  # bucket -> [(headline, future, enqueued_at)], oldest first
+        while True:
+            deadline = min((items[0][2] + self.max_latency for items in pending.values()), default=None)
+            try:
+                timeout = None if deadline is None else max(deadline - time.perf_counter(), 0.0)
+                item = self._inbox.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            # Take everything already queued before deciding what to flush
+            while item is not False:
+                if item is None or item is _DRAIN:
+                    for bucket in list(pending):
+                        self._flush(pending, bucket, "drained")
+                    if item is None:
+                        return
+                    item = False
+                    continue
+                headline, future = item
+                bucket = self._bucket(headline)
+                pending.setdefault(bucket, []).append((headline, future, time.perf_counter()))
+                if len(pending[bucket]) >= self.max_batch:
+                    self._flush(pending, bucket, "full")
+                try:
+                    item = self._inbox.get_nowait()
+                except queue.Empty:
+                    item = False
+            now = time.perf_counter()
+            for bucket in [b for b, items in pending.items() if now - items[0][2] >= self.max_latency]:
+                self._flush(pending, bucket, "timed_out")
+
+    def close(self):
+        """Flushes whatever is still queued, then stops the thread."""
+        self._inbox.put(None)
+        self._thread.join()
+
+
+# --- 3. TIME-DECAYED AGGREGATES ---
+class _Decayed:
+    __slots__ = ("total", "weight", "headlines", "stamp")
+
+    def __init__(self, stamp):
+        self.total = self.weight = 0.0
+        self.headlines = 0
+        self.stamp = stamp
+
+    def decay_to(self, t, rate):
+        if t > self.stamp:
+            f = math.exp(-rate * (t - self.stamp))
+            self.total *= f
+            self.weight *= f
+            self.stamp = t
+
+
+class DecayedSentiment:
+    """
+    Per-asset sum of headline scores and weights, both decaying with half_life.
+    The reported mean is total / (weight + prior). With the default prior of 0 decay only
+    reweights: recent headlines count more, and the mean keeps the scale of one headline.
+    A positive prior is opt-in shrinkage: thin coverage reads closer to neutral, and an
+    asset drifts back to 0 as its coverage ages out.
+    """
+
+    def __init__(self, half_life=HALF_LIFE, prior=0.0, clock=time.time):
+        self.rate = math.log(2) / half_life
+        self.prior = prior
+        self.clock = clock
+        self.assets = {}
+
+    def add(self, asset, score, t):
+        agg = self.assets.get(asset)
+        if agg is None:
+            agg = self.assets[asset] = _Decayed(t)
+        if t >= agg.stamp:
+            agg.decay_to(t, self.rate)
+            agg.total += score
+            agg.weight += 1.0
+        else:  # Older than the aggregate (first crawl backfill): enter pre-decayed
+            w = math.exp(-self.rate * (agg.stamp - t))
+            agg.total += score * w
+            agg.weight += w
+        agg.headlines += 1
+
+    def snapshot(self, now=None):
+        """{asset: {"sentiment", "weight", "headlines"}} decayed to now."""
+        now = self.clock() if now is None else now
+        out = {}
+        for asset, agg in self.assets.items():
+            agg.decay_to(now, self.rate)
+            out[asset] = {"sentiment": round(agg.total / (agg.weight + self.prior), 4),
+                          "weight": round(agg.weight, 3), "headlines": agg.headlines}
+        return out
+
+
+# --- 4. PIPELINE ---
+class SentimentPipeline:
+    """Cache lookup -> micro-batched FinBERT for the misses -> routing -> decayed per-asset book."""
+
+    def __init__(self, predict, cache=None, router=None, book=None, clock=time.time, **batcher):
+        self.cache = cache
+        self.router = router or AssetRouter()
+        self.book = book or DecayedSentiment(clock=clock)
+        self.clock = clock
+        self.batcher = MicroBatcher(predict, **batcher)
+
+    def _scores(self, headlines):
+        """{headline: pos - neg} for unique headlines (cache first, misses through the batcher)."""
+        known, missing = self.cache.lookup(list(headlines)) if self.cache is not None else ({}, list(headlines))
+        incr("finbert.cache_hits", len(headlines) - len(missing))
+        if missing:
+            incr("finbert.cache_misses", len(missing))
+            fresh = dict(zip(missing, self.batcher.score(missing)))
+            if self.cache is not None:
+                self.cache.store(fresh)
+            known.update(fresh)
+        return {h: known[h][0] - known[h][1] for h in headlines}
+
+    def ingest(self, headlines, times=None):
+        """Scores and routes a burst of headlines (times: epoch per headline, default now)."""
+        now = self.clock()
+        times = times or [now] * len(headlines)
+        unique = dict(zip(headlines, times))
+        if not unique:
+            return 0
+        t0 = time.perf_counter()
+        scores = self._scores(list(unique))
+        for headline, t in unique.items():
+            score = scores[headline]
+            self.book.add(ALL, score, t)
+            for asset in self.router.route(headline):
+                self.book.add(asset, score, t)
+        observe("sentiment.ingest", time.perf_counter() - t0)
+        incr("sentiment.headlines", len(unique))
+        return len(unique)
+
+    def crawl_mean(self, headlines):
+        """Divergence desk input: {asset: {"sentiment", "headlines"}} as the plain, undecayed
+        mean of pos - neg over the given headlines (the current crawl); the book is untouched."""
+        if not headlines:
+            return {}
+        scores = self._scores(list(dict.fromkeys(headlines)))
+        by_asset = {ALL: []}
+        for headline in headlines:
+            by_asset[ALL].append(scores[headline])
+            for asset in self.router.route(headline):
+                by_asset.setdefault(asset, []).append(scores[headline])
+        return {asset: {"sentiment": round(float(sum(s) / len(s)), 4), "headlines": len(s)}
+                for asset, s in by_asset.items()}
+
+    def snapshot(self, now=None):
+        return self.book.snapshot(now)
+
+    def score(self, asset=ALL, now=None):
+        return self.snapshot(now).get(asset, {}).get("sentiment", 0.0)
+
+    def rows(self, timestamp, now=None):
+        """sentiment_by_asset rows, one per asset with coverage."""
+        return [{"timestamp": timestamp, "asset": asset, **agg} for asset, agg in self.snapshot(now).items()]
+
+    def close(self):
+        self.batcher.close()
@@ -0,0 +1,92 @@
+"""
+Dashboard Load Test
+Simulated browser sessions against a local vault stand-in: legacy per-rerun queries
+(last 100 rows + latest sentiment) vs the shared TelemetryPoller snapshot.
+Usage: python bench_dashboard_poller.py [--sessions 12] [--seconds 10] [--refresh 1.0] [--latency 0.03]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from telemetry_poller import TelemetryPoller
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(BASE_DIR, "../../../../engine/scripts")))
+from local_vault import LocalVault
+
+ASSETS = ["BTC", "XAU", "XAG", "MCX_GOLD", "MCX_SILVER"]
+
+
+def legacy_rerun(vault):
+    """What every session did on every rerun before the shared poller."""
+    rows = vault.table("multi_asset_telemetry").select("*").order("timestamp", desc=True).limit(100).execute().data
+    vault.table("sentinel_logs").select("sentiment").order("id", desc=True).limit(1).execute()
+    return pd.DataFrame(rows)
+
+
+def engine_writer(vault, stop, hz, writes):
+    """Stand-in for MultiAssetPulse + sentiment sentinel writing into the vault (no simulated latency)."""
+    i = 0
+    while not stop.is_set():
+        ts = datetime.now(timezone.utc).isoformat()
+        vault._apply(vault.table("multi_asset_telemetry").insert(
+            [{"asset": a, "price": 100.0 + i, "regime": "STABLE", "z_score": 0.0, "timestamp": ts} for a in ASSETS]))
+        vault._apply(vault.table("sentinel_logs").insert({"sentiment": 0.1, "timestamp": ts}))
+        writes[0] += 2
+        i += 1
+        time.sleep(1.0 / hz)
+
+
+def run_sessions(label, render, sessions, seconds, refresh):
+    latencies, lock = [], threading.Lock()
+
+    def session():
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            t0 = time.perf_counter()
+            render()
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+            time.sleep(refresh)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    lat = np.array(latencies) * 1000
+    return f"{label:<14} | reruns {len(lat):>5} | p50 {np.percentile(lat, 50):8.2f} ms | p99 {np.percentile(lat, 99):8.2f} ms"
+
+
+def main(args):
+    for mode in ("legacy", "shared poller"):
+        vault = LocalVault(latency=args.latency, is_async=False)
+        stop, writes = threading.Event(), [0]
+        writer = threading.Thread(target=engine_writer, args=(vault, stop, args.write_hz, writes), daemon=True)
+        writer.start()
+        time.sleep(0.5)
+        if mode == "legacy":
+            line = run_sessions(mode, lambda: legacy_rerun(vault), args.sessions, args.seconds, args.refresh)
+        else:
+            poller = TelemetryPoller(vault, interval=args.refresh).start()
+            line = run_sessions(mode, poller.snapshot, args.sessions, args.seconds, args.refresh)
+        stop.set()
+        writer.join()
+        print(f"{line} | vault reads {vault.requests - writes[0]:,}")
+        if mode != "legacy":
+            frame = poller.snapshot()[0]
+            print(f"{'':<14} | snapshot rows {len(frame):,} across {frame['asset'].nunique()} assets | {poller.stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--refresh", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--write-hz", type=float, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,40 @@
+"""
+Chart Downsampling Benchmark
+Render-side cost of each chart range: raw points vs LTTB / min-max reduced to a fixed budget.
+Usage: python bench_downsample.py [--budget 1500] [--sizes 10000,100000,1000000,3000000]
+"""
+import argparse
+import json
+import time
+import numpy as np
+from downsample import lttb, minmax, regime_changes
+
+
+def payload_bytes(x, y):
+    return len(json.dumps({"x": x.tolist(), "y": y.tolist()}))
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    print(f"{'points':>10} | {'method':<7} | {'out pts':>7} | {'ms':>8} | {'payload KB':>10} | {'raw payload KB':>14}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        x = np.arange(n, dtype=np.int64) * 30_000_000_000  # 30 s ticks, ns epoch
+        y = 100 + rng.normal(0, 0.05, n).cumsum()
+        regimes = np.where(np.abs(rng.normal(size=n)) > 3.0, "ANOMALY", "STABLE")
+        raw_kb = payload_bytes(x[:min(n, 200_000)], y[:min(n, 200_000)]) * n / min(n, 200_000) / 1024
+        for name, fn in (("lttb", lambda: lttb(x, y, args.budget)), ("minmax", lambda: minmax(y, args.budget // 2))):
+            t0 = time.perf_counter()
+            idx = fn()
+            ms = (time.perf_counter() - t0) * 1000
+            print(f"{n:>10,} | {name:<7} | {len(idx):>7} | {ms:>8.1f} | {payload_bytes(x[idx], y[idx]) / 1024:>10.1f}"
+                  f" | {raw_kb:>14,.0f}")
+        t0 = time.perf_counter()
+        changes = regime_changes(regimes)
+        print(f"{'':>10} | regime shifts: {len(changes):,} in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--sizes", default="10000,100000,1000000,3000000")
+    main(parser.parse_args())
@@ -2,10 +2,12 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import os
-import time
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 from supabase import create_client
+from telemetry_poller import TelemetryPoller
+from telemetry_history import read_history
+from downsample import lttb, regime_changes
 
 # --- 0. PAGE ARCHITECTURE ---
 st.set_page_config(
@@ -31,35 +33,57 @@ def get_supabase():
 supabase = get_supabase()
 
 # --- 2. DATA FUSION ENGINES ---
-# Added 'nocache' parameter to force fresh data every refresh_rate
+# One poller per server process: it pulls only new rows (id cursor) into per-asset
+# ring buffers, and every session renders that shared snapshot.
+@st.cache_resource
+def get_poller():
+    return TelemetryPoller(supabase, interval=5.0).start()
+
 def fetch_telemetry():
-    try:
-        response = supabase.table("multi_asset_telemetry")\
-            .select("*")\
-            .order("timestamp", desc=True)\
-            .limit(100).execute()
-        return pd.DataFrame(response.data)
-    except Exception:
-        return pd.DataFrame()
+    return get_poller().snapshot()[0]
 
 def fetch_sentiment():
-    try:
-        # Step 1: Query by ID (assuming it's an auto-incrementing primary key)
-        # This is the most reliable way to get the "Last In" row
-        response = supabase.table("sentinel_logs")\
-            .select("sentiment")\
-            .order("id", desc=True)\
-            .limit(1).execute()
-        
-        if response.data:
-            # Step 2: Extract the score
-            score = response.data[0].get('sentiment', 0.5)
-            return float(score)
-        return 0.5
-    except Exception as e:
-        # Step 3: Minimal error reporting for your eyes only during the demo
-        # st.sidebar.error(f"Sync Lag: {e}") 
-        return 0.5
+    return get_poller().snapshot()[1]
+
+def fetch_asset_sentiment():
+    return get_poller().asset_sentiment()
+
+# Long-horizon chart mode: history is pulled once a minute per (asset, range) for all
+# sessions, then reduced server-side to a fixed point budget before it reaches the browser.
+# Past the raw retention window it comes from the 5-minute / 1-hour bar tables.
+CHART_RANGES = {"Live": None, "1h": 1, "1d": 24, "30d": 24 * 30}
+CHART_POINTS = 1500
+MAX_REGIME_MARKERS = 200
+MAX_REGIME_LABELS = 20
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_history(asset, hours):
+    return read_history(supabase, asset, hours)  # Failures raise, so they are never cached
+
+def regime_color(regime):
+    regime = str(regime).upper()
+    return "#2E7D32" if "STABLE" in regime else "#F57C00" if "STRESS" in regime else "#C62828"
+
+def build_chart(df_plot, title, line_color):
+    """LTTB-downsampled price line with regime changes overlaid as markers and labels."""
+    df_plot = df_plot.sort_values('timestamp')
+    ts = pd.to_datetime(df_plot['timestamp'], utc=True, format='ISO8601')
+    price = df_plot['price'].to_numpy(dtype=float)
+    keep = lttb(ts.astype('int64').to_numpy(), price, CHART_POINTS)
+
+    fig = px.line(x=ts.iloc[keep], y=price[keep], title=title, template="plotly_dark",
+                  color_discrete_sequence=[line_color], labels={"x": "timestamp", "y": "price"})
+    if 'regime' in df_plot:
+        regimes = df_plot['regime'].astype(str).to_numpy()
+        changes = regime_changes(regimes)[-MAX_REGIME_MARKERS:]
+        if len(changes):
+            fig.add_scatter(x=ts.iloc[changes], y=price[changes], mode="markers", name="Regime shift",
+                            hovertext=regimes[changes],
+                            marker=dict(size=8, color=[regime_color(r) for r in regimes[changes]]))
+            for i in changes[-MAX_REGIME_LABELS:]:
+                fig.add_annotation(x=ts.iloc[i], y=price[i], text=regimes[i], showarrow=True,
+                                   arrowhead=1, font=dict(size=9, color=regime_color(regimes[i])))
+    return fig
 
 # --- 3. SYSTEM HEALTH LOGIC ---
 def check_system_health(df):
@@ -72,65 +96,90 @@ def check_system_health(df):
         return "ENGINE LAG", "#F57C00"
     return "SYSTEM LIVE", "#2E7D32"
 
-# --- DATA EXECUTION ---
-df_full = fetch_telemetry()
-ai_score = fetch_sentiment()
+def sentiment_color(score):
+    return "#C62828" if score < 0.45 else "#2E7D32" if score > 0.55 else "#F57C00"
 
 # --- SIDEBAR: GOVERNANCE ---
 st.sidebar.header("🛡️ SYSTEM GOVERNANCE")
-
-status_text, status_color = check_system_health(df_full)
-st.sidebar.markdown(f"""
-    <div style="background-color:{status_color}; padding:10px; border-radius:8px; text-align:center; color:white; font-weight:bold;">
-        📡 {status_text}
-    </div>
-    """, unsafe_allow_html=True)
-
-st.sidebar.markdown("---")
-
-# 🤖 AI SENTINEL GAUGE
-st.sidebar.subheader("🤖 AI SENTINEL")
-# Color logic for sentiment
-s_color = "#C62828" if ai_score < 0.45 else "#2E7D32" if ai_score > 0.55 else "#F57C00"
-
-st.sidebar.metric("Sentiment Pulse (FinBERT)", f"{ai_score:.4f}")
-st.sidebar.markdown(f"""
-    <div style="width: 100%; background-color: #424242; border-radius: 5px; margin-top:10px;">
-        <div style="width: {min(max((ai_score + 1) / 2 * 100, 0), 100)}%; background-color: {s_color}; height: 8px; border-radius: 5px;"></div>
-    </div>
-    """, unsafe_allow_html=True)
-
+governance_panel = st.sidebar.container()
 st.sidebar.markdown("---")
 refresh_rate = st.sidebar.select_slider("Telemetry Sync (s)", options=[5, 10, 30, 60], value=10)
 
-# --- MAIN DASHBOARD ---
-st.title("🛰️ SENTINEL PRIME : UNIFIED RISK COMMAND")
+# --- AUTO-REFRESH ---
+# The live panels are fragments re-run every refresh_rate seconds off the shared poller
+# snapshot; only widget changes rerun the whole script.
+@st.fragment(run_every=refresh_rate)
+def render_governance():
+    status_text, status_color = check_system_health(fetch_telemetry())
+    st.markdown(f"""
+        <div style="background-color:{status_color}; padding:10px; border-radius:8px; text-align:center; color:white; font-weight:bold;">
+            📡 {status_text}
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # 🤖 AI SENTINEL GAUGE
+    ai_score = fetch_sentiment()
+    st.subheader("🤖 AI SENTINEL")
+    st.metric("Sentiment Pulse (FinBERT)", f"{ai_score:.4f}")
+    st.markdown(f"""
+        <div style="width: 100%; background-color: #424242; border-radius: 5px; margin-top:10px;">
+            <div style="width: {min(max((ai_score + 1) / 2 * 100, 0), 100)}%; background-color: {sentiment_color(ai_score)}; height: 8px; border-radius: 5px;"></div>
+        </div>
+        """, unsafe_allow_html=True)
+
+@st.fragment(run_every=refresh_rate)
+def render_command(asset_focus, chart_range):
+    df_full = fetch_telemetry()
+    asset_scores = fetch_asset_sentiment()
+    if df_full.empty:
+        st.info("🔄 Establishing Cloud Handshake... Check local engine status.")
+        return
+    if asset_focus is None:
+        st.rerun()  # First data since the page loaded: the whole script builds the asset pickers
 
-if not df_full.empty:
     # 🌍 Heatmap
     latest_pulses = df_full.drop_duplicates(subset=['asset'])
     h_cols = st.columns(len(latest_pulses))
-    
+
     for i, (_, row) in enumerate(latest_pulses.iterrows()):
         with h_cols[i]:
             regime = str(row.get('regime', 'SYNCING')).upper()
             reg_color = "#2E7D32" if "STABLE" in regime else "#F57C00" if "STRESS" in regime else "#C62828"
+            score, n_headlines = asset_scores.get(row['asset'], (None, 0))
+            news_line = f"<br><small>FinBERT {score:+.3f} · {n_headlines} headlines</small>" if score is not None else ""
             st.markdown(f"""
                 <div style="background-color:{reg_color}; padding:12px; border-radius:8px; text-align:center; color:white;">
-                    <small>{row['asset']}</small><br><strong>{regime}</strong>
+                    <small>{row['asset']}</small><br><strong>{regime}</strong>{news_line}
                 </div>
                 """, unsafe_allow_html=True)
 
     # 📈 Charting
-    asset_focus = st.sidebar.selectbox("Focus Asset", latest_pulses['asset'].unique())
-    df_plot = df_full[df_full['asset'] == asset_focus]
-    
-    fig = px.line(df_plot, x='timestamp', y='price', title=f"{asset_focus} Real-time Telemetry",
-                  template="plotly_dark", color_discrete_sequence=[s_color])
-    st.plotly_chart(fig, use_container_width=True)
-else:
-    st.info("🔄 Establishing Cloud Handshake... Check local engine status.")
+    if CHART_RANGES[chart_range] is None:
+        df_plot = df_full[df_full['asset'] == asset_focus]
+        title = f"{asset_focus} Real-time Telemetry"
+    else:
+        try:
+            df_plot = fetch_history(asset_focus, CHART_RANGES[chart_range])
+        except Exception as e:
+            print(f"⚠️ History fetch failed ({asset_focus}, {chart_range}): {e!r}")
+            st.warning(f"⚠️ {chart_range} history for {asset_focus} is unavailable: {e}")
+            df_plot = pd.DataFrame()
+        title = f"{asset_focus} Telemetry | Last {chart_range}"
+
+    if not df_plot.empty:
+        st.plotly_chart(build_chart(df_plot, title, sentiment_color(fetch_sentiment())), use_container_width=True)
+
+with governance_panel:
+    render_governance()
 
-# --- AUTO-REFRESH ---
-time.sleep(refresh_rate)
-st.rerun()
\ No newline at end of file
+# --- MAIN DASHBOARD ---
+st.title("🛰️ SENTINEL PRIME : UNIFIED RISK COMMAND")
+
+df_full = fetch_telemetry()
+asset_focus = chart_range = None
+if not df_full.empty:
+    asset_focus = st.sidebar.selectbox("Focus Asset", df_full['asset'].unique())
+    chart_range = st.sidebar.radio("Chart Range", list(CHART_RANGES), horizontal=True)
+render_command(asset_focus, chart_range)
@@ -0,0 +1,58 @@
+"""
+Chart Downsampling v1.0
+Shape-preserving reduction of long price series to a fixed point budget before they
+reach the browser: LTTB (Largest-Triangle-Three-Buckets) and min/max bucketing.
+"""
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Indices of the LTTB-selected points (first and last always kept). x must be ascending."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n-2 interior points, split into threshold-2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Average point of every bucket, used as the "next" vertex of the triangle
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    out = np.empty(threshold, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nx, ny = avg_x[i + 1], avg_y[i + 1]
+        # Twice the triangle area for every candidate in the bucket (constant factor irrelevant)
+        area = np.abs((x[a] - nx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (ny - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax(y, buckets):
+    """Indices of each bucket's min and max (in time order): keeps every spike, ~2*buckets points."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+    size = -(-n // buckets)
+    # Pad the tail bucket with its last value so every bucket is one reshape row
+    padded = np.pad(y, (0, size * buckets - n), mode="edge").reshape(buckets, size)
+    base = np.arange(buckets) * size
+    idx = np.concatenate([base + padded.argmin(axis=1), base + padded.argmax(axis=1)])
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def regime_changes(regimes):
+    """Positions where the regime label differs from the previous row."""
+    r = np.asarray(regimes)
+    if len(r) < 2:
+        return np.array([], dtype=np.int64)
+    return np.flatnonzero(r[1:] != r[:-1]) + 1
@@ -0,0 +1,73 @@
+"""
+Telemetry History Reader v1.0
+Chart history across the retention tiers (engine/scripts/retention.py): raw ticks are
+kept for RAW_DAYS only, then live on as 5-minute bars and, past BAR_DAYS, 1-hour bars.
+A range is read coarsest tier first, and each finer tier starts where the previous one
+ends, so the series has no gap or overlap whatever retention's lag. Past RAW_DAYS a
+range costs bar rows, not raw ticks.
+"""
+from datetime import datetime, timezone
+import pandas as pd
+
+RAW_DAYS = 7       # Mirrors retention.RAW_DAYS
+DAY = 86400
+PAGE = 1000
+# Bar tables, coarsest first: (table, bucket width in seconds)
+BAR_TIERS = (("telemetry_bars_1h", 3600), ("telemetry_bars_5m", 300))
+COLUMNS = ["timestamp", "price", "regime"]
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _epoch(value):
+    ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _bar_regime(bar):
+    """Worst regime seen inside the bar."""
+    if bar.get("anomaly"):
+        return "ANOMALY"
+    if bar.get("stress"):
+        return "STRESS"
+    return "STABLE" if bar.get("stable") else "INITIALIZING"
+
+
+def _paged(client, table, columns, asset, time_col, since):
+    """Every row of `asset` with time_col >= since, id-ordered, PAGE rows per request."""
+    rows, cursor = [], 0
+    while True:
+        page = client.table(table).select(f"id, {columns}").eq("asset", asset).gte(time_col, _iso(since)) \
+            .gt("id", cursor).order("id").limit(PAGE).execute().data
+        rows.extend(page)
+        if len(page) < PAGE:
+            return rows
+        cursor = page[-1]["id"]
+
+
+def read_history(client, asset, hours, now=None, raw_days=RAW_DAYS):
+    """DataFrame (timestamp, price, regime) of `asset` over the last `hours`, oldest first.
+    Vault errors propagate to the caller."""
+    now = datetime.now(timezone.utc).timestamp() if now is None else now
+    since = now - hours * 3600
+    frames = []
+    if hours * 3600 > raw_days * DAY:
+        for table, width in BAR_TIERS:
+            bars = _paged(client, table, "bucket, close, stable, stress, anomaly", asset, "bucket", since)
+            if not bars:
+                continue
+            bars.sort(key=lambda b: b["bucket"])
+            frames.append(pd.DataFrame({"timestamp": [b["bucket"] for b in bars],
+                                        "price": [b["close"] for b in bars],
+                                        "regime": [_bar_regime(b) for b in bars]}))
+            since = max(since, _epoch(bars[-1]["bucket"]) + width)
+    ticks = _paged(client, "multi_asset_telemetry", "timestamp, price, regime", asset, "timestamp", since)
+    if ticks:
+        frames.append(pd.DataFrame(ticks, columns=["id", *COLUMNS]).sort_values("id")[COLUMNS])
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    return pd.concat(frames, ignore_index=True)
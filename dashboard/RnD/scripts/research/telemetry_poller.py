@@ -0,0 +1,124 @@
+"""
+Shared Telemetry Poller v1.0
+One background thread per Streamlit process pulls only rows newer than the last
+seen id into per-asset ring buffers; every browser session renders the same snapshot.
+Per-asset FinBERT sentiment (sentiment_by_asset) follows the same id cursor; a failed
+read of it (e.g. a vault without engine/sql/003) never holds back the telemetry.
+"""
+import collections
+import threading
+import time
+import pandas as pd
+
+
+class TelemetryPoller:
+    def __init__(self, client, interval=5.0, per_asset=2000, backfill=1000, page=1000):
+        self.client = client
+        self.interval = interval
+        self.backfill = backfill
+        self.page = page
+        self.buffers = collections.defaultdict(lambda: collections.deque(maxlen=per_asset))
+        self.last_id = None
+        self.last_sentiment_id = None
+        self.sentiment = 0.5
+        self.last_asset_sentiment_id = None
+        self.by_asset = {}
+        self.frame = pd.DataFrame()
+        self.version = 0
+        self.stats = {"polls": 0, "requests": 0, "rows": 0, "errors": 0, "asset_sentiment_errors": 0}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    # --- Background side ---
+    def start(self):
+        if self._thread is None:
+            self.poll_once()
+            self._thread = threading.Thread(target=self._loop, name="telemetry-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll_once()
+
+    def _query(self, table, columns="*"):
+        self.stats["requests"] += 1
+        return self.client.table(table).select(columns)
+
+    def _fetch_new_telemetry(self):
+        if self.last_id is None:
+            # Cold start: newest rows first, then keep a cursor on the id
+            rows = self._query("multi_asset_telemetry").order("id", desc=True).limit(self.backfill).execute().data
+            return rows[::-1]
+        # Pages advance a local cursor; self.last_id only moves in poll_once once the
+        # whole batch is buffered, so a failed page is re-read on the next poll
+        rows, cursor = [], self.last_id
+        while True:
+            page = self._query("multi_asset_telemetry").gt("id", cursor).order("id") \
+                .limit(self.page).execute().data
+            rows.extend(page)
+            if page:
+                cursor = page[-1]["id"]
+            if len(page) < self.page:
+                return rows
+
+    def _fetch_sentiment(self):
+        query = self._query("sentinel_logs", "id, sentiment").order("id", desc=True).limit(1)
+        if self.last_sentiment_id is not None:
+            query = query.gt("id", self.last_sentiment_id)
+        data = query.execute().data
+        if data:
+            self.last_sentiment_id = data[0]["id"]
+            self.sentiment = float(data[0].get("sentiment", 0.5))
+            return True
+        return False
+
+    def _fetch_asset_sentiment(self):
+        query = self._query("sentiment_by_asset", "id, asset, sentiment, headlines")
+        if self.last_asset_sentiment_id is None:
+            rows = query.order("id", desc=True).limit(self.page).execute().data[::-1]
+        else:
+            rows = query.gt("id", self.last_asset_sentiment_id).order("id").limit(self.page).execute().data
+        if not rows:
+            return False
+        self.last_asset_sentiment_id = rows[-1]["id"]
+        by_asset = dict(self.by_asset)
+        for row in rows:  # Oldest first: the newest reading per asset wins
+            by_asset[row["asset"]] = (float(row["sentiment"]), int(row.get("headlines") or 0))
+        self.by_asset = by_asset
+        return True
+
+    def poll_once(self):
+        self.stats["polls"] += 1
+        try:
+            rows = self._fetch_new_telemetry()
+            sentiment_changed = self._fetch_sentiment()
+        except Exception:
+            self.stats["errors"] += 1
+            return
+        try:
+            sentiment_changed |= self._fetch_asset_sentiment()
+        except Exception:
+            self.stats["asset_sentiment_errors"] += 1
+        if rows:
+            self.last_id = max(self.last_id or 0, rows[-1]["id"])
+            for row in rows:
+                self.buffers[row["asset"]].append(row)
+            self.stats["rows"] += len(rows)
+        if rows or sentiment_changed or self.version == 0:
+            frame = pd.DataFrame([r for buf in self.buffers.values() for r in buf])
+            if not frame.empty:
+                frame = frame.sort_values("timestamp", ascending=False, kind="stable").reset_index(drop=True)
+            with self._lock:
+                self.frame, self.version = frame, self.version + 1
+
+    # --- Session side ---
+    def snapshot(self):
+        """(telemetry newest-first, latest sentiment, version); treat the frame as read-only."""
+        with self._lock:
+            return self.frame, self.sentiment, self.version
+
+    def asset_sentiment(self):
+        """{asset: (decayed sentiment, headlines seen)} from the latest sentiment_by_asset rows."""
+        return self.by_asset
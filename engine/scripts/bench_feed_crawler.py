@@ -0,0 +1,94 @@
+"""
+Feed Crawler Benchmark
+Local aiohttp stand-in serving N RSS feeds (ETag/Last-Modified aware, a few hung feeds),
+crawled sequentially with feedparser (legacy) and with the async FeedCrawler.
+Usage: python bench_feed_crawler.py [--feeds 300] [--hung 3] [--legacy 20]
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from email.utils import formatdate
+import feedparser
+from aiohttp import web
+from feed_crawler import FeedCrawler
+
+
+def render_feed(i, generation):
+    items = "".join(
+        f"<item><title>Feed {i} headline {generation}-{k}: gold and crisis watch</title>"
+        f"<link>http://local/{i}/{generation}/{k}</link><guid>{i}-{generation}-{k}</guid></item>"
+        for k in range(15))
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {i}</title>{items}</channel></rss>'
+
+
+class FeedServer:
+    """Serves /feed/<i>; feeds below `hung` never answer, `generation` bumps mark fresh content."""
+
+    def __init__(self, n_feeds, hung):
+        self.n_feeds = n_feeds
+        self.hung = hung
+        self.generation = 0
+        self.modified = formatdate(usegmt=True)
+        self.requests = 0
+
+    async def handle(self, request):
+        self.requests += 1
+        i = int(request.match_info["i"])
+        if i < self.hung:
+            await asyncio.sleep(3600)
+        body = render_feed(i, self.generation)
+        etag = '"' + hashlib.md5(body.encode()).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(text=body, content_type="application/rss+xml",
+                            headers={"ETag": etag, "Last-Modified": self.modified})
+
+    async def start(self, port=0):
+        app = web.Application()
+        app.router.add_get("/feed/{i}", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+
+async def main(args):
+    server = await FeedServer(args.feeds, args.hung).start()
+    feeds = {f"feed-{i}": f"http://127.0.0.1:{server.port}/feed/{i}" for i in range(args.feeds)}
+
+    # Legacy: sequential feedparser over healthy feeds only (a hung feed would block it indefinitely)
+    sample = list(feeds.values())[args.hung:args.hung + args.legacy]
+    t0 = time.perf_counter()
+    for url in sample:
+        await asyncio.to_thread(feedparser.parse, url)
+    legacy = (time.perf_counter() - t0) / len(sample) * args.feeds
+    print(f"legacy sequential | ~{legacy:.2f}s for {args.feeds} feeds (extrapolated from {len(sample)}, hung feeds excluded)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = FeedCrawler(feeds, concurrency=args.concurrency, timeout=args.timeout,
+                              index_path=os.path.join(tmp, "index.sqlite"))
+        for label in ("cold", "unchanged", "after update"):
+            if label == "after update":
+                server.generation += 1
+            before = dict(crawler.stats)
+            t0 = time.perf_counter()
+            results = await crawler.crawl()
+            elapsed = time.perf_counter() - t0
+            delta = {k: crawler.stats[k] - before[k] for k in crawler.stats}
+            print(f"crawler {label:<12} | {elapsed:6.2f}s | {delta} | new headlines {sum(len(r.new) for r in results.values())}")
+    await server.runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--feeds", type=int, default=300)
+    parser.add_argument("--hung", type=int, default=3)
+    parser.add_argument("--legacy", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""
+Governance Book Benchmark
+Drives a GovernanceBook of N principals with random per-principal market states and
+signals on a virtual clock, and times one event pass against looping the scalar
+desks. --check also runs one scalar desk per principal alongside and asserts every
+report string matches (counters, the +2 divergence rule and the 300 s cooldown).
+Usage: python bench_governance.py [--principals 5000] [--events 200] [--check]
+"""
+import argparse
+import json
+import time
+import numpy as np
+from governance import GovernanceBook, NewsGovernance, DivergenceGovernance
+
+RULES = {
+    "news": (NewsGovernance, "evaluate_human_risk", ("ANOMALY_DETECTION", "STRESS", "NEUTRAL"),
+             ("CRITICAL", "WARNING", "NORMAL")),
+    "divergence": (DivergenceGovernance, "evaluate_risk", ("ANOMALY", "STRESS", "STABLE"), None),
+}
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def events(rule, n, count, seed=11):
+    """Per-principal (market_state, signal) arrays, anomaly-heavy so cooldowns actually trip."""
+    _, _, states, risks = RULES[rule]
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        market = np.asarray(states)[rng.choice(3, n, p=[0.5, 0.2, 0.3])]
+        if risks is None:
+            signal = np.round(rng.uniform(-0.6, 0.6, n), 4)
+        else:
+            signal = np.asarray(risks)[rng.choice(3, n, p=[0.2, 0.3, 0.5])]
+        yield market, signal
+
+
+def run(rule, n, count, check):
+    desk_cls, method, _, _ = RULES[rule]
+    clock = VirtualClock()
+    principals = [f"desk-{i}" for i in range(n)]
+    book = GovernanceBook(principals, rule=rule, clock=clock)
+    desks = [desk_cls(clock=clock) for _ in principals] if check else None
+    book_s = loop_s = 0.0
+    transitions = mismatches = 0
+    for market, signal in events(rule, n, count):
+        clock.now += 15.0
+        start = time.perf_counter()
+        transitions += len(book.evaluate(market, signal))
+        book_s += time.perf_counter() - start
+        if check:
+            start = time.perf_counter()
+            reports = [getattr(d, method)(m, s) for d, m, s in zip(desks, market.tolist(), signal.tolist())]
+            loop_s += time.perf_counter() - start
+            mismatches += sum(r != book.report(p) for p, r in zip(principals, reports))
+    out = {
+        "rule": rule,
+        "principals": n,
+        "events": count,
+        "book_ms_per_event": round(book_s / count * 1000, 3),
+        "transitions_per_event": round(transitions / count, 1),
+        "locked_now": int((book.state == 2).sum()),
+    }
+    if check:
+        out["scalar_ms_per_event"] = round(loop_s / count * 1000, 3)
+        out["mismatched_reports"] = mismatches
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--principals", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--check", action="store_true", help="Run scalar desks alongside and compare reports")
+    args = parser.parse_args()
+    print(json.dumps([run(rule, args.principals, args.events, args.check) for rule in RULES], indent=2))
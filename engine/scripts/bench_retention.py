@@ -0,0 +1,122 @@
+"""
+Retention Benchmark
+Fills an indexed SQLite vault stand-in with millions of synthetic ticks, runs the
+tiered retention job against it and reports throughput, the largest single delete,
+dashboard query latency before/after and a tick-conservation check. --crash-at
+interrupts the job right after a window's bars are written, then resumes it from
+the checkpoint.
+Usage: python bench_retention.py [--rows 2000000] [--days 120] [--crash-at 5]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from local_vault import SQLiteVault
+from retention import RetentionJob, default_tiers, DAY
+
+ASSETS = ("BTC", "XAU", "XAG", "MCX_GOLD", "MCX_SILVER")
+REGIMES = ("STABLE",) * 8 + ("STRESS", "ANOMALY")
+
+
+def populate(vault, n_rows, days, seed=5, chunk=20000):
+    """n_rows ticks round-robin over ASSETS, evenly spaced over the last `days` days."""
+    rng = random.Random(seed)
+    now = time.time()
+    t0, step = now - days * DAY, days * DAY / n_rows
+    prices = {a: 100.0 + 50 * i for i, a in enumerate(ASSETS)}
+    for lo in range(0, n_rows, chunk):
+        rows = []
+        for i in range(lo, min(lo + chunk, n_rows)):
+            a = ASSETS[i % len(ASSETS)]
+            prices[a] *= 1 + rng.gauss(0, 0.001)
+            rows.append({"asset": a, "price": prices[a], "source": "bench", "stale": False,
+                         "regime": rng.choice(REGIMES), "z_score": round(rng.gauss(0, 1.5), 2),
+                         "timestamp": datetime.fromtimestamp(t0 + i * step, timezone.utc).isoformat()})
+        vault.table("multi_asset_telemetry").insert(rows).execute()
+    return now
+
+
+def dashboard_query_ms(vault, repeats=20):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        vault.table("multi_asset_telemetry").select("*").order("timestamp", desc=True).limit(500).execute()
+    return round((time.perf_counter() - start) / repeats * 1000, 3)
+
+
+def count(vault, table, column="id"):
+    return len(vault.table(table).select(column).execute().data)
+
+
+def total_ticks(vault):
+    raw = count(vault, "multi_asset_telemetry")
+    bars = sum(r["ticks"] for t in ("telemetry_bars_5m", "telemetry_bars_1h")
+               for r in vault.table(t).select("ticks").execute().data)
+    return raw + bars
+
+
+class _Crash(Exception):
+    pass
+
+
+class CrashingJob(RetentionJob):
+    """Dies right after the bars of window number `crash_at` are written, before the raw delete."""
+
+    def __init__(self, *args, crash_at=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.crash_at = crash_at
+
+    def _save_checkpoint(self, tier, start, end, phase):
+        super()._save_checkpoint(tier, start, end, phase)
+        if phase == "bars_written" and self.stats["windows"] + 1 == self.crash_at:
+            raise _Crash()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--days", type=float, default=120)
+    parser.add_argument("--raw-days", type=float, default=7)
+    parser.add_argument("--bar-days", type=float, default=90)
+    parser.add_argument("--delete-batch", type=int, default=1000)
+    parser.add_argument("--crash-at", type=int, default=0, help="Simulate a crash after N windows, then resume")
+    args = parser.parse_args()
+
+    vault = SQLiteVault()
+    t0 = time.perf_counter()
+    now = populate(vault, args.rows, args.days)
+    print(f"Populated {args.rows:,} ticks over {args.days:g} days in {time.perf_counter() - t0:.1f}s")
+    before = {"raw_rows": args.rows, "dashboard_query_ms": dashboard_query_ms(vault)}
+
+    tiers = default_tiers(args.raw_days, args.bar_days)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, "checkpoint.json")
+        resumed_from = None
+        if args.crash_at:
+            try:
+                CrashingJob(vault, tiers, checkpoint, delete_batch=args.delete_batch,
+                            crash_at=args.crash_at).run(now)
+            except _Crash:
+                with open(checkpoint, 'r', encoding='utf-8') as f:
+                    resumed_from = json.load(f)
+        job = RetentionJob(vault, tiers, checkpoint, delete_batch=args.delete_batch)
+        start = time.perf_counter()
+        report = job.run(now)
+        elapsed = time.perf_counter() - start
+
+    after = {
+        "raw_rows": count(vault, "multi_asset_telemetry"),
+        "bars_5m": count(vault, "telemetry_bars_5m"),
+        "bars_1h": count(vault, "telemetry_bars_1h"),
+        "dashboard_query_ms": dashboard_query_ms(vault),
+    }
+    print(json.dumps({
+        "job": report,
+        "rows_per_s": round(report["rows_read"] / elapsed, 1) if elapsed else None,
+        "before": before,
+        "after": after,
+        "resumed_from": resumed_from,
+        "ticks_conserved": total_ticks(vault) == args.rows,
+    }, indent=2))
@@ -0,0 +1,83 @@
+"""
+Signal Bus Benchmark
+Signal-to-halt latency: subscriber processes sleep on the bus (as the engine loops do)
+and report how long after publish() they woke up with the new record.
+Modes: socket wake-ups (sync and asyncio subscribers) vs pure mmap polling; the legacy
+text file was only re-read once per 15-30 s loop.
+Usage: python bench_signal_bus.py [--subscribers 4] [--signals 200]
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import tempfile
+import time
+import numpy as np
+from signal_bus import SignalBus
+
+STOP = "stop"
+
+
+def subscriber(path, mode, ready, results):
+    bus = SignalBus(path)
+    sub = bus.subscribe(wake=mode != "poll")
+    latencies = []
+
+    def record(signal):
+        latencies.append(time.time() - signal.ts)
+        return signal.reason == STOP
+
+    if mode == "async":
+        async def loop():
+            ready.set()
+            while True:
+                signal = await sub.asleep(30)
+                if signal and record(signal):
+                    return
+        asyncio.run(loop())
+    else:
+        ready.set()
+        while True:
+            signal = sub.sleep(30)
+            if signal and record(signal):
+                break
+    sub.close()
+    results.put(latencies[:-1])
+
+
+def run_mode(path, mode, n_subscribers, n_signals, gap):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    readies = [ctx.Event() for _ in range(n_subscribers)]
+    procs = [ctx.Process(target=subscriber, args=(path, mode, r, results)) for r in readies]
+    for p in procs:
+        p.start()
+    for r in readies:
+        r.wait()
+    bus = SignalBus(path)
+    time.sleep(0.2)
+    for i in range(n_signals):
+        bus.publish("CRITICAL" if i % 2 == 0 else "NORMAL", f"bench {i}")
+        time.sleep(gap)
+    bus.publish("NORMAL", STOP)
+    lat = np.concatenate([results.get() for _ in procs]) * 1e6
+    for p in procs:
+        p.join()
+    return lat
+
+
+def main(args):
+    print(f"{'mode':<8} | {'wakeups':>7} | {'p50 µs':>8} | {'p99 µs':>8} | {'max µs':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("socket", "async", "poll"):
+            lat = run_mode(os.path.join(tmp, f"{mode}.bus"), mode, args.subscribers, args.signals, args.gap)
+            print(f"{mode:<8} | {len(lat):>7} | {np.percentile(lat, 50):>8.0f} | {np.percentile(lat, 99):>8.0f} | {lat.max():>9.0f}")
+    print(f"{'file':<8} | {'-':>7} | {7.5e6:>8.0f} | {14.85e6:>8.0f} | {15e6:>9.0f}   (legacy: read once per 15 s loop)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=4)
+    parser.add_argument("--signals", type=int, default=200)
+    parser.add_argument("--gap", type=float, default=0.005, help="Seconds between published signals")
+    main(parser.parse_args())
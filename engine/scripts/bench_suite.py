@@ -0,0 +1,381 @@
+"""
+Hot-Path Benchmark Suite
+Times every hot path against in-process stand-ins (local vault, fake exchange, recorded
+Yahoo responses, a local RSS server, a stub FinBERT) and writes machine-readable JSON.
+With a stored baseline, any benchmark whose median slows by more than the tolerance
+fails the run (exit code 1).
+Usage:
+    python bench_suite.py                       (run all, compare against the baseline if present)
+    python bench_suite.py --save-baseline       (run all and store the result as the new baseline)
+    python bench_suite.py --only classify,kill_switch --tolerance 0.5
+"""
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, '..', 'results')
+# Stand-ins (signal bus, feed index, spool) default to the results dir: keep them out of the tree
+os.environ.setdefault("SENTINEL_RESULTS_DIR", tempfile.mkdtemp(prefix="sentinel-bench-"))
+REPO_DIR = os.path.normpath(os.path.join(BASE_DIR, '..', '..'))
+sys.path.append(os.path.join(REPO_DIR, 'ai_research', 'RnD', 'scripts', 'research'))
+sys.path.append(os.path.join(REPO_DIR, 'dashboard', 'RnD', 'scripts', 'research'))
+
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, 'bench_latest.json')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'bench_baseline.json')
+ASSETS = ("BTC", "XAU", "XAG", "MCX_GOLD", "MCX_SILVER")
+
+
+# --- 1. IN-PROCESS STAND-INS ---
+class FakeExchange:
+    """ccxt exchange double: random-walk tickers after a fixed round trip."""
+
+    def __init__(self, price=65000.0, latency=0.0, seed=3):
+        self.price = price
+        self.latency = latency
+        self.rng = random.Random(seed)
+
+    async def fetch_ticker(self, symbol):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.price *= 1 + self.rng.gauss(0, 0.001)
+        return {"symbol": symbol, "last": self.price}
+
+    async def fetch_tickers(self, symbols):
+        """Bulk endpoint: one round trip for every symbol."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.price *= 1 + self.rng.gauss(0, 0.001)
+        return {s: {"symbol": s, "last": self.price} for s in symbols}
+
+    async def close(self):
+        pass
+
+
+class StubFinbert:
+    """FinBERT double: deterministic per-headline probabilities plus a fixed per-headline cost."""
+
+    def __init__(self, cost=0.002):
+        self.cost = cost
+        self.calls = 0
+
+    def predict(self, headlines):
+        self.calls += 1
+        if self.cost:
+            time.sleep(self.cost * len(headlines))
+        out = []
+        for h in headlines:
+            logits = np.frombuffer(hashlib.md5(h.encode("utf-8")).digest()[:3], dtype=np.uint8) / 64.0
+            p = np.exp(logits - logits.max())
+            out.append((p / p.sum()).tolist())
+        return out
+
+
+class BackgroundFeedServer:
+    """Runs the benchmark RSS server on its own loop so synchronous crawl_sync() callers can hit it."""
+
+    def __init__(self, n_feeds):
+        from bench_feed_crawler import FeedServer
+        self.server = FeedServer(n_feeds, hung=0)
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="bench-rss", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result()
+
+    def feeds(self, names):
+        return {name: f"http://127.0.0.1:{self.server.port}/feed/{i}" for i, name in enumerate(names)}
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.server.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def recorded_quotes():
+    from multi_asset_fetcher import SYMBOLS
+    live = {SYMBOLS[a]: 100.0 + 10 * i for i, a in enumerate(ASSETS) if a != "BTC"}
+    return {"1d/1m": live, "5d/1d": live}
+
+
+def seed_telemetry(vault, n_rows, start=None):
+    start = start or datetime.now(timezone.utc) - timedelta(hours=1)
+    rng = random.Random(5)
+    rows = []
+    for i in range(n_rows):
+        asset = ASSETS[i % len(ASSETS)]
+        rows.append({"asset": asset, "price": 100.0 + rng.gauss(0, 1), "source": "bench",
+                     "regime": rng.choice(("STABLE", "STABLE", "STRESS", "ANOMALY")), "z_score": 0.0,
+                     "timestamp": (start + timedelta(seconds=i)).isoformat()})
+    vault.table("multi_asset_telemetry").insert(rows).execute()
+
+
+# --- 2. TIMING ---
+def summarize(samples):
+    ms = np.asarray(samples) * 1000
+    return {"runs": len(ms), "median_ms": round(float(np.median(ms)), 4),
+            "p99_ms": round(float(np.percentile(ms, 99)), 4), "mean_ms": round(float(ms.mean()), 4)}
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+async def atimed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+# --- 3. BENCHMARKS (each returns a summary dict; `scale` shrinks the work for --quick) ---
+def bench_classify(scale):
+    """RegimeClassifier.classify: one asset, one price (the per-row API)."""
+    from multi_asset_fetcher import RegimeClassifier
+    brain = RegimeClassifier()
+    rng = random.Random(1)
+    prices = {a: 100.0 for a in ASSETS}
+    for i in range(200):
+        a = ASSETS[i % len(ASSETS)]
+        brain.classify(a, prices[a])
+
+    def step():
+        a = ASSETS[rng.randrange(len(ASSETS))]
+        prices[a] *= 1 + rng.gauss(0, 0.002)
+        brain.classify(a, prices[a])
+    return timed(step, int(5000 * scale))
+
+
+def bench_pulse_fetch(scale):
+    """MultiAssetPulse.fetch_all: breakers + hedging + Yahoo quote book + exchange, no network."""
+    from multi_asset_fetcher import MultiAssetPulse
+    from local_vault import LocalVault
+    from yahoo_quotes import RecordedYahooBackend
+
+    async def run():
+        pulse = MultiAssetPulse(LocalVault(latency=0.0), quote_backend=RecordedYahooBackend(recorded_quotes()))
+        pulse.exchanges["Binance"] = FakeExchange()
+        return await atimed(pulse.fetch_all, int(300 * scale))
+    return asyncio.run(run())
+
+
+def bench_pulse_tick(scale):
+    """MultiAssetPulse.tick: fetch, classify, cross-asset annotate and hand off to the write-behind sink."""
+    from multi_asset_fetcher import MultiAssetPulse
+    from local_vault import LocalVault
+    from yahoo_quotes import RecordedYahooBackend
+
+    async def run():
+        vault = LocalVault(latency=0.005)
+        pulse = MultiAssetPulse(vault, quote_backend=RecordedYahooBackend(recorded_quotes()))
+        pulse.exchanges["Binance"] = FakeExchange()
+        pulse.sink.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                return await atimed(pulse.tick, int(300 * scale))
+        finally:
+            await pulse.sink.close()
+    return asyncio.run(run())
+
+
+def bench_news_risk(scale):
+    """live_price_sentinel.get_news_risk against local feeds (steady state: conditional GETs)."""
+    import live_price_sentinel as sentinel
+    from feed_crawler import FeedCrawler
+    server = BackgroundFeedServer(len(sentinel.FEEDS))
+    with tempfile.TemporaryDirectory() as tmp:
+        sentinel.crawler = FeedCrawler(server.feeds(sentinel.FEEDS), timeout=2.0,
+                                       index_path=os.path.join(tmp, "index.sqlite"))
+        try:
+            sentinel.get_news_risk()
+            return timed(sentinel.get_news_risk, int(100 * scale))
+        finally:
+            sentinel.crawler.db.close()
+            server.close()
+
+
+def bench_sentiment(scale):
+    """Sentiment cycle: crawl -> headline cache -> (stub) FinBERT on misses -> pos-neg score."""
+    from feed_crawler import FeedCrawler
+    from inference_cache import HeadlineCache
+    server = BackgroundFeedServer(3)
+    backend = StubFinbert()
+    cache = HeadlineCache("bench:stub", capacity=4096)
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = FeedCrawler(server.feeds(("Yahoo Finance", "Reuters Macro", "Kitco Gold")), timeout=2.0,
+                              index_path=os.path.join(tmp, "index.sqlite"))
+
+        def cycle():
+            headlines = [t for feed in crawler.crawl_sync().values() for t in feed.titles[:3]]
+            known, missing = cache.lookup(headlines)
+            if missing:
+                fresh = dict(zip(missing, backend.predict(missing)))
+                cache.store(fresh)
+                known.update(fresh)
+            probs = np.asarray([known[h] for h in headlines])
+            return float(probs[:, 0].mean() - probs[:, 1].mean())
+
+        def rotating_cycle():
+            server.server.generation += 1
+            cycle()
+        try:
+            cycle()
+            out = timed(cycle, int(100 * scale))
+            out["fresh_headlines"] = timed(rotating_cycle, int(20 * scale))
+            return out
+        finally:
+            crawler.db.close()
+            server.close()
+
+
+def bench_dashboard(scale):
+    """Dashboard data path: incremental poll + snapshot, and a paged 30d history reduced with LTTB."""
+    from local_vault import LocalVault
+    from telemetry_poller import TelemetryPoller
+    from downsample import lttb
+    vault = LocalVault(latency=0.0, is_async=False)
+    seed_telemetry(vault, int(20000 * scale))
+    poller = TelemetryPoller(vault, interval=3600)
+    poller.poll_once()
+    rng = random.Random(9)
+
+    def poll():
+        rows = [{"asset": a, "price": 100.0 + rng.gauss(0, 1), "source": "bench", "regime": "STABLE",
+                 "z_score": 0.0, "timestamp": datetime.now(timezone.utc).isoformat()} for a in ASSETS]
+        vault.table("multi_asset_telemetry").insert(rows).execute()
+        poller.poll_once()
+        poller.snapshot()
+
+    def history():
+        rows, cursor = [], 0
+        while True:
+            page = vault.table("multi_asset_telemetry").select("id, timestamp, price, regime") \
+                .eq("asset", "BTC").gt("id", cursor).order("id").limit(1000).execute().data
+            rows.extend(page)
+            if len(page) < 1000:
+                break
+            cursor = page[-1]["id"]
+        ts = np.array([datetime.fromisoformat(r["timestamp"]).timestamp() for r in rows])
+        lttb(ts, np.array([r["price"] for r in rows]), 1500)
+
+    out = timed(poll, int(100 * scale))
+    out["history"] = timed(history, max(3, int(10 * scale)))
+    return out
+
+
+def bench_kill_switch(scale):
+    """run_kill_switch_protocol over a synthetic regime dataset (chunk-streamed CSV)."""
+    from kill_switch import run_kill_switch_protocol
+    rng = np.random.default_rng(4)
+    n = int(200000 * scale)
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, "regimes.csv")
+        import pandas as pd
+        pd.DataFrame({
+            "regime": rng.choice(["NORMAL", "STABLE", "EXTREME", "OUTLIER"], n, p=[0.5, 0.3, 0.1, 0.1]),
+            "profit_usd": rng.normal(0, 250, n).round(2),
+        }).to_csv(data, index=False)
+        out = os.path.join(tmp, "audit.csv")
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = timed(lambda: run_kill_switch_protocol(data, out, chunksize=50000), 5)
+        result["rows"] = n
+        return result
+
+
+BENCHMARKS = {
+    "classify": bench_classify,
+    "pulse_fetch_all": bench_pulse_fetch,
+    "pulse_tick": bench_pulse_tick,
+    "news_risk": bench_news_risk,
+    "live_sentiment": bench_sentiment,
+    "dashboard_fetch": bench_dashboard,
+    "kill_switch": bench_kill_switch,
+}
+
+
+# --- 4. BASELINE COMPARISON ---
+def _medians(results, prefix=""):
+    """Flattens nested summaries to {"name[.sub]": median_ms}."""
+    out = {}
+    for name, summary in results.items():
+        if not isinstance(summary, dict):
+            continue
+        if "median_ms" in summary:
+            out[prefix + name] = summary["median_ms"]
+        out.update(_medians({k: v for k, v in summary.items() if isinstance(v, dict)}, f"{prefix}{name}."))
+    return out
+
+
+def compare(current, baseline, tolerance):
+    now, then = _medians(current["results"]), _medians(baseline["results"])
+    report = {}
+    for name, median in now.items():
+        if name not in then or not then[name]:
+            continue
+        ratio = median / then[name]
+        report[name] = {"baseline_ms": then[name], "current_ms": median, "ratio": round(ratio, 3),
+                        "regressed": ratio > 1 + tolerance}
+    return report
+
+
+def main(args):
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise SystemExit(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    scale = 0.1 if args.quick else 1.0
+    results = {}
+    for name in names:
+        t0 = time.perf_counter()
+        try:
+            results[name] = BENCHMARKS[name](scale)
+        except ImportError as e:
+            results[name] = {"skipped": f"missing dependency: {e.name}"}
+        print(f"{name:<16} | {time.perf_counter() - t0:6.1f}s | {json.dumps(results[name])}", file=sys.stderr)
+
+    current = {
+        "meta": {"timestamp": datetime.now(timezone.utc).isoformat(), "python": platform.python_version(),
+                 "platform": platform.platform(), "machine": platform.machine(), "quick": args.quick},
+        "results": results,
+    }
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            current["comparison"] = compare(current, json.load(f), args.tolerance)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.baseline if args.save_baseline else args.output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2)
+    print(json.dumps(current, indent=2))
+    regressed = [n for n, c in current.get("comparison", {}).items() if c["regressed"]]
+    if regressed:
+        print(f"REGRESSION (> {args.tolerance:.0%} slower): {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--quick", action="store_true", help="~10x fewer iterations (smoke run)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)")
+    sys.exit(main(parser.parse_args()))
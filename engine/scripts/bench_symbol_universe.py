@@ -0,0 +1,82 @@
+"""
+Symbol Universe Benchmark
+Grows a synthetic registry (one Binance group + one Yahoo group) to 5, 50 and 500
+symbols and times MultiAssetPulse.tick against a bulk fake exchange and a recorded
+Yahoo backend with a fixed round trip. Tick latency should stay flat with the
+universe size, with exactly one request per source per tick.
+Usage: python bench_symbol_universe.py [--sizes 5 50 500] [--ticks 30] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import statistics
+import time
+from multi_asset_fetcher import MultiAssetPulse
+from symbol_registry import SymbolRegistry
+from local_vault import LocalVault
+from yahoo_quotes import RecordedYahooBackend
+from bench_suite import FakeExchange
+
+
+class CountingExchange(FakeExchange):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    async def fetch_tickers(self, symbols):
+        self.calls += 1
+        return await super().fetch_tickers(symbols)
+
+
+def synthetic_registry(n):
+    """n assets, split evenly between a ccxt group and a Yahoo group."""
+    crypto = [f"C{i:03d}" for i in range(n // 2)]
+    metals = [f"M{i:03d}" for i in range(n - len(crypto))]
+    return SymbolRegistry({
+        "sources": {"Binance": {"kind": "ccxt", "exchange": "binance", "hedge_after": 2.0},
+                    "yfinance": {"kind": "yahoo", "hedge_after": None}},
+        "groups": [
+            {"source": "Binance", "asset": "{base}", "symbol": "{base}/USDT", "bases": crypto},
+            {"source": "yfinance", "asset": "{base}", "symbol": "{base}=F", "calibration": 1.5,
+             "calendar": "CRYPTO", "bases": metals},
+        ],
+    })
+
+
+async def bench(n, ticks, latency):
+    registry = synthetic_registry(n)
+    live = {registry.symbol[a]: 100.0 + i for i, a in enumerate(registry.by_source["yfinance"])}
+    yahoo = RecordedYahooBackend({"1d/1m": live, "5d/1d": live}, latency=latency)
+    exchange = CountingExchange(latency=latency)
+    pulse = MultiAssetPulse(LocalVault(latency=0.0), quote_backend=yahoo, registry=registry)
+    pulse.exchanges["Binance"] = exchange
+    pulse.sink.start()
+    samples = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(ticks):
+                start = time.perf_counter()
+                rows = await pulse.tick()
+                samples.append(time.perf_counter() - start)
+    finally:
+        await pulse.sink.close()
+    samples.sort()
+    return {
+        "symbols": n,
+        "rows_per_tick": len(rows),
+        "tick_p50_ms": round(statistics.median(samples) * 1000, 2),
+        "tick_p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 2),
+        "exchange_requests_per_tick": exchange.calls / ticks,
+        "yahoo_requests_per_tick": yahoo.calls / ticks,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated round trip per request (s)")
+    args = parser.parse_args()
+    print(json.dumps([asyncio.run(bench(n, args.ticks, args.latency)) for n in args.sizes], indent=2))
@@ -0,0 +1,88 @@
+"""
+Telemetry Sync Benchmark
+Per-row awaited inserts (legacy loop) vs the write-behind sink, against the local vault.
+Usage: python bench_telemetry_sink.py [--assets 5] [--ticks 200] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import numpy as np
+from local_vault import LocalVault
+from telemetry_sink import WriteBehindSink
+
+
+def make_tick(n_assets, i):
+    return [{"asset": f"A{a}", "price": 100.0 + i, "source": "bench", "regime": "STABLE", "z_score": 0.0}
+            for a in range(n_assets)]
+
+
+async def bench_direct(vault, n_assets, ticks):
+    latencies = []
+    start = time.perf_counter()
+    for i in range(ticks):
+        t0 = time.perf_counter()
+        for row in make_tick(n_assets, i):
+            await vault.table("multi_asset_telemetry").insert(row).execute()
+        latencies.append(time.perf_counter() - t0)
+    return time.perf_counter() - start, latencies
+
+
+async def bench_sink(vault, n_assets, ticks, spool_path):
+    sink = WriteBehindSink(vault, spool_path=spool_path).start()
+    latencies = []
+    start = time.perf_counter()
+    for i in range(ticks):
+        t0 = time.perf_counter()
+        for row in make_tick(n_assets, i):
+            await sink.put(row)
+        latencies.append(time.perf_counter() - t0)
+        await asyncio.sleep(0)
+    await sink.close()
+    return time.perf_counter() - start, latencies, sink.stats
+
+
+async def bench_outage(n_assets, ticks, latency, spool_path):
+    """Vault goes dark for the middle third of the run; every row must still land."""
+    vault = LocalVault(latency=latency)
+    sink = WriteBehindSink(vault, retries=1, backoff=0.01, max_age=0.05, probe_interval=0.05,
+                           spool_path=spool_path).start()
+    for i in range(ticks):
+        vault.online = not (ticks // 3 <= i < 2 * ticks // 3)
+        for row in make_tick(n_assets, i):
+            await sink.put(row)
+        await asyncio.sleep(0.01)
+    vault.online = True
+    await asyncio.sleep(0.2)
+    await sink.close()
+    return len(vault.tables.get("multi_asset_telemetry", [])), sink.stats
+
+
+def report(label, elapsed, latencies, rows, requests):
+    lat = np.array(latencies) * 1000
+    print(f"{label:<14} | {rows / elapsed:>10,.0f} rows/s | tick p50 {np.percentile(lat, 50):8.3f} ms"
+          f" | p99 {np.percentile(lat, 99):8.3f} ms | vault requests {requests}")
+
+
+async def main(args):
+    rows = args.assets * args.ticks
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = LocalVault(latency=args.latency)
+        elapsed, lat = await bench_direct(vault, args.assets, args.ticks)
+        report("per-row await", elapsed, lat, rows, vault.requests)
+
+        vault = LocalVault(latency=args.latency)
+        elapsed, lat, stats = await bench_sink(vault, args.assets, args.ticks, os.path.join(tmp, "a.jsonl"))
+        report("write-behind", elapsed, lat, rows, vault.requests)
+
+        landed, stats = await bench_outage(args.assets, min(args.ticks, 60), args.latency, os.path.join(tmp, "b.jsonl"))
+        print(f"outage drill   | {landed}/{args.assets * min(args.ticks, 60)} rows landed | {stats}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--assets", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
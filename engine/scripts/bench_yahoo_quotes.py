@@ -0,0 +1,47 @@
+"""
+Yahoo Quote Benchmark
+Upstream calls and latency per tick: legacy per-symbol triple fallback vs the bulk quote book.
+Runs entirely against recorded responses (no network).
+Usage: python bench_yahoo_quotes.py [--symbols 40] [--closed 0.5] [--ticks 20] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import time
+from yahoo_quotes import RecordedYahooBackend, YahooQuoteBook
+
+
+def recorded_universe(n_symbols, closed_share):
+    symbols = [f"SYM{i}.NS" for i in range(n_symbols)]
+    n_closed = int(n_symbols * closed_share)
+    live = {s: 100.0 + i for i, s in enumerate(symbols[n_closed:])}
+    settled = {s: 99.0 + i for i, s in enumerate(symbols)}
+    return symbols, {"1d/1m": live, "5d/1d": settled}
+
+
+def legacy_calls(symbols, responses):
+    """Upstream calls of the old FastInfo -> 1m -> 5d chain when closed markets miss fast_info."""
+    calls = 0
+    for s in symbols:
+        calls += 1 if responses["1d/1m"].get(s) is not None else 3
+    return calls
+
+
+async def main(args):
+    symbols, responses = recorded_universe(args.symbols, args.closed)
+    book = YahooQuoteBook(RecordedYahooBackend(responses, latency=args.latency))
+    print(f"{'tick':>4} | {'legacy calls':>12} | {'bulk calls':>10} | {'bulk ms':>8}")
+    for i in range(args.ticks):
+        t0 = time.perf_counter()
+        prices = await book.fetch(symbols)
+        elapsed = (time.perf_counter() - t0) * 1000
+        assert all(prices[s] is not None for s in symbols)
+        print(f"{i:>4} | {legacy_calls(symbols, responses):>12} | {book.calls_last_tick:>10} | {elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--closed", type=float, default=0.5)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,146 @@
+"""
+Cross-Asset Correlation Engine v1.0
+EWMA covariance of log returns across the whole asset matrix, updated in place each tick,
+plus a systemic-stress metric (leading eigenvalue share of the correlation matrix)
+and cross-sectional price dispersion.
+Assets are polled on their own cadences, so ticks are partial: annotate() holds the
+latest fresh quote per asset and feeds update() one synchronized snapshot per
+sample_interval on a fixed clock, carrying last prices forward. Every return in an
+update then spans the same interval; quotes older than max_age sit the snapshot out.
+The interval must be no shorter than the slowest source refreshes (Yahoo: 1-minute bars),
+else that source's quotes repeat across snapshots and its returns read as half zeros.
+"""
+import math
+import time
+import numpy as np
+
+SAMPLE_INTERVAL = 30.0  # Seconds between synchronized snapshots (the STABLE poll cadence), at least
+MAX_AGE = 120.0         # A carried-forward quote older than this is left out of the snapshot
+
+
+class CrossAssetMonitor:
+    """All state lives in fixed NumPy arrays indexed by asset slot; a tick is one O(k^2) outer update."""
+
+    def __init__(self, halflife=60, min_obs=20, capacity=8, power_iters=8,
+                 sample_interval=SAMPLE_INTERVAL, max_age=MAX_AGE, clock=time.time):
+        self.lam = 0.5 ** (1.0 / halflife)
+        self.min_obs = min_obs
+        self.power_iters = power_iters
+        self.sample_interval = sample_interval
+        self.max_age = max_age
+        self.clock = clock
+        self.slots = {}
+        self._allocate(capacity)
+        self.dispersion = None
+        self._vec = None
+        self.quotes = {}  # asset -> (last fresh price, time it was fetched)
+        self.next_sample = None
+        self.metrics = {"systemic_stress": None, "avg_corr": None, "dispersion": None}
+
+    def _allocate(self, capacity):
+        n = len(self.slots)
+        last = np.full(capacity, np.nan)                       # Previous price per slot
+        mu = np.zeros(capacity)                                # EWMA mean return
+        cov = np.zeros((capacity, capacity))                   # EWMA covariance
+        obs = np.zeros((capacity, capacity), dtype=np.int64)   # Joint observations per pair
+        if n:
+            last[:n], mu[:n] = self.last[:n], self.mu[:n]
+            cov[:n, :n], obs[:n, :n] = self.cov[:n, :n], self.obs[:n, :n]
+        self.last, self.mu, self.cov, self.obs = last, mu, cov, obs
+
+    def _slot(self, asset):
+        s = self.slots.get(asset)
+        if s is None:
+            if len(self.slots) == len(self.last):
+                self._allocate(2 * len(self.last))
+            s = self.slots[asset] = len(self.slots)
+        return s
+
+    @staticmethod
+    def _block(idx):
+        """Square sub-matrix selector; a plain slice (no fancy-index copy) when idx is 0..k-1."""
+        k = len(idx)
+        if k and idx[0] == 0 and idx[-1] == k - 1 and np.all(np.diff(idx) == 1):
+            return slice(0, k), slice(0, k)
+        return np.ix_(idx, idx)
+
+    def update(self, assets, prices):
+        """Feeds one snapshot (unique assets); pairs only co-update on snapshots holding both."""
+        idx = np.fromiter((self._slot(a) for a in assets), dtype=np.int64, count=len(assets))
+        p = np.asarray(prices, dtype=np.float64)
+        prev = self.last[idx]
+        self.last[idx] = p
+        ok = np.isfinite(prev) & (prev > 0) & (p > 0)
+        idx = idx[ok]
+        if not len(idx):
+            return self.snapshot()
+        r = np.log(p[ok] / prev[ok])
+        lam = self.lam
+        self.mu[idx] = lam * self.mu[idx] + (1 - lam) * r
+        d = r - self.mu[idx]
+        block = self._block(idx)
+        self.cov[block] = lam * self.cov[block] + (1 - lam) * np.outer(d, d)
+        self.obs[block] += 1
+        self.dispersion = float(np.std(r)) if len(r) > 1 else 0.0
+        return self.snapshot()
+
+    def correlation(self):
+        """(assets, correlation matrix) over assets with enough history; immature pairs read as 0."""
+        n = len(self.slots)
+        var = np.diag(self.cov)[:n]
+        active = np.flatnonzero((np.diag(self.obs)[:n] >= self.min_obs) & (var > 0))
+        by_slot = sorted(self.slots, key=self.slots.get)
+        names = [by_slot[i] for i in active]
+        sd = np.sqrt(var[active])
+        block = self._block(active)
+        corr = self.cov[block] / np.outer(sd, sd)
+        corr[self.obs[block] < self.min_obs] = 0.0
+        np.fill_diagonal(corr, 1.0)
+        return names, np.clip(corr, -1.0, 1.0)
+
+    def leading_share(self, corr):
+        """Largest eigenvalue / n via warm-started power iteration (trace of a correlation matrix is n)."""
+        k = len(corr)
+        v = self._vec if self._vec is not None and len(self._vec) == k else np.full(k, 1.0 / np.sqrt(k))
+        for _ in range(self.power_iters):
+            w = corr @ v
+            norm = np.linalg.norm(w)
+            if norm == 0:
+                return 0.0
+            v = w / norm
+        self._vec = v
+        return float(v @ corr @ v) / k
+
+    def snapshot(self):
+        names, corr = self.correlation()
+        if len(names) < 2:
+            return {"systemic_stress": None, "avg_corr": None, "dispersion": self.dispersion}
+        off = corr[~np.eye(len(names), dtype=bool)]
+        return {
+            "systemic_stress": round(self.leading_share(corr), 4),
+            "avg_corr": round(float(off.mean()), 4),
+            "dispersion": None if self.dispersion is None else round(self.dispersion, 6),
+        }
+
+    def sample(self, now):
+        """Synchronized snapshot {asset: (price, age in seconds)} of every quote no older than max_age."""
+        return {a: (p, now - t) for a, (p, t) in self.quotes.items() if now - t <= self.max_age}
+
+    def annotate(self, rows, now=None):
+        """Holds the fresh quotes of a tick, feeds a snapshot when the sample clock is due,
+        and stamps the latest systemic metrics on every row."""
+        now = self.clock() if now is None else now
+        for r in rows:
+            if not r.get('stale'):
+                self.quotes[r['asset']] = (r['price'], now)
+        if self.next_sample is None or now >= self.next_sample:
+            snap = self.sample(now)
+            for asset, slot in self.slots.items():
+                if asset not in snap:
+                    self.last[slot] = np.nan  # Sat out: its next return must not span the gap
+            self.metrics = self.update(list(snap), [p for p, _ in snap.values()])
+            step = self.sample_interval
+            self.next_sample = (math.floor(now / step) + 1) * step if step > 0 else now
+        for r in rows:
+            r.update(self.metrics)
+        return self.metrics
@@ -0,0 +1,146 @@
+"""
+Async Feed Crawler v1.0
+Shared RSS layer for the news quorum and the AI sentiment sentinel:
+bounded concurrency, per-feed timeouts, ETag/Last-Modified conditional GETs
+(unchanged feeds cost a 304) and a persistent seen-entry index.
+Remembered entries are served again only on a 304; a feed that times out or errors
+contributes no headlines, so a dead feed cannot keep voting with stale ones.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from email.utils import parsedate_to_datetime
+import aiohttp
+import feedparser
+from metrics import timer, incr, observe
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+DEFAULT_INDEX = os.path.join(RESULTS_DIR, 'feed_index.sqlite')
+KEEP_ENTRIES = 20  # Latest entries remembered per feed, served again on a 304
+SEEN_DAYS = 7      # Seen-entry keys older than this are pruned
+
+
+def entry_key(feed_url, entry):
+    ident = entry.get('id') or entry.get('link') or entry.get('title', '')
+    return hashlib.sha1(f"{feed_url}\x00{ident}".encode("utf-8")).hexdigest()
+
+
+def published_epoch(value, default):
+    """Entry 'published' (RFC 2822) -> epoch seconds; unparseable or future dates fall back to default."""
+    try:
+        return min(parsedate_to_datetime(value).timestamp(), default)
+    except (TypeError, ValueError, IndexError):
+        return default
+
+
+class FeedResult:
+    def __init__(self, name, url, status, latest, new, elapsed):
+        self.name = name
+        self.url = url
+        self.status = status      # HTTP status, "timeout" or "error"
+        self.latest = latest      # Newest-first entries currently in the feed
+        self.new = new            # Entries never seen before (persisted index)
+        self.elapsed = elapsed
+
+    @property
+    def titles(self):
+        return [e['title'] for e in self.latest]
+
+
+class FeedCrawler:
+    """One crawl = every feed fetched concurrently; a hung feed only costs its own timeout."""
+
+    def __init__(self, feeds, concurrency=32, timeout=8.0, index_path=DEFAULT_INDEX, verify_ssl=False,
+                 seen_days=SEEN_DAYS):
+        self.feeds = dict(feeds)
+        self.seen_days = seen_days
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # Mirrors the sentinels' unverified SSL context for feeds with broken chains
+        self.verify_ssl = verify_ssl
+        os.makedirs(os.path.dirname(os.path.abspath(index_path)), exist_ok=True)
+        self.db = sqlite3.connect(index_path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS feeds (url TEXT PRIMARY KEY, etag TEXT, modified TEXT, entries TEXT);
+            CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, first_seen REAL);
+            CREATE INDEX IF NOT EXISTS seen_age ON seen (first_seen);
+        """)
+        self.db.commit()
+        self.stats = {"200": 0, "304": 0, "timeout": 0, "error": 0, "new": 0}
+
+    def _validators(self, url):
+        row = self.db.execute("SELECT etag, modified, entries FROM feeds WHERE url = ?", (url,)).fetchone()
+        return (row[0], row[1], json.loads(row[2] or "[]")) if row else (None, None, [])
+
+    async def _fetch(self, session, gate, name, url):
+        etag, modified, cached = self._validators(url)
+        headers = {"User-Agent": "SentinelPrime/2.0"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+        t0 = time.perf_counter()
+        async with gate:
+            try:
+                async with session.get(url, headers=headers, ssl=None if self.verify_ssl else False) as resp:
+                    if resp.status == 304:
+                        return FeedResult(name, url, 304, cached, [], time.perf_counter() - t0)
+                    body = await resp.read()
+                    status, etag, modified = resp.status, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+            except asyncio.TimeoutError:
+                return FeedResult(name, url, "timeout", [], [], time.perf_counter() - t0)
+            except Exception:
+                return FeedResult(name, url, "error", [], [], time.perf_counter() - t0)
+
+        if status != 200:
+            return FeedResult(name, url, status, [], [], time.perf_counter() - t0)
+        with timer("feeds.parse"):
+            parsed = await asyncio.to_thread(feedparser.parse, body)
+        latest = [{"key": entry_key(url, e), "title": e.get('title', ''), "link": e.get('link', ''),
+                   "published": e.get('published', '')} for e in parsed.entries[:KEEP_ENTRIES]]
+        self.db.execute("INSERT OR REPLACE INTO feeds (url, etag, modified, entries) VALUES (?, ?, ?, ?)",
+                        (url, etag, modified, json.dumps(latest)))
+        return FeedResult(name, url, 200, latest, self._unseen(latest), time.perf_counter() - t0)
+
+    def _unseen(self, entries):
+        keys = [e["key"] for e in entries]
+        if not keys:
+            return []
+        marks = ",".join("?" * len(keys))
+        known = {k for (k,) in self.db.execute(f"SELECT key FROM seen WHERE key IN ({marks})", keys)}
+        fresh = [e for e in entries if e["key"] not in known]
+        now = time.time()
+        self.db.executemany("INSERT OR IGNORE INTO seen (key, first_seen) VALUES (?, ?)",
+                            [(e["key"], now) for e in fresh])
+        return fresh
+
+    def prune_seen(self, now=None):
+        """Drops seen-entry keys first recorded more than seen_days ago; returns how many."""
+        cutoff = (time.time() if now is None else now) - self.seen_days * 86400
+        return self.db.execute("DELETE FROM seen WHERE first_seen < ?", (cutoff,)).rowcount
+
+    async def crawl(self):
+        """{feed name: FeedResult} for every configured feed."""
+        gate = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        with timer("feeds.crawl"):
+            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+                results = await asyncio.gather(*(self._fetch(session, gate, n, u) for n, u in self.feeds.items()))
+            incr("feeds.seen_pruned", self.prune_seen())
+            self.db.commit()
+        for r in results:
+            status = str(r.status) if r.status in (200, 304, "timeout") else "error"
+            self.stats[status] += 1
+            self.stats["new"] += len(r.new)
+            incr(f"feeds.status.{status}")
+            observe("feeds.fetch", r.elapsed)
+        return {r.name: r for r in results}
+
+    def crawl_sync(self):
+        """Entry point for the synchronous sentinel loops."""
+        return asyncio.run(self.crawl())
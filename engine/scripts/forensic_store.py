@@ -0,0 +1,225 @@
+"""
+Forensic Audit Store v1.0
+Append-optimized local audit log: rows are buffered in memory and flushed as
+time-sorted Arrow IPC files, partitioned by UTC day (<root>/date=YYYY-MM-DD/).
+Each part is written to a temp file, fsynced and atomically renamed, so a crash
+never loses or corrupts data that was already flushed. Part names carry their
+time bounds; readers memory-map only overlapping parts and binary-search the
+sorted ts column instead of scanning.
+Compaction reads its inputs without mapping them, and the merged part records their
+names in its schema metadata, so a crash before they are retired cannot expose a row
+twice. Parts it cannot delete because a reader still maps them (Windows refuses) are
+listed in the day's .superseded file, hidden from reads and deleted on a later open.
+"""
+import atexit
+import os
+import time
+from datetime import datetime, timezone, timedelta
+import numpy as np
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+TS_FIELD = pa.field("ts", pa.timestamp("us", tz="UTC"))
+SUPERSEDED = ".superseded"  # Per-day list of compacted-away parts still awaiting deletion
+MERGED_FROM = b"merged_from"  # Merged part schema metadata: its input part names, one per line
+
+
+def _day(us):
+    return datetime.fromtimestamp(us / 1e6, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _to_us(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1e6)
+    return int(float(value) * 1e6)
+
+
+class ForensicStore:
+    def __init__(self, root, schema, flush_rows=256, flush_interval=300.0):
+        """schema: {column: pyarrow type}; a UTC 'ts' column is added and stamped on append."""
+        self.root = root
+        self.schema = pa.schema([TS_FIELD] + [pa.field(k, v) for k, v in schema.items()])
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.seq = 0
+        self.open_day = None
+        os.makedirs(root, exist_ok=True)
+        atexit.register(self.flush)
+
+    # --- Write path ---
+    def append(self, row, ts=None):
+        row = dict(row)
+        row["ts"] = _to_us(ts) if ts is not None else int(time.time() * 1e6)
+        self.buffer.append(row)
+        if len(self.buffer) >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        rows, self.buffer = sorted(self.buffer, key=lambda r: r["ts"]), []
+        # One part per UTC day touched by this batch
+        by_day = {}
+        for r in rows:
+            by_day.setdefault(_day(r["ts"]), []).append(r)
+        for day, day_rows in by_day.items():
+            self._write_part(day, day_rows)
+        # A new UTC day started: fold yesterday's small parts into one
+        latest = max(by_day)
+        if self.open_day and latest > self.open_day:
+            self.compact(self.open_day)
+        self.open_day = max(latest, self.open_day or latest)
+
+    def _write_part(self, day, rows):
+        columns = {f.name: [r.get(f.name) for r in rows] for f in self.schema}
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        self.seq += 1
+        part_dir = os.path.join(self.root, f"date={day}")
+        os.makedirs(part_dir, exist_ok=True)
+        name = f"part-{rows[0]['ts']}-{rows[-1]['ts']}-{os.getpid()}-{self.seq}.arrow"
+        self._atomic_write(part_dir, name, table)
+
+    @staticmethod
+    def _atomic_write(part_dir, name, table):
+        tmp = os.path.join(part_dir, f".{name}.tmp")
+        with pa.OSFile(tmp, "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        fd = os.open(tmp, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, os.path.join(part_dir, name))
+        if hasattr(os, "O_DIRECTORY"):
+            dfd = os.open(part_dir, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dfd)
+            finally:
+                os.close(dfd)
+
+    def compact(self, day):
+        """Merges a finished day's parts into one sorted part (readers never see a partial state)."""
+        parts = self._parts(day)
+        if len(parts) < 2:
+            return
+        # Read copies, not maps: nothing of ours pins the inputs once they are merged
+        table = pa.concat_tables([self._load(p) for p, _, _ in parts]).sort_by("ts")
+        ts = table.column("ts").cast(pa.int64()).to_numpy()
+        part_dir = os.path.join(self.root, f"date={day}")
+        names = [os.path.basename(p) for p, _, _ in parts]
+        # The merged part hides its inputs itself: visible alone, it is already exact
+        table = table.replace_schema_metadata({MERGED_FROM: "\n".join(names).encode()})
+        self.seq += 1  # Never reuse a name that may still sit in .superseded
+        self._atomic_write(part_dir, f"part-{ts[0]}-{ts[-1]}-{os.getpid()}-c{self.seq}.arrow", table)
+        self._retire(part_dir, names)
+
+    @staticmethod
+    def _superseded(part_dir):
+        try:
+            with open(os.path.join(part_dir, SUPERSEDED)) as f:
+                return {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def _retire(self, part_dir, names):
+        """Deletes merged parts; any still mapped by a reader stay listed in .superseded for a later retry."""
+        pending = self._superseded(part_dir) | set(names)
+        manifest = os.path.join(part_dir, SUPERSEDED)
+        if names:  # Listed before any is deleted, so leftovers stay hidden once the merged part is gone too
+            self._write_manifest(manifest, pending)
+        left = set()
+        for name in pending:
+            try:
+                os.remove(os.path.join(part_dir, name))
+            except FileNotFoundError:
+                pass
+            except PermissionError:
+                left.add(name)
+        if left:
+            self._write_manifest(manifest, left)
+        elif os.path.exists(manifest):
+            os.remove(manifest)
+
+    @staticmethod
+    def _write_manifest(path, names):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write("".join(f"{n}\n" for n in sorted(names)))
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _merged_from(path):
+        """Input part names recorded in a merged part (read from the footer, not mapped)."""
+        with pa.OSFile(path, "rb") as f:
+            metadata = ipc.open_file(f).schema.metadata or {}
+        return set(metadata.get(MERGED_FROM, b"").decode().split("\n")) - {""}
+
+    # --- Read path ---
+    def _parts(self, day):
+        part_dir = os.path.join(self.root, f"date={day}")
+        if not os.path.isdir(part_dir):
+            return []
+        names = [n for n in os.listdir(part_dir) if n.startswith("part-") and n.endswith(".arrow")]
+        superseded = self._superseded(part_dir)
+        # A crash between publishing a merged part and retiring its inputs: retire them now
+        orphans = set()
+        for name in names:
+            if name.rsplit("-", 1)[-1].startswith("c"):  # part-<lo>-<hi>-<pid>-c<seq>.arrow
+                orphans |= self._merged_from(os.path.join(part_dir, name)) & set(names)
+        orphans -= superseded
+        if superseded or orphans:
+            self._retire(part_dir, sorted(orphans))
+            superseded |= orphans
+        parts = []
+        for name in names:
+            if name not in superseded:
+                lo, hi = name.split("-")[1:3]
+                parts.append((os.path.join(part_dir, name), int(lo), int(hi)))
+        return sorted(parts, key=lambda p: p[1])
+
+    @staticmethod
+    def _open(path):
+        return ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+    @staticmethod
+    def _load(path):
+        with pa.OSFile(path, "rb") as f:
+            return ipc.open_file(f).read_all()
+
+    def read(self, start=None, end=None, columns=None):
+        """Rows with start <= ts < end (datetimes or epoch seconds) as one Arrow table."""
+        lo_us, hi_us = _to_us(start), _to_us(end)
+        days = sorted(d[5:] for d in os.listdir(self.root) if d.startswith("date="))
+        if lo_us is not None:
+            first = _day(lo_us)
+            days = [d for d in days if d >= first]
+        if hi_us is not None:
+            last = _day(hi_us - 1)
+            days = [d for d in days if d <= last]
+
+        tables = []
+        for day in days:
+            for path, p_lo, p_hi in self._parts(day):
+                if (lo_us is not None and p_hi < lo_us) or (hi_us is not None and p_lo >= hi_us):
+                    continue
+                table = self._open(path)
+                ts = table.column("ts").cast(pa.int64()).to_numpy()
+                i = 0 if lo_us is None else int(np.searchsorted(ts, lo_us, side="left"))
+                j = len(ts) if hi_us is None else int(np.searchsorted(ts, hi_us, side="left"))
+                if j > i:
+                    tables.append(table.slice(i, j - i))
+        if not tables:
+            return self.schema.empty_table().select(columns) if columns else self.schema.empty_table()
+        out = pa.concat_tables(tables)
+        return out.select(columns) if columns else out
+
+    def read_day(self, day=None):
+        day = day or datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return self.read(start, start + timedelta(days=1))
@@ -0,0 +1,198 @@
+"""
+Behavioral Governance Layer v1.0
+The human-risk guardrails shared by the price sentinel, the AI sentinel and the
+offline replay harness. Each desk takes an injectable clock so cooldowns can run
+on replayed (virtual) time instead of the wall clock. GovernanceBook runs either
+desk's rules for thousands of principals (desks, traders) at once in NumPy arrays.
+"""
+import time
+import numpy as np
+
+CRITICAL_WORDS = ['war', 'conflict', 'crisis', 'geopolitical', 'sanctions', 'attack']
+
+
+# --- 1. SIGNAL MAPPINGS ---
+def price_market_state(z):
+    return "ANOMALY_DETECTION" if z > 3.0 else "STRESS" if z > 2.0 else "NEUTRAL"
+
+
+def ai_market_state(z):
+    return "ANOMALY" if z > 3.0 else "STRESS" if z > 2.0 else "STABLE"
+
+
+def news_quorum(titles_by_source, top=3):
+    """CRITICAL when 2+ independent sources carry a critical word in their top headlines."""
+    extreme_sources = set()
+    for name, titles in titles_by_source.items():
+        for title in list(titles)[:top]:
+            if any(w in title.lower() for w in CRITICAL_WORDS):
+                extreme_sources.add(name)
+
+    quorum = len(extreme_sources)
+    return "CRITICAL" if quorum >= 2 else "WARNING" if quorum == 1 else "NORMAL"
+
+
+# --- 2. GOVERNANCE DESKS ---
+class NewsGovernance:
+    """Price sentinel desk: escalates on market anomalies or a critical news quorum."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.anomaly_counter = 0
+        self.cooldown_active = False
+        self.cooldown_start_time = None
+        self.cooldown_duration = 300 # 5 Min for testing
+
+    def evaluate_human_risk(self, market_state, news_risk):
+        if self.cooldown_active:
+            elapsed = self.clock() - self.cooldown_start_time
+            if elapsed < self.cooldown_duration:
+                return f"⛔ LOCK ACTIVE: Cognitive Reset Required. [{int(self.cooldown_duration-elapsed)}s]"
+            self.cooldown_active = False
+            self.anomaly_counter = 0
+
+        # Escalate if Market is Anomaly OR News is Critical
+        if market_state == "ANOMALY_DETECTION" or news_risk == "CRITICAL":
+            self.anomaly_counter += 1
+        else:
+            self.anomaly_counter = max(0, self.anomaly_counter - 1)
+
+        if self.anomaly_counter >= 5:
+            self.cooldown_active = True
+            self.cooldown_start_time = self.clock()
+            return "🚨 ALERT: Behavioral Stress Threshold Breached. SYSTEM LOCKING..."
+
+        return "🟢 Human State: Nominal"
+
+
+class DivergenceGovernance:
+    """AI sentinel desk: escalates faster when volatility is not explained by sentiment."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.anomaly_counter = 0
+        self.cooldown_active = False
+        self.cooldown_start_time = None
+        self.cooldown_duration = 300
+
+    def evaluate_risk(self, market_state, sentiment_score):
+        if self.cooldown_active:
+            elapsed = self.clock() - self.cooldown_start_time
+            if elapsed < self.cooldown_duration:
+                return f"⛔ LOCK ACTIVE. [{int(self.cooldown_duration-elapsed)}s]"
+            self.cooldown_active = False
+            self.anomaly_counter = 0
+
+        # Divergence Logic: High volatility without high sentiment
+        if market_state == "ANOMALY" and abs(sentiment_score) < 0.2:
+            self.anomaly_counter += 2
+        elif market_state == "ANOMALY":
+            self.anomaly_counter += 1
+        else:
+            self.anomaly_counter = max(0, self.anomaly_counter - 1)
+
+        if self.anomaly_counter >= 5:
+            self.cooldown_active = True
+            self.cooldown_start_time = self.clock()
+            return "🚨 ALERT: SYSTEM LOCKING - High Divergence Detected."
+
+        return "🟢 State: Nominal"
+
+
+# --- 3. MULTI-PRINCIPAL BOOK ---
+NOMINAL, ALERT, LOCKED = 0, 1, 2
+STATES = ("NOMINAL", "ALERT", "LOCKED")
+REPORTS = {
+    "news": ("🟢 Human State: Nominal",
+             "🚨 ALERT: Behavioral Stress Threshold Breached. SYSTEM LOCKING...",
+             "⛔ LOCK ACTIVE: Cognitive Reset Required. [{}s]"),
+    "divergence": ("🟢 State: Nominal",
+                   "🚨 ALERT: SYSTEM LOCKING - High Divergence Detected.",
+                   "⛔ LOCK ACTIVE. [{}s]"),
+}
+
+
+class GovernanceBook:
+    """
+    One row per principal, same rules as NewsGovernance ("news") or DivergenceGovernance
+    ("divergence"): counters, cooldown starts and last states live in flat arrays, so one
+    event updates every principal in a single vectorized pass. Inputs are scalars (shared
+    by every principal) or arrays aligned with `principals`.
+    """
+
+    def __init__(self, principals=(), rule="news", clock=time.time, cooldown_duration=300, threshold=5):
+        if rule not in REPORTS:
+            raise ValueError(f"Unknown governance rule {rule!r} (expected one of {tuple(REPORTS)})")
+        self.rule = rule
+        self.clock = clock
+        self.cooldown_duration = cooldown_duration
+        self.threshold = threshold
+        self.principals = []
+        self.index = {}
+        self.anomaly_counter = np.zeros(0, dtype=np.int32)
+        self.cooldown_active = np.zeros(0, dtype=bool)
+        self.cooldown_start_time = np.zeros(0, dtype=np.float64)
+        self.state = np.zeros(0, dtype=np.int8)
+        self.last_eval = None
+        self.add(principals)
+
+    def __len__(self):
+        return len(self.principals)
+
+    def add(self, principals):
+        """Registers new principals in the nominal state (existing ones are left untouched)."""
+        fresh = [p for p in dict.fromkeys(principals) if p not in self.index]
+        for p in fresh:
+            self.index[p] = len(self.principals)
+            self.principals.append(p)
+        k = len(fresh)
+        self.anomaly_counter = np.concatenate([self.anomaly_counter, np.zeros(k, dtype=np.int32)])
+        self.cooldown_active = np.concatenate([self.cooldown_active, np.zeros(k, dtype=bool)])
+        self.cooldown_start_time = np.concatenate([self.cooldown_start_time, np.zeros(k)])
+        self.state = np.concatenate([self.state, np.zeros(k, dtype=np.int8)])
+
+    def _step(self, market_state, signal):
+        """Counter change per principal for this event."""
+        market_state = np.asarray(market_state)
+        if self.rule == "news":
+            # Escalate if Market is Anomaly OR News is Critical
+            hit = (market_state == "ANOMALY_DETECTION") | (np.asarray(signal) == "CRITICAL")
+            return np.where(hit, 1, -1)
+        # Divergence Logic: High volatility without high sentiment scores +2
+        anomaly = market_state == "ANOMALY"
+        weak = np.abs(np.asarray(signal, dtype=np.float64)) < 0.2
+        return np.where(anomaly, np.where(weak, 2, 1), -1)
+
+    def evaluate(self, market_state, signal):
+        """
+        Applies one event to every principal. signal is the news risk ("news") or the
+        sentiment score ("divergence"). Returns [(principal, new_state)] for the
+        principals whose NOMINAL / ALERT / LOCKED state changed.
+        """
+        now = self.last_eval = self.clock()
+        n = len(self.principals)
+        held = self.cooldown_active & (now - self.cooldown_start_time < self.cooldown_duration)
+        expired = self.cooldown_active & ~held
+        self.cooldown_active[expired] = False
+        self.anomaly_counter[expired] = 0
+
+        free = ~held
+        step = np.broadcast_to(self._step(market_state, signal), (n,))
+        self.anomaly_counter = np.where(free, np.maximum(self.anomaly_counter + step, 0),
+                                        self.anomaly_counter).astype(np.int32)
+        breach = free & (self.anomaly_counter >= self.threshold)
+        self.cooldown_active |= breach
+        self.cooldown_start_time[breach] = now
+
+        state = np.where(held, LOCKED, np.where(breach, ALERT, NOMINAL)).astype(np.int8)
+        changed = np.flatnonzero(state != self.state)
+        self.state = state
+        return [(self.principals[i], STATES[state[i]]) for i in changed]
+
+    def report(self, principal):
+        """The single-desk report string of `principal` for the last evaluation."""
+        i = self.index[principal]
+        text = REPORTS[self.rule][self.state[i]]
+        if self.state[i] == LOCKED:
+            return text.format(int(self.cooldown_duration - (self.last_eval - self.cooldown_start_time[i])))
+        return text
@@ -3,21 +3,143 @@ Institutional Kill-Switch Protocol v2.0
 Bridges Live News Sentiment with Portfolio Drawdown Protection.
 """
 import pandas as pd
+import numpy as np
 import os
+from signal_bus import SignalBus
 
-def check_live_signal():
-    """Reads the signal generated by live_news_sentinel.py"""
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    signal_path = os.path.join(base_dir, '..', 'results', 'live_risk_signal.txt')
-    
-    if os.path.exists(signal_path):
-        with open(signal_path, 'r') as f:
-            return f.read().strip()
-    return "NORMAL"
+def check_live_signal(bus=None):
+    """Current level on the kill-switch signal bus (published by the news sentinel)."""
+    bus = bus or SignalBus()
+    return bus.read().level
+
+HALT_REGIMES = ['EXTREME', 'OUTLIER']  # Labels of the historical regime dataset
+# RegimeClassifier labels the same condition ANOMALY (its other labels are STRESS,
+# STABLE, INITIALIZING); replayed ticks carry classifier labels
+REPLAY_HALT_REGIMES = HALT_REGIMES + ['ANOMALY']
+# Derived columns have a fixed type. Input columns keep the type a whole-file read
+# infers: chunks must not infer their own (an all-integer chunk would write -25 where
+# the whole file writes -25.0, and break the Parquet schema)
+AUDIT_DTYPES = {'mitigated_profit': 'float64'}
+INPUT_COLUMNS = ['profit_usd']
+
+def apply_halt(chunk, geopolitical_halt):
+    """Vectorized kill-switch rule: if news is CRITICAL or Regime is EXTREME, profit goes to 0 (No exposure)."""
+    halted = chunk['regime'].isin(HALT_REGIMES).to_numpy() | geopolitical_halt
+    chunk['mitigated_profit'] = np.where(halted, 0.0, chunk['profit_usd'])
+    return chunk
+
+def halt_active(regime, news_signal, regimes=REPLAY_HALT_REGIMES):
+    """Scalar form of the same rule, for tick-by-tick replay of classifier-labelled ticks."""
+    return regime in regimes or news_signal == "CRITICAL"
+
+def _fold_min(current, value):
+    """Running min with pandas' skipna semantics (all-NaN input stays NaN)."""
+    if pd.isna(value):
+        return current
+    return value if pd.isna(current) else min(current, value)
+
+def whole_file_dtypes(path, chunksize):
+    """{column: dtype} a whole-file read would give the INPUT_COLUMNS that chunks may disagree on
+    (Parquet: footer statistics; CSV: one extra streamed pass over just those columns)."""
+    if path.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(path)
+        schema = pf.schema_arrow
+        dtypes = {}
+        for c in INPUT_COLUMNS:
+            i = schema.get_field_index(c)
+            if i < 0 or not pa.types.is_integer(schema.field(i).type):
+                continue
+            # An integer column with nulls comes out float64, but only in the batches holding a null
+            for rg in range(pf.metadata.num_row_groups):
+                stats = pf.metadata.row_group(rg).column(i).statistics
+                if stats is None or not stats.has_null_count:  # No statistics: count over the column once
+                    nulls = pq.read_table(path, columns=[c]).column(0).null_count
+                else:
+                    nulls = stats.null_count
+                if nulls:
+                    dtypes[c] = 'float64'
+                if nulls or stats is None or not stats.has_null_count:
+                    break
+        return dtypes
+    names = [c for c in INPUT_COLUMNS if c in pd.read_csv(path, nrows=0).columns]
+    kinds = {c: set() for c in names}
+    if names:
+        for chunk in pd.read_csv(path, usecols=names, chunksize=chunksize):
+            for c in names:
+                kinds[c].add(chunk[c].dtype.kind)
+    # Integers and floats across chunks: the whole file reads float64
+    return {c: 'float64' for c, k in kinds.items() if 'f' in k and k <= {'i', 'f'}}
+
+def read_chunks(path, chunksize=None):
+    """CSV or Parquet input, whole (chunksize=None) or streamed in bounded chunks typed as the whole file."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        if chunksize is None:
+            yield pq.read_table(path).to_pandas()
+        else:
+            dtypes = whole_file_dtypes(path, chunksize)
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas().astype(dtypes)
+    elif chunksize is None:
+        yield pd.read_csv(path)
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=whole_file_dtypes(path, chunksize))
+
+class AuditWriter:
+    """
+    Appends audited chunks to CSV or Parquet, writing the header/schema once.
+    Output goes to a .partial file that replaces the destination only on commit(),
+    so a failed run never leaves a half-written audit behind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.partial"
+        self.parquet = path.endswith('.parquet')
+        self.writer = None
+        self.started = False
 
-def run_kill_switch_protocol():
+    def _schema(self, chunk):
+        """First chunk's column order, with the AUDIT_DTYPES columns pinned to float64."""
+        import pyarrow as pa
+        schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+        for name in AUDIT_DTYPES:
+            i = schema.get_field_index(name)
+            if i >= 0:
+                schema = schema.set(i, pa.field(name, pa.float64()))
+        return schema
+
+    def write(self, chunk):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.tmp_path, self._schema(chunk))
+            table = pa.Table.from_pandas(chunk, schema=self.writer.schema, preserve_index=False)
+            self.writer.write_table(table)
+        else:
+            chunk.to_csv(self.tmp_path, mode='a' if self.started else 'w', header=not self.started, index=False)
+        self.started = True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def commit(self):
+        self.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def run_kill_switch_protocol(data_path=None, results_path=None, chunksize=None):
     base_path = os.path.dirname(os.path.abspath(__file__))
-    data_path = os.path.join(base_path, '..', 'data', 'volatile_regime_data.csv')
+    data_path = data_path or os.path.join(base_path, '..', 'data', 'volatile_regime_data.csv')
     
     # 1. GATE 1: LIVE GEOPOLITICAL CHECK
     current_signal = check_live_signal()
@@ -29,37 +151,44 @@ def run_kill_switch_protocol():
         print("FORCING SYSTEM-WIDE TRADING HALT.")
         geopolitical_halt = True
 
-    # 2. GATE 2: HISTORICAL VOLATILITY CHECK
+    # 2. GATE 2: HISTORICAL VOLATILITY CHECK (streamed when chunksize is set)
     try:
-        df = pd.read_csv(data_path)
-        
-        # Define Kill-Switch Logic
-        def apply_halt(row):
-            # If news is CRITICAL or Regime is EXTREME, profit goes to 0 (No exposure)
-            if geopolitical_halt or row['regime'] in ['EXTREME', 'OUTLIER']:
-                return 0.0
-            return row['profit_usd']
-
-        df['mitigated_profit'] = df.apply(apply_halt, axis=1)
+        # 4. EXPORT FOR DUBAI COMPLIANCE REVIEW (written chunk by chunk alongside Gate 2)
+        results_path = results_path or os.path.join(base_path, '..', 'results', 'kill_switch_audit.csv')
+        writer = AuditWriter(results_path)
+        original_mdd = protected_mdd = np.nan
+        rows = 0
+        try:
+            for chunk in read_chunks(data_path, chunksize):
+                chunk = apply_halt(chunk, geopolitical_halt)
+                original_mdd = _fold_min(original_mdd, chunk['profit_usd'].min())
+                protected_mdd = _fold_min(protected_mdd, chunk['mitigated_profit'].min())
+                writer.write(chunk)
+                rows += len(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.commit()
         
         # 3. AUDIT THE RESULTS
-        original_mdd = df['profit_usd'].min()
-        protected_mdd = df['mitigated_profit'].min()
-        
         print("\n--- 🏁 EMERGENCY AUDIT REPORT ---")
+        print(f"Rows Audited:                    {rows:,}")
         print(f"Max Potential Loss (Unprotected): ${original_mdd:,.2f}")
         print(f"Max Potential Loss (Protected):   ${protected_mdd:,.2f}")
         
         efficiency = ((original_mdd - protected_mdd) / original_mdd) * 100 if original_mdd != 0 else 0
         print(f"Risk Mitigation Efficiency:      {efficiency:.2f}%")
-        
-        # 4. EXPORT FOR DUBAI COMPLIANCE REVIEW
-        results_path = os.path.join(base_path, '..', 'results', 'kill_switch_audit.csv')
-        df.to_csv(results_path, index=False)
         print(f"\n✅ Institutional Audit saved: {results_path}")
+        return {"rows": rows, "original_mdd": original_mdd, "protected_mdd": protected_mdd, "efficiency": efficiency}
 
     except Exception as e:
         print(f"❌ Kill-Switch Logic Error: {e}")
 
 if __name__ == "__main__":
-    run_kill_switch_protocol()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", help="Regime dataset (.csv or .parquet)")
+    parser.add_argument("--output", help="Audit destination (.csv or .parquet)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Stream the input in chunks of N rows")
+    args = parser.parse_args()
+    run_kill_switch_protocol(args.input, args.output, args.chunksize)
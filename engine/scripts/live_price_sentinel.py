@@ -1,9 +1,13 @@
-import pandas as pd
 import numpy as np
-import time
 from datetime import datetime
 import os
-import feedparser
+import pyarrow as pa
+from feed_crawler import FeedCrawler
+from forensic_store import ForensicStore
+from governance import NewsGovernance, news_quorum, price_market_state
+from metrics import timer, start_exporter
+from signal_bus import SignalBus
+from startup import StartupProfile
 import ssl
 
 # --- 1. INITIALIZATION & SECURITY ---
@@ -17,74 +21,52 @@ FEEDS = {
     'Kitco Gold': "https://www.kitco.com/rss/news.xml",
     'ZeroHedge': "http://feeds.feedburner.com/zerohedge/feed"
 }
-CRITICAL_WORDS = ['war', 'conflict', 'crisis', 'geopolitical', 'sanctions', 'attack']
 
-# --- 2. BEHAVIORAL GUARDRAIL LAYER ---
-class HumanGovernance:
-    def __init__(self):
-        self.anomaly_counter = 0
-        self.cooldown_active = False
-        self.cooldown_start_time = None
-        self.cooldown_duration = 300 # 5 Min for testing
-
-    def evaluate_human_risk(self, market_state, news_risk):
-        if self.cooldown_active:
-            elapsed = time.time() - self.cooldown_start_time
-            if elapsed < self.cooldown_duration:
-                return f"⛔ LOCK ACTIVE: Cognitive Reset Required. [{int(self.cooldown_duration-elapsed)}s]"
-            self.cooldown_active = False
-            self.anomaly_counter = 0
-
-        # Escalate if Market is Anomaly OR News is Critical
-        if market_state == "ANOMALY_DETECTION" or news_risk == "CRITICAL":
-            self.anomaly_counter += 1
-        else:
-            self.anomaly_counter = max(0, self.anomaly_counter - 1)
+# Forensic audit store (day-partitioned Arrow files, overridable for other hosts)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+AUDIT_SCHEMA = {
+    'timestamp': pa.string(),
+    'market_z': pa.float64(),
+    'market_state': pa.string(),
+    'news_risk': pa.string(),
+    'behavior_report': pa.string()
+}
 
-        if self.anomaly_counter >= 5:
-            self.cooldown_active = True
-            self.cooldown_start_time = time.time()
-            return "🚨 ALERT: Behavioral Stress Threshold Breached. SYSTEM LOCKING..."
-        
-        return "🟢 Human State: Nominal"
+# --- 2. BEHAVIORAL GUARDRAIL LAYER ---
+HumanGovernance = NewsGovernance
 
 # --- 3. NEWS QUORUM LAYER ---
+crawler = FeedCrawler(FEEDS, timeout=8.0)
+
 def get_news_risk():
-    extreme_sources = set()
-    for name, url in FEEDS.items():
-        try:
-            feed = feedparser.parse(url)
-            for entry in feed.entries[:3]:
-                if any(w in entry.title.lower() for w in CRITICAL_WORDS):
-                    extreme_sources.add(name)
-        except: continue
-    
-    quorum = len(extreme_sources)
-    return "CRITICAL" if quorum >= 2 else "WARNING" if quorum == 1 else "NORMAL"
+    with timer("news_risk"):
+        return news_quorum({name: feed.titles for name, feed in crawler.crawl_sync().items()})
 
 # --- 4. THE MASTER ENGINE (FINALIZED) ---
 def run_integrated_sentinel():
+    startup = StartupProfile("price_sentinel")
+    startup.mark("imports")
     gov = HumanGovernance()
-    
-    # 🏛️ INSTITUTIONAL PATH LOCK (Absolute Path)
-    results_dir = r'C:\Users\Asus\OneDrive\Desktop\BILLIONAIRE_ROADMAP\results'
-    log_path = os.path.join(results_dir, 'integrated_audit.csv')
-    
-    # Ensure directory exists before writing
-    if not os.path.exists(results_dir): 
-        os.makedirs(results_dir)
+    audit = ForensicStore(os.path.join(RESULTS_DIR, 'integrated_audit'), AUDIT_SCHEMA, flush_rows=20)
 
     print("============================================================")
     print("🛰️  SENTINEL PRIME: QUANT + QUAL + BEHAVIORAL GOVERNANCE")
     print("============================================================")
+    start_exporter("price_sentinel")
+    bus = SignalBus()
+    signals = bus.subscribe()
 
     while True:
         # A. Market Logic (Simulated Z-Score)
         mock_z = np.random.uniform(0, 4.5)
-        market_state = "ANOMALY_DETECTION" if mock_z > 3.0 else "STRESS" if mock_z > 2.0 else "NEUTRAL"
+        market_state = price_market_state(mock_z)
         
-        # B. News Logic (Live Quorum)
+        # B. News Logic (Live Quorum) -> kill-switch bus on every change
         news_risk = get_news_risk()
+        if news_risk != bus.read().level:
+            bus.publish(news_risk, "news quorum")
+            signals.poll()  # Our own publication must not cut the next sleep short
 
         # C. Human Logic (Behavioral Guardrail)
         behavior_report = gov.evaluate_human_risk(market_state, news_risk)
@@ -95,19 +77,22 @@ def run_integrated_sentinel():
         print(f"👉 {behavior_report}")
         print("-" * 60)
 
-        # E. Forensic Logging (Using the log_path variable)
-        log_data = {
+        # E. Forensic Logging (buffered; flushed every 20 rows / 5 min and at exit)
+        audit.append({
             'timestamp': timestamp,
             'market_z': round(mock_z, 2),
             'market_state': market_state,
             'news_risk': news_risk,
             'behavior_report': behavior_report
-        }
-        
-        # Use log_path here to ensure consistency
-        pd.DataFrame([log_data]).to_csv(log_path, mode='a', index=False, header=not os.path.exists(log_path))
+        })
+        if startup is not None:
+            startup.mark("first_cycle")
+            startup.report()
+            startup = None
 
-        time.sleep(15)
+        signal = signals.sleep(15)
+        if signal:
+            print(f"⚡ KILL-SWITCH SIGNAL #{signal.seq}: {signal.level} ({signal.reason})")
 
 if __name__ == "__main__":
     run_integrated_sentinel()
@@ -0,0 +1,234 @@
+"""
+Local Vault Stand-In v1.0
+In-process replacement for the Supabase client used by benchmarks and offline runs.
+Mirrors the PostgREST builder chain: table().select/insert/delete().filters().execute()
+LocalVault keeps plain lists (scans per query); SQLiteVault sits on indexed SQLite
+tables for benchmarks that need millions of rows.
+"""
+import asyncio
+import itertools
+import random
+import sqlite3
+import threading
+import time
+
+
+class VaultUnavailable(ConnectionError):
+    """Raised while the simulated vault is offline or a request is dropped."""
+
+
+class VaultResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Query:
+    def __init__(self, vault, table):
+        self.vault = vault
+        self.table_name = table
+        self.action = "select"
+        self.payload = None
+        self.columns = None
+        self.filters = []
+        self.ordering = None
+        self.row_limit = None
+
+    # --- Builder chain ---
+    def select(self, columns="*"):
+        self.action = "select"
+        self.columns = None if columns.strip() == "*" else [c.strip() for c in columns.split(",")]
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows if isinstance(rows, list) else [rows]
+        return self
+
+    def delete(self):
+        self.action = "delete"
+        return self
+
+    def _filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def eq(self, column, value): return self._filter(column, "eq", value)
+    def neq(self, column, value): return self._filter(column, "neq", value)
+    def gt(self, column, value): return self._filter(column, "gt", value)
+    def gte(self, column, value): return self._filter(column, "gte", value)
+    def lt(self, column, value): return self._filter(column, "lt", value)
+    def lte(self, column, value): return self._filter(column, "lte", value)
+
+    def order(self, column, desc=False):
+        self.ordering = (column, desc)
+        return self
+
+    def limit(self, n):
+        self.row_limit = n
+        return self
+
+    # --- Execution ---
+    def execute(self):
+        if self.vault.is_async:
+            return self._execute_async()
+        time.sleep(self.vault.latency)
+        return self.vault._apply(self)
+
+    async def _execute_async(self):
+        await asyncio.sleep(self.vault.latency)
+        return self.vault._apply(self)
+
+
+_OPS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+class LocalVault:
+    """Dict-of-lists table store with a fixed round-trip latency and optional fault injection."""
+
+    def __init__(self, latency=0.02, fail_rate=0.0, is_async=True, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.is_async = is_async
+        self.online = True
+        self.tables = {}
+        self.requests = 0
+        self._ids = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def _rows(self, name):
+        return self.tables.setdefault(name, [])
+
+    def _apply(self, q):
+        with self._lock:
+            return self._apply_locked(q)
+
+    def _apply_locked(self, q):
+        self.requests += 1
+        if not self.online or (self.fail_rate and self._rng.random() < self.fail_rate):
+            raise VaultUnavailable(f"vault unreachable ({q.action} {q.table_name})")
+        rows = self._rows(q.table_name)
+
+        if q.action == "insert":
+            ids = self._ids.setdefault(q.table_name, itertools.count(1))
+            stored = [{"id": next(ids), **row} for row in q.payload]
+            rows.extend(stored)
+            return VaultResponse(stored)
+
+        match = [r for r in rows if all(_OPS[op](r.get(c), v) for c, op, v in q.filters)]
+        if q.action == "delete":
+            doomed = {id(r) for r in match}
+            self.tables[q.table_name] = [r for r in rows if id(r) not in doomed]
+            return VaultResponse(match)
+
+        if q.ordering:
+            col, desc = q.ordering
+            match.sort(key=lambda r: r.get(col), reverse=desc)
+        if q.row_limit is not None:
+            match = match[:q.row_limit]
+        if q.columns:
+            match = [{c: r.get(c) for c in q.columns} for r in match]
+        return VaultResponse(match)
+
+
+_SQL_OPS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+class SQLiteVault:
+    """Same builder chain over SQLite; columns appear on first insert, filtered columns get an index."""
+
+    def __init__(self, path=":memory:", latency=0.0, is_async=False):
+        self.latency = latency
+        self.is_async = is_async
+        self.requests = 0
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self._columns = {}
+        self._indexed = set()
+        self._lock = threading.Lock()
+
+    def table(self, name):
+        return _Query(self, name)
+
+    def _known(self, table):
+        if table not in self._columns:
+            cols = [r[1] for r in self.db.execute(f'PRAGMA table_info("{table}")')]
+            if cols:
+                self._columns[table] = cols
+            return cols
+        return self._columns[table]
+
+    def _ensure(self, table, columns):
+        if not self._known(table):
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY AUTOINCREMENT)')
+            self._columns[table] = ["id"]
+        known = self._columns[table]
+        for c in columns:
+            if c not in known:
+                self.db.execute(f'ALTER TABLE "{table}" ADD COLUMN "{c}"')
+                known.append(c)
+
+    def _index(self, table, column):
+        if column != "id" and (table, column) not in self._indexed:
+            self.db.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_{column}" ON "{table}" ("{column}")')
+            self._indexed.add((table, column))
+
+    def _where(self, q):
+        clauses, args = [], []
+        for column, op, value in q.filters:
+            self._index(q.table_name, column)
+            clauses.append(f'"{column}" {_SQL_OPS[op]} ?')
+            args.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def _apply(self, q):
+        with self._lock:
+            self.requests += 1
+            if q.action == "insert":
+                return self._insert(q)
+            if not self._known(q.table_name):
+                return VaultResponse([])
+            where, args = self._where(q)
+            if q.action == "delete":
+                doomed = self._select(f'SELECT * FROM "{q.table_name}"{where}', args)
+                self.db.execute(f'DELETE FROM "{q.table_name}"{where}', args)
+                self.db.commit()
+                return VaultResponse(doomed)
+
+            columns = ", ".join(f'"{c}"' for c in q.columns) if q.columns else "*"
+            sql = f'SELECT {columns} FROM "{q.table_name}"{where}'
+            if q.ordering:
+                col, desc = q.ordering
+                self._index(q.table_name, col)
+                sql += f' ORDER BY "{col}" {"DESC" if desc else "ASC"}'
+            if q.row_limit is not None:
+                sql += f" LIMIT {int(q.row_limit)}"
+            return VaultResponse(self._select(sql, args))
+
+    def _select(self, sql, args):
+        cur = self.db.execute(sql, args)
+        names = [d[0] for d in cur.description]
+        return [dict(zip(names, row)) for row in cur]
+
+    def _insert(self, q):
+        rows = q.payload
+        if not rows:
+            return VaultResponse([])
+        columns = sorted({k for r in rows for k in r if k != "id"})
+        self._ensure(q.table_name, columns)
+        marks = ", ".join("?" * len(columns))
+        names = ", ".join(f'"{c}"' for c in columns)
+        self.db.executemany(f'INSERT INTO "{q.table_name}" ({names}) VALUES ({marks})',
+                            [tuple(r.get(c) for c in columns) for r in rows])
+        last = self.db.execute("SELECT last_insert_rowid()").fetchone()[0]
+        self.db.commit()
+        # One locked transaction: AUTOINCREMENT ids are contiguous
+        return VaultResponse([{"id": i, **r} for i, r in zip(range(last - len(rows) + 1, last + 1), rows)])
@@ -0,0 +1,233 @@
+"""
+Engine Metrics v1.0
+In-process timers, fixed-bucket latency histograms, counters and gauges for the hot
+paths, exposed as a periodic JSON snapshot file and (optionally) a local HTTP
+endpoint serving Prometheus text (/metrics) and JSON (/metrics.json).
+Each observation is a perf_counter pair, a bisect and a few adds (~1-2 µs).
+Set SENTINEL_METRICS=0 to turn every call into a no-op.
+"""
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+DEFAULT_DIR = os.path.join(RESULTS_DIR, 'metrics')
+ENABLED = os.getenv("SENTINEL_METRICS", "1").lower() not in ("0", "false", "off", "no")
+
+# Upper bounds in seconds: 50 µs .. 30 s, plus +Inf
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Linear interpolation inside the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                lo = BUCKETS[i - 1] if i else 0.0
+                hi = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lo + (hi - lo) * (rank - seen) / c, self.max)
+            seen += c
+        return self.max
+
+    def summary(self):
+        ms = 1000.0
+        return {"count": self.count, "sum_ms": round(self.sum * ms, 3), "max_ms": round(self.max * ms, 3),
+                "p50_ms": round(self.quantile(0.5) * ms, 3), "p90_ms": round(self.quantile(0.9) * ms, 3),
+                "p99_ms": round(self.quantile(0.99) * ms, 3)}
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "t0")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Registry:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self.started = time.time()
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._writer = None
+
+    # --- Recording (hot path) ---
+    def timer(self, name):
+        """with timer("classify"): ... records the block's wall time (exceptions included)."""
+        return _Timer(self, name) if self.enabled else NULL_TIMER
+
+    def observe(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    def incr(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self.gauges[name] = value
+
+    def reset(self):
+        with self._lock:
+            self.histograms, self.counters, self.gauges = {}, {}, {}
+            self.started = time.time()
+
+    # --- Exposition ---
+    def snapshot(self):
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "enabled": self.enabled,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "histograms": {k: h.summary() for k, h in sorted(self.histograms.items())},
+            }
+
+    def prometheus(self):
+        """Prometheus text format; dotted names become sentinel_<name> (seconds for histograms)."""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(name) + "_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, value in sorted(self.gauges.items()):
+                metric = _metric_name(name)
+                lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+            for name, hist in sorted(self.histograms.items()):
+                metric = _metric_name(name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ("+Inf",), hist.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines += [f"{metric}_sum {hist.sum}", f"{metric}_count {hist.count}"]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Atomic JSON snapshot (readers never see a half-written file)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+    def start_snapshots(self, path, interval=15.0):
+        if self.enabled and self._writer is None:
+            def loop():
+                while True:
+                    time.sleep(interval)
+                    self.dump(path)
+            self._writer = threading.Thread(target=loop, name="metrics-snapshot", daemon=True)
+            self._writer.start()
+        return self
+
+    def serve(self, port, host="127.0.0.1"):
+        """Local endpoint: /metrics (Prometheus text) and /metrics.json."""
+        if not self.enabled or self._server is not None:
+            return self
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics.json"):
+                    body, ctype = json.dumps(registry.snapshot()).encode(), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, ctype = registry.prometheus().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self
+
+
+def _metric_name(name):
+    return "sentinel_" + re.sub(r"[^a-zA-Z0-9_]", "_", name).lower()
+
+
+# --- Process-wide registry ---
+METRICS = Registry()
+timer = METRICS.timer
+observe = METRICS.observe
+incr = METRICS.incr
+gauge = METRICS.gauge
+
+
+def start_exporter(name, interval=15.0):
+    """Snapshot file <results>/metrics/<name>.json, plus HTTP when SENTINEL_METRICS_PORT is set."""
+    if not METRICS.enabled:
+        return METRICS
+    directory = os.getenv("SENTINEL_METRICS_DIR", DEFAULT_DIR)
+    METRICS.start_snapshots(os.path.join(directory, f"{name}.json"), interval)
+    port = os.getenv("SENTINEL_METRICS_PORT")
+    if port:
+        METRICS.serve(int(port))
+        print(f"📈 Metrics: http://127.0.0.1:{port}/metrics")
+    return METRICS
@@ -1,140 +1,297 @@
 import asyncio
+import functools
+import importlib
 import os
 import collections
 import numpy as np
-import yfinance as yf
-import ccxt.async_support as ccxt
-import aiohttp
 from dotenv import load_dotenv
-from supabase import acreate_client, AsyncClient
 from datetime import datetime, timezone
+from telemetry_sink import WriteBehindSink
+from yahoo_quotes import YahooQuoteBook
+from source_guard import CircuitBreaker, hedged
+from cross_asset import CrossAssetMonitor, SAMPLE_INTERVAL
+from rolling_stats import RollingWindowStats, REGIME_BANDS, STD_FLOOR
+from metrics import timer, incr, gauge, start_exporter
+from signal_bus import SignalBus, halt_started
+from startup import StartupProfile, lazy_module, preload
+from poll_scheduler import PollScheduler, RequestBudget
+from symbol_registry import SymbolRegistry
+
+# Heavy clients load on first use (ccxt alone costs about a second of import time)
+ccxt = lazy_module("ccxt.async_support")
+aiohttp = lazy_module("aiohttp")
 
 load_dotenv()
 
+# --- ASSET UNIVERSE & LIVE CALIBRATION (engine/config/symbols.json, brokerage aligned) ---
+REGISTRY = SymbolRegistry.load()
+SYMBOLS = REGISTRY.symbol
+SOURCE_ASSETS = REGISTRY.by_source
+REQUESTS_PER_MINUTE = int(os.getenv("SENTINEL_REQUESTS_PER_MINUTE", "30"))  # Upstream budget, all sources
+
+def calibrate(asset, price):
+    return REGISTRY.calibrate(asset, price)
+
 class RegimeClassifier:
-    def __init__(self, window_size=50):
-        self.buffers = collections.defaultdict(lambda: collections.deque(maxlen=window_size))
+    """Z-score regime engine on O(1) rolling statistics (several windows per asset)."""
+
+    def __init__(self, window_size=50, windows=(), warmup=20, bands=None):
+        self.window_size = window_size
+        self.warmup = warmup
+        self.stats = RollingWindowStats(windows=(window_size, *windows))
+        self._primary = self.stats.windows.index(window_size)
+        self.bands = dict(bands or {})  # {asset: (stress, anomaly)}; REGIME_BANDS otherwise
+        self._band_rows = np.empty((0, 2))
+        self.window_scores = {}
+        self.last_state = {}
+
+    def _row_bands(self, rows):
+        """(k, 2) STRESS/ANOMALY thresholds per buffer row, extended as new assets get rows."""
+        if len(self._band_rows) < len(self.stats.rows):
+            by_row = sorted(self.stats.rows.items(), key=lambda kv: kv[1])[len(self._band_rows):]
+            fresh = np.array([self.bands.get(a, REGIME_BANDS) for a, _ in by_row], dtype=np.float64)
+            self._band_rows = np.vstack([self._band_rows, fresh])
+        return self._band_rows[rows]
 
     def classify(self, asset, price):
-        buffer = self.buffers[asset]
-        if len(buffer) < 20: 
-            buffer.append(price)
-            return "INITIALIZING", 0.0
-        mean, std = np.mean(buffer), np.std(buffer)
-        # Added safety for zero-standard deviation (flat markets)
-        z_score = (price - mean) / std if std > 0.000001 else 0.0
-        buffer.append(price)
-        regime = "ANOMALY" if abs(z_score) >= 3.0 else "STRESS" if abs(z_score) >= 1.5 else "STABLE"
-        return regime, round(float(z_score), 2)
+        return self.classify_many([asset], [price])[0]
+
+    def classify_many(self, assets, prices):
+        """Scores one tick across all assets in a single vectorized pass."""
+        if len(set(assets)) != len(assets):
+            # Repeated assets (stream micro-batches): split into rounds of unique assets, in arrival order
+            seen, rounds = {}, collections.defaultdict(list)
+            for j, a in enumerate(assets):
+                k = seen[a] = seen.get(a, -1) + 1
+                rounds[k].append(j)
+            out = [None] * len(assets)
+            for k in sorted(rounds):
+                idx = rounds[k]
+                for j, score in zip(idx, self.classify_many([assets[j] for j in idx], [prices[j] for j in idx])):
+                    out[j] = score
+            return out
+        rows = np.fromiter((self.stats.row(a) for a in assets), dtype=np.int64, count=len(assets))
+        prices = np.asarray(prices, dtype=np.float64)
+        mean, var, n, err_var, err_mean = self.stats.moments(rows)
+        std = np.sqrt(np.maximum(var, 0.0))
+        live = std > STD_FLOOR
+        z = np.where(live, (prices - mean) / np.where(live, std, 1.0), 0.0)
+
+        # Incremental sums can differ from np.std in the last bits; re-derive exactly
+        # whenever that could flip a regime band, the flat-market guard or the rounding.
+        p = self._primary
+        ready = n[p] >= self.warmup
+        stress, anomaly = self._row_bands(rows).T
+        tol = 4.0 * (np.abs(z[p]) * err_var[p] / np.maximum(var[p], 1e-300)
+                     + err_mean[p] / np.maximum(std[p], 1e-300)) + 1e-9
+        az = np.abs(z[p])
+        near = np.minimum(np.abs(az - stress), np.abs(az - anomaly)) <= tol
+        near |= np.abs(var[p] - STD_FLOOR ** 2) <= 4.0 * err_var[p] + 1e-300
+        near |= np.abs((az * 100.0) % 1.0 - 0.5) <= 100.0 * tol
+        for j in np.flatnonzero(ready & near):
+            buffer = self.stats.window(rows[j], n[p, j])
+            mean_j, std_j = np.mean(buffer), np.std(buffer)
+            z[p, j] = (prices[j] - mean_j) / std_j if std_j > STD_FLOOR else 0.0
+
+        self.stats.push(rows, prices)
+        az = np.abs(z[p])
+        labels = np.where(az >= anomaly, "ANOMALY", np.where(az >= stress, "STRESS", "STABLE"))
+        out = []
+        for j, asset in enumerate(assets):
+            if not ready[j]:
+                out.append(("INITIALIZING", 0.0))
+                continue
+            self.window_scores[asset] = {
+                w: round(float(z[i, j]), 2) for i, w in enumerate(self.stats.windows) if n[i, j] >= self.warmup
+            }
+            out.append((str(labels[j]), round(float(z[p, j]), 2)))
+        return out
+
+    def score_rows(self, rows):
+        """Tags telemetry rows in place; stale rows repeat the last state instead of re-feeding a price."""
+        live = [r for r in rows if not r.get('stale')]
+        scores = self.classify_many([r['asset'] for r in live], [r['price'] for r in live])
+        self.last_state.update((r['asset'], s) for r, s in zip(live, scores))
+        for r in rows:
+            r['regime'], r['z_score'] = self.last_state.get(r['asset'], ("INITIALIZING", 0.0))
+        return rows
 
 class MultiAssetPulse:
-    def __init__(self, supabase_client):
+    def __init__(self, supabase_client, quote_backend=None, tick_budget=8.0, registry=REGISTRY):
         self.supabase = supabase_client
-        self.brain = RegimeClassifier()
-        self.binance = ccxt.binance({
-            'timeout': 30000, 
-            'connector_kwargs': {'resolver': aiohttp.DefaultResolver()}
-        })
+        self.registry = registry
+        self.brain = RegimeClassifier(bands=registry.bands)
+        # Sample no faster than the slowest source refreshes, or its quotes repeat inside the snapshots
+        self.cross = CrossAssetMonitor(sample_interval=max([SAMPLE_INTERVAL, *registry.quote_intervals().values()]))
+        self.sink = WriteBehindSink(supabase_client)
+        self.quotes = YahooQuoteBook(quote_backend)
+        self.breakers = {name: CircuitBreaker(name) for name in registry.by_source}
+        self.tick_budget = tick_budget
+        self.last_good = {}
+        self.exchanges = {}  # ccxt source name -> exchange client, created on first fetch
+        self.scheduler = PollScheduler(registry.source_of, registry.calendar,
+                                       budget=RequestBudget(REQUESTS_PER_MINUTE))
 
     @classmethod
     async def create(cls):
-        return cls(await acreate_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")))
+        supabase = await asyncio.to_thread(importlib.import_module, "supabase")
+        return cls(await supabase.acreate_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")))
+
+    async def close(self):
+        await self.sink.close()
+        for exchange in self.exchanges.values():
+            await exchange.close()
 
     async def fetch_yahoo_price(self, ticker_symbol):
-        """Thread-safe async fetch with triple-fallback (FastInfo -> 1m History -> 5d History)."""
-        try:
-            ticker = yf.Ticker(ticker_symbol)
-            # Attempt 1: Fast Info
-            price = await asyncio.to_thread(lambda: ticker.fast_info.get('last_price'))
-            
-            # Attempt 2: 1-minute interval History
-            if price is None or price == 0:
-                data = await asyncio.to_thread(lambda: ticker.history(period="1d", interval="1m"))
-                if not data.empty:
-                    price = data['Close'].iloc[-1]
-            
-            # Attempt 3: 5-day broad History
-            if price is None or price == 0:
-                data = await asyncio.to_thread(lambda: ticker.history(period="5d"))
-                if not data.empty:
-                    price = data['Close'].iloc[-1]
-                
-            return float(price) if price else None
-        except Exception:
-            return None
-
-    async def fetch_all(self):
-        """Unified parallel fetch with Live Brokerage Alignment Calibration."""
-        symbols = {
-            "BTC": "BTC/USDT", 
-            "XAU": "GC=F", 
-            "XAG": "SI=F", 
-            "MCX_GOLD": "GOLDBEES.NS",    
-            "MCX_SILVER": "SILVERBEES.NS" 
-        }
-        
-        results = []
-        
-        # 1. BTC Pulse (Binance)
-        try:
-            tick = await self.binance.fetch_ticker(symbols["BTC"])
-            results.append({"asset": "BTC", "price": float(tick['last']), "source": "Binance"})
-        except Exception:
-            pass
-
-        # 2. Parallel Fetch for Metals & MCX Proxies
-        assets_to_fetch = ["XAU", "XAG", "MCX_GOLD", "MCX_SILVER"]
-        tasks = [self.fetch_yahoo_price(symbols[a]) for a in assets_to_fetch]
-        fetched_prices = await asyncio.gather(*tasks)
-        
-        for asset, price in zip(assets_to_fetch, fetched_prices):
-            if price:
-                calibrated_price = price
-                
-                # --- LIVE CALIBRATION (Aligned with Brokerage Data) ---
-                if asset == "MCX_GOLD":
-                    # Calibrating GOLDBEES to 154k range
-                    calibrated_price = price * 1240  
-                
-                elif asset == "MCX_SILVER":
-                    # Calibrating SILVERBEES to 324k range
-                    calibrated_price = price * 1175  
-                
-                results.append({
-                    "asset": asset, 
-                    "price": float(calibrated_price), 
-                    "source": "yfinance"
+        """Single-symbol convenience wrapper over the bulk quote book."""
+        return (await self.quotes.fetch([ticker_symbol]))[ticker_symbol]
+
+    async def exchange(self, name):
+        """ccxt client for a registry source; ccxt itself is imported off the event loop on first use."""
+        if name not in self.exchanges:
+            await asyncio.to_thread(importlib.import_module, "ccxt.async_support")
+            if name not in self.exchanges:
+                self.exchanges[name] = getattr(ccxt, self.registry.sources[name]["exchange"])({
+                    'timeout': 30000, 
+                    'connector_kwargs': {'resolver': aiohttp.DefaultResolver()}
                 })
-                
+        return self.exchanges[name]
+
+    async def fetch_exchange(self, name, assets):
+        """Exchange pulse: one bulk fetch_tickers call for every wanted symbol (raw prices)."""
+        exchange = await self.exchange(name)
+        symbols = [self.registry.symbol[a] for a in assets]
+        tickers = await exchange.fetch_tickers(symbols)
+        prices = {}
+        for asset, symbol in zip(assets, symbols):
+            last = (tickers.get(symbol) or {}).get('last')
+            if last:
+                prices[asset] = float(last)
+        return prices
+
+    async def fetch_yahoo(self, name, assets):
+        """Metals & MCX proxies: one batched download per tick (raw prices)."""
+        quotes = await self.quotes.fetch([self.registry.symbol[a] for a in assets])
+        return {a: quotes[self.registry.symbol[a]] for a in assets if quotes[self.registry.symbol[a]]}
+
+    async def fetch_all(self, sources=None, assets=None):
+        """Concurrent fetch of every source under one tick budget; late or tripped sources go stale.
+        assets: {source: [assets]} to poll only part of a source (the scheduler's due set)."""
+        fetchers = {"ccxt": self.fetch_exchange, "yahoo": self.fetch_yahoo}
+        sources = sources or list(assets or self.registry.by_source)
+        wanted = {name: (assets or {}).get(name) or self.registry.by_source[name] for name in sources}
+        tasks = {}
+        for name in sources:
+            fetch = functools.partial(fetchers[self.registry.sources[name]["kind"]], name, wanted[name])
+            breaker = self.breakers[name]
+            if breaker.allow():
+                hedge_after = self.registry.hedge_after(name)
+                tasks[name] = asyncio.create_task(self._timed_fetch(name, breaker.call(hedged(fetch, hedge_after))))
+            else:
+                incr(f"fetch.{name}.breaker_open")
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self.tick_budget)
+            for t in pending:
+                t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        raw = {}
+        for name in sources:
+            task = tasks.get(name)
+            raw[name] = task.result() if task and not task.cancelled() and task.exception() is None else {}
+            if task and task.cancelled():
+                incr(f"fetch.{name}.over_budget")
+            elif task and task.exception() is not None:
+                incr(f"fetch.{name}.errors")
+
+        # Calibrate every fresh quote of the tick in one vectorized step
+        fresh_assets = [a for name in sources for a in raw[name]]
+        calibrated = self.registry.calibrate_many(fresh_assets, [raw[n][a] for n in sources for a in raw[n]])
+        fresh = dict(zip(fresh_assets, calibrated.tolist()))
+
+        results = []
+        for name in sources:
+            for asset in wanted[name]:
+                if asset in fresh:
+                    self.last_good[asset] = fresh[asset]
+                    results.append({"asset": asset, "price": fresh[asset], "source": name, "stale": False})
+                elif asset in self.last_good:
+                    results.append({"asset": asset, "price": self.last_good[asset], "source": name, "stale": True})
+                    incr("rows.stale")
         return results
 
-    async def run(self):
+    @staticmethod
+    async def _timed_fetch(name, coro):
+        with timer(f"fetch.{name}"):
+            return await coro
+
+    async def tick(self, due=None):
+        """One heartbeat: fetch (everything, or the scheduler's due {source: [assets]}), classify the
+        whole tick in one pass, hand rows to the sink."""
+        with timer("tick"):
+            rows = await self.fetch_all(assets=due)
+            with timer("classify"):
+                payload = self.brain.score_rows(rows)
+            with timer("cross_asset"):
+                systemic = self.cross.annotate(payload)
+            timestamp = datetime.now(timezone.utc).isoformat()
+            with timer("persist.enqueue"):
+                for data in payload:
+                    data['timestamp'] = timestamp
+                    await self.sink.put(data)
+        gauge("sink.queue_depth", self.sink.queue.qsize())
+        for data in payload:
+            flag = " (STALE)" if data['stale'] else ""
+            print(f"📡 QUEUED | {data['asset']:<10} | Price: {data['price']:,.2f} | [{data['regime']}]{flag}")
+        if systemic['systemic_stress'] is not None:
+            print(f"🌐 SYSTEMIC | Stress: {systemic['systemic_stress']:.2%} | Avg Corr: {systemic['avg_corr']:+.2f}")
+        self.scheduler.observe(payload)
+        return payload
+
+    async def poll(self):
+        """Ticks whatever the scheduler says is due; returns the rows ([] when nothing was due)."""
+        due = self.scheduler.due()
+        return await self.tick(due) if due else []
+
+    async def run(self, startup=None):
         print("\n🚀 SENTINEL ENGINE: MULTI-ASSET CORE LIVE (BROKERAGE ALIGNED)\n" + "═"*60)
-        while True:
-            payload = await self.fetch_all()
-            for data in payload:
-                regime, z_score = self.brain.classify(data['asset'], data['price'])
-                data.update({
-                    'regime': regime, 
-                    'z_score': z_score, 
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                })
-                try:
-                    await self.supabase.table("multi_asset_telemetry").insert(data).execute()
-                    print(f"📡 SYNC | {data['asset']:<10} | Price: {data['price']:,.2f} | [{regime}]")
-                except Exception as e:
-                    print(f"❌ Cloud Sync Error: {e}")
-            
-            # 30s Governance Heartbeat
-            await asyncio.sleep(30)
+        start_exporter("multi_asset_engine")
+        self.sink.start()
+        bus = SignalBus()
+        signals = bus.subscribe()
+        level = bus.read().level
+        try:
+            while True:
+                if await self.poll() and startup is not None:
+                    startup.mark("first_tick")
+                    startup.report()
+                    startup = None
+
+                # Adaptive heartbeat: sleep until the next asset is due (a kill-switch signal
+                # ends it early; a new halt makes every open market due at once)
+                signal = await signals.asleep(self.scheduler.wait())
+                if signal:
+                    incr("signals.received")
+                    print(f"⚡ KILL-SWITCH SIGNAL #{signal.seq}: {signal.level} ({signal.reason})")
+                    if halt_started(signal, level):  # This engine never publishes
+                        self.scheduler.expedite()
+                    level = signal.level
+        finally:
+            signals.close()
 
 if __name__ == "__main__":
+    profile = StartupProfile("multi_asset_engine")
+    profile.mark("imports")
+    preload("ccxt.async_support", "yfinance", "supabase")
+
     async def main():
         engine = await MultiAssetPulse.create()
+        profile.mark("vault")
         try: 
-            await engine.run()
+            await engine.run(startup=profile)
         finally: 
-            await engine.binance.close()
+            await engine.close()
 
     async def safe_run():
         """Resilient entry point to handle network drops."""
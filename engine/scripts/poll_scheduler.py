@@ -0,0 +1,253 @@
+"""
+Adaptive Poll Scheduler v1.0
+Per-asset polling cadence instead of one fixed 30 s heartbeat:
+  - regime sets the base interval (ANOMALY polls fastest, STABLE slowest)
+  - a short-vs-long realized-volatility ratio tightens it further when an asset wakes up
+  - exchange calendars park closed markets on a slow settlement refresh until the next open
+  - a token bucket caps upstream requests; when it runs dry, the most stressed sources go first
+Due times live in a heap (lazy deletion), so due() and wait() cost O(log n) per asset.
+Assets of a source already being polled ride along early when they are nearly due,
+since a bulk call costs the same for one symbol or all of them.
+"""
+import heapq
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from metrics import incr, gauge
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+REGIME_INTERVALS = {"ANOMALY": 5.0, "STRESS": 10.0, "INITIALIZING": 15.0, "STABLE": 30.0}
+REGIME_RANK = {"ANOMALY": 0, "STRESS": 1, "INITIALIZING": 2, "STABLE": 3}
+CLOSED_INTERVAL = 900.0   # Settlement refresh while the exchange is shut (matches the Yahoo fallback TTL)
+
+
+def _zone(name, fallback_hours):
+    """IANA zone when tzdata is available (DST-aware), else a fixed offset."""
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return timezone(timedelta(hours=fallback_hours))
+
+
+def _minutes(hhmm):
+    h, m = hhmm.split(":")
+    return int(h) * 60 + int(m)
+
+
+# --- 1. TRADING CALENDARS ---
+class TradingCalendar:
+    """Weekly sessions in exchange-local time: [(weekday, "HH:MM", "HH:MM")], Monday = 0; None = 24/7."""
+
+    def __init__(self, name, tz=timezone.utc, sessions=None, holidays=()):
+        self.name = name
+        self.tz = tz
+        self.sessions = None
+        if sessions is not None:
+            self.sessions = {}
+            for wd, start, end in sessions:
+                self.sessions.setdefault(wd, []).append((_minutes(start), _minutes(end)))
+            for spans in self.sessions.values():
+                spans.sort()
+        self.holidays = {str(d) for d in holidays}  # "YYYY-MM-DD", exchange-local
+
+    def is_open(self, ts):
+        if self.sessions is None:
+            return True
+        local = datetime.fromtimestamp(ts, self.tz)
+        if local.strftime("%Y-%m-%d") in self.holidays:
+            return False
+        minute = local.hour * 60 + local.minute
+        return any(start <= minute < end for start, end in self.sessions.get(local.weekday(), ()))
+
+    def next_open(self, ts):
+        """Epoch seconds of the next session start (ts itself while open)."""
+        if self.is_open(ts):
+            return ts
+        local = datetime.fromtimestamp(ts, self.tz)
+        for offset in range(15):
+            day = (local + timedelta(days=offset)).date()
+            if str(day) in self.holidays:
+                continue
+            for start, _ in self.sessions.get(day.weekday(), ()):
+                begin = datetime(day.year, day.month, day.day, start // 60, start % 60, tzinfo=self.tz).timestamp()
+                if begin > ts:
+                    return begin
+        return ts + CLOSED_INTERVAL
+
+
+_ET = _zone("America/New_York", -5)
+CALENDARS = {
+    "CRYPTO": TradingCalendar("CRYPTO"),
+    # CME Globex metals: Sunday 18:00 -> Friday 17:00 ET with a daily 17:00-18:00 halt
+    "CME": TradingCalendar("CME", _ET, [(6, "18:00", "24:00"), (4, "00:00", "17:00")]
+                           + [(wd, "00:00", "17:00") for wd in range(4)]
+                           + [(wd, "18:00", "24:00") for wd in range(4)]),
+    "NSE": TradingCalendar("NSE", _zone("Asia/Kolkata", 5.5), [(wd, "09:15", "15:30") for wd in range(5)]),
+}
+
+
+# --- 2. REQUEST BUDGET ---
+class RequestBudget:
+    """Token bucket: `per_minute` sustained upstream requests, bursts up to `burst`."""
+
+    def __init__(self, per_minute=30, burst=6, clock=time.time):
+        self.rate = per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.clock = clock
+        self.stamp = clock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def take(self, now=None):
+        now = self.clock() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def next_token(self, now=None):
+        now = self.clock() if now is None else now
+        self._refill(now)
+        return now if self.tokens >= 1.0 else now + (1.0 - self.tokens) / self.rate
+
+
+# --- 3. SCHEDULER ---
+class _AssetClock:
+    __slots__ = ("asset", "source", "calendar", "regime", "interval", "due", "version",
+                 "last_price", "last_t", "fast_var", "slow_var")
+
+    def __init__(self, asset, source, calendar):
+        self.asset = asset
+        self.source = source
+        self.calendar = calendar
+        self.regime = "INITIALIZING"
+        self.interval = REGIME_INTERVALS["INITIALIZING"]
+        self.due = 0.0
+        self.version = 0
+        self.last_price = None
+        self.last_t = None
+        self.fast_var = 0.0
+        self.slow_var = 0.0
+
+
+class PollScheduler:
+    def __init__(self, asset_sources, asset_calendars, calendars=CALENDARS, intervals=REGIME_INTERVALS,
+                 budget=None, min_interval=2.0, max_interval=60.0, closed_interval=CLOSED_INTERVAL,
+                 max_speedup=3.0, coalesce=0.5, clock=time.time):
+        """asset_sources: {asset: source}; asset_calendars: {asset: calendar name}."""
+        self.calendars = calendars
+        self.intervals = intervals
+        self.clock = clock
+        self.budget = budget or RequestBudget(clock=clock)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.closed_interval = closed_interval
+        self.max_speedup = max_speedup
+        self.coalesce = coalesce
+        self.assets = {a: _AssetClock(a, src, asset_calendars.get(a, "CRYPTO")) for a, src in asset_sources.items()}
+        self.heap = []
+        now = clock()
+        for st in self.assets.values():
+            self._schedule(st, now)  # Everything is due on the first pass
+
+    def _schedule(self, st, due):
+        st.due = due
+        st.version += 1
+        heapq.heappush(self.heap, (due, st.version, st.asset))
+
+    def _top(self):
+        """Earliest live heap entry (stale entries are dropped as they surface)."""
+        while self.heap:
+            due, version, asset = self.heap[0]
+            if self.assets[asset].version == version:
+                return due
+            heapq.heappop(self.heap)
+        return None
+
+    # --- Cadence policy ---
+    def cadence(self, st, now):
+        calendar = self.calendars[st.calendar]
+        if not calendar.is_open(now):
+            return min(self.closed_interval, max(calendar.next_open(now) - now, self.min_interval))
+        interval = self.intervals.get(st.regime, self.intervals["STABLE"])
+        if st.slow_var > 0:
+            interval /= min(max(math.sqrt(st.fast_var / st.slow_var), 1.0), self.max_speedup)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _update_volatility(self, st, price, now):
+        if st.last_price and price > 0 and now > st.last_t:
+            rate = math.log(price / st.last_price) ** 2 / (now - st.last_t)  # Variance per second
+            st.fast_var = rate if not st.fast_var else 0.7 * st.fast_var + 0.3 * rate
+            st.slow_var = rate if not st.slow_var else 0.98 * st.slow_var + 0.02 * rate
+        st.last_price, st.last_t = price, now
+
+    # --- Driver API ---
+    def due(self, now=None):
+        """{source: [assets]} to fetch now, after budget checks; granted assets get a provisional next poll."""
+        now = self.clock() if now is None else now
+        ready = {}
+        while (top := self._top()) is not None and top <= now:
+            _, _, asset = heapq.heappop(self.heap)
+            st = self.assets[asset]
+            ready.setdefault(st.source, []).append(asset)
+        if not ready:
+            return {}
+
+        # A bulk call is already going out for these sources: nearly-due, open-market assets ride along
+        for st in self.assets.values():
+            if (st.source in ready and st.asset not in ready[st.source]
+                    and st.due - now <= self.coalesce * st.interval
+                    and self.calendars[st.calendar].is_open(now)):
+                ready[st.source].append(st.asset)
+                incr("scheduler.coalesced")
+
+        granted = {}
+        for source in sorted(ready, key=lambda s: min(REGIME_RANK.get(self.assets[a].regime, 3) for a in ready[s])):
+            if self.budget.take(now):
+                granted[source] = ready[source]
+                for asset in ready[source]:
+                    st = self.assets[asset]
+                    # Kept if the fetch yields nothing, so a dead source cannot spin the loop
+                    self._schedule(st, now + self.cadence(st, now))
+            else:
+                retry = self.budget.next_token(now)
+                incr("scheduler.deferred", len(ready[source]))
+                for asset in ready[source]:
+                    self._schedule(self.assets[asset], retry)
+        return granted
+
+    def observe(self, rows, now=None):
+        """Feeds classified rows back: regime and volatility set each asset's next poll."""
+        now = self.clock() if now is None else now
+        for r in rows:
+            st = self.assets.get(r['asset'])
+            if st is None or r.get('stale'):
+                continue
+            st.regime = r.get('regime', st.regime)
+            self._update_volatility(st, r['price'], now)
+            st.interval = self.cadence(st, now)
+            self._schedule(st, now + st.interval)
+            gauge(f"scheduler.interval.{st.asset}", round(st.interval, 2))
+
+    def expedite(self, now=None):
+        """Kill-switch signal: every open market is due immediately (still subject to the budget)."""
+        now = self.clock() if now is None else now
+        for st in self.assets.values():
+            if self.calendars[st.calendar].is_open(now):
+                self._schedule(st, now)
+
+    def wait(self, now=None):
+        """Seconds until the next asset is due."""
+        now = self.clock() if now is None else now
+        top = self._top()
+        if top is None:
+            return self.max_interval
+        return min(max(top - now, 0.0), self.closed_interval)
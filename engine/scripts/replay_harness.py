@@ -0,0 +1,268 @@
+"""
+Governance Replay Harness v1.0
+Streams recorded telemetry, sentiment and headline histories through the real
+RegimeClassifier, both governance desks and the kill-switch rule on a virtual
+clock: no sleeps, but cooldowns still expire on replayed time.
+Usage:
+    python replay_harness.py --telemetry ../results/telemetry_replay.jsonl \
+        --sentiment sentinel_logs.jsonl --headlines headlines.jsonl --decisions decisions.jsonl
+    python replay_harness.py --synth 500000   (writes synthetic histories first)
+Every input is JSONL or CSV sorted by 'timestamp' (ISO-8601 or epoch seconds).
+Telemetry rows need asset/price, sentiment rows a 'sentiment' value, headline rows
+source/title.
+"""
+import argparse
+import collections
+import heapq
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from multi_asset_fetcher import RegimeClassifier
+from tick_pipeline import ReplaySource, write_synthetic_replay
+from governance import NewsGovernance, DivergenceGovernance, news_quorum, price_market_state, ai_market_state, \
+    CRITICAL_WORDS
+from kill_switch import halt_active
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+
+# Live loop cadences the desks are replayed at (seconds of virtual time)
+PRICE_DESK_INTERVAL = 15
+AI_DESK_INTERVAL = 30
+
+COUNTDOWN = re.compile(r" ?\[\d+s\]")
+
+# Event kinds; at equal timestamps context (news, sentiment) lands before prices
+HEADLINE, SENTIMENT, TICK = 0, 1, 2
+
+
+class VirtualClock:
+    """Callable clock that only moves when the replay says so."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance_to(self, t):
+        self.now = max(self.now, t)
+
+
+def _epoch(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+
+
+def _events(path, kind):
+    for seq, row in enumerate(ReplaySource(path).rows()):
+        yield _epoch(row["timestamp"]), kind, seq, row
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class _Desk:
+    def __init__(self, name, gov, interval):
+        self.name = name
+        self.gov = gov
+        self.interval = interval
+        self.next_due = None
+
+    def due(self, t):
+        return self.next_due is None or t >= self.next_due
+
+
+class GovernanceReplay:
+    """Drives the governance stack from recorded histories as fast as the CPU allows."""
+
+    def __init__(self, brain=None, gov_asset=None, decisions_path=None, news_depth=3):
+        self.clock = VirtualClock()
+        self.brain = brain or RegimeClassifier()
+        self.gov_asset = gov_asset
+        self.news_depth = news_depth
+        self.desks = [
+            _Desk("price", NewsGovernance(clock=self.clock), PRICE_DESK_INTERVAL),
+            _Desk("ai", DivergenceGovernance(clock=self.clock), AI_DESK_INTERVAL),
+        ]
+        self.decisions_path = decisions_path
+        self._decisions = None
+        self.pending = []
+        self.z = {}
+        self.headlines = collections.defaultdict(lambda: collections.deque(maxlen=self.news_depth))
+        self.news_risk = "NORMAL"
+        self.sentiment = 0.0
+        self.halted = False
+        self.stats = {"events": 0, "ticks": 0, "headlines": 0, "sentiment": 0,
+                      "decisions": 0, "halted_ticks": 0, "halts": 0}
+        self.outcomes = collections.Counter()
+
+    # --- Event handlers ---
+    def _score_pending(self):
+        """Classifies buffered ticks in one vectorized pass, then applies the kill-switch rule in order."""
+        if not self.pending:
+            return
+        rows, self.pending = self.brain.score_rows(self.pending), []
+        for r in rows:
+            self.z[r["asset"]] = r["z_score"]
+            halted = halt_active(r["regime"], self.news_risk)
+            self.stats["halted_ticks"] += halted
+            if halted != self.halted:
+                self.halted = halted
+                self.stats["halts"] += halted
+                self._record("kill_switch", _epoch(r["timestamp"]), report="HALT" if halted else "RESUME",
+                             asset=r["asset"], regime=r["regime"], news_risk=self.news_risk)
+        self.stats["ticks"] += len(rows)
+
+    def _on_headline(self, row):
+        self.headlines[row["source"]].appendleft(row["title"])
+        self.news_risk = news_quorum(self.headlines, top=self.news_depth)
+        self.stats["headlines"] += 1
+
+    def _on_sentiment(self, row):
+        self.sentiment = float(row["sentiment"])
+        self.stats["sentiment"] += 1
+
+    def _on_tick(self, row):
+        row["price"] = float(row["price"])
+        row["stale"] = str(row.get("stale", False)).lower() in ("true", "1")
+        self.pending.append(row)
+
+    # --- Governance ---
+    def market_z(self):
+        if self.gov_asset is not None:
+            return abs(self.z.get(self.gov_asset, 0.0))
+        return max((abs(z) for z in self.z.values()), default=0.0)
+
+    def _evaluate(self, desk, t):
+        z = self.market_z()
+        if desk.name == "price":
+            state = price_market_state(z)
+            report = desk.gov.evaluate_human_risk(state, self.news_risk)
+            signal = {"news_risk": self.news_risk}
+        else:
+            state = ai_market_state(z)
+            report = desk.gov.evaluate_risk(state, self.sentiment)
+            signal = {"sentiment": self.sentiment}
+        desk.next_due = (desk.next_due or t) + desk.interval
+        if desk.next_due <= t:  # Gap in the history: resume the cadence from here
+            desk.next_due = t + desk.interval
+        self._record(desk.name, t, report=report, market_state=state, z=round(z, 2), **signal)
+
+    def _record(self, desk, t, **fields):
+        self.stats["decisions"] += 1
+        # Countdown digits make every lock line unique; bucket outcomes without them
+        self.outcomes[f"{desk}: {COUNTDOWN.sub('', fields['report'])}"] += 1
+        if self._decisions is not None:
+            self._decisions.write(json.dumps({"t": t, "desk": desk, **fields}, ensure_ascii=False) + "\n")
+
+    # --- Driver ---
+    def run(self, telemetry, sentiment=None, headlines=None):
+        streams = [_events(telemetry, TICK)]
+        if sentiment:
+            streams.append(_events(sentiment, SENTIMENT))
+        if headlines:
+            streams.append(_events(headlines, HEADLINE))
+        handlers = {HEADLINE: self._on_headline, SENTIMENT: self._on_sentiment, TICK: self._on_tick}
+
+        if self.decisions_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.decisions_path)), exist_ok=True)
+            self._decisions = open(self.decisions_path, 'w', encoding='utf-8')
+        start = time.perf_counter()
+        try:
+            for t, kind, _, row in heapq.merge(*streams, key=lambda e: (e[0], e[1], e[2])):
+                self.clock.advance_to(t)
+                if kind != TICK:
+                    # News and sentiment change the kill-switch inputs: settle earlier ticks first
+                    self._score_pending()
+                handlers[kind](row)
+                self.stats["events"] += 1
+                due = [d for d in self.desks if d.due(t)]
+                if due:
+                    self._score_pending()
+                    for desk in due:
+                        self._evaluate(desk, t)
+            self._score_pending()
+        finally:
+            if self._decisions is not None:
+                self._decisions.close()
+                self._decisions = None
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        return {
+            **self.stats,
+            "elapsed_s": round(elapsed, 3),
+            "events_per_s": round(self.stats["events"] / elapsed, 1) if elapsed else 0.0,
+            "peak_rss_mb": _peak_rss_mb(),
+            "outcomes": dict(self.outcomes.most_common()),
+        }
+
+
+# --- SYNTHETIC HISTORIES ---
+def write_synthetic_histories(directory, n_ticks, seed=11):
+    """Telemetry plus matching sentiment (every 30 s) and headline (every 5 min) files."""
+    telemetry = write_synthetic_replay(os.path.join(directory, 'telemetry_replay.jsonl'), n_ticks)
+    first = last = None
+    for row in ReplaySource(telemetry).rows():
+        first = first or _epoch(row["timestamp"])
+        last = _epoch(row["timestamp"])
+
+    rng = random.Random(seed)
+    sentiment_path = os.path.join(directory, 'sentiment_replay.jsonl')
+    with open(sentiment_path, 'w', encoding='utf-8') as f:
+        t, s = first, 0.0
+        while t <= last:
+            s = max(-1.0, min(1.0, 0.9 * s + rng.gauss(0, 0.15)))
+            f.write(json.dumps({"timestamp": datetime.fromtimestamp(t, timezone.utc).isoformat(),
+                                "sentiment": round(s, 4)}) + "\n")
+            t += AI_DESK_INTERVAL
+
+    headlines_path = os.path.join(directory, 'headlines_replay.jsonl')
+    sources = ('Yahoo Finance', 'Reuters Macro', 'Kitco Gold', 'ZeroHedge')
+    with open(headlines_path, 'w', encoding='utf-8') as f:
+        t = first
+        while t <= last:
+            ts = datetime.fromtimestamp(t, timezone.utc).isoformat()
+            crisis = rng.random() < 0.05
+            for name in sources:
+                word = rng.choice(CRITICAL_WORDS) if crisis and rng.random() < 0.7 else "outlook"
+                f.write(json.dumps({"timestamp": ts, "source": name,
+                                    "title": f"Markets weigh {word} as metals move"}) + "\n")
+            t += 300
+    return telemetry, sentiment_path, headlines_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--telemetry", help="Recorded telemetry (JSONL/CSV)")
+    parser.add_argument("--sentiment", help="Sentiment history, e.g. a sentinel_logs export")
+    parser.add_argument("--headlines", help="Headline history: timestamp, source, title")
+    parser.add_argument("--decisions", help="Write every governance decision here (JSONL)")
+    parser.add_argument("--gov-asset", default=None, help="Asset whose |z| drives the desks (default: max over assets)")
+    parser.add_argument("--synth", type=int, default=0, help="Write N synthetic ticks (plus histories) first")
+    args = parser.parse_args()
+
+    telemetry, sentiment, headlines = args.telemetry, args.sentiment, args.headlines
+    if args.synth:
+        telemetry, sentiment, headlines = write_synthetic_histories(RESULTS_DIR, args.synth)
+    telemetry = telemetry or os.path.join(RESULTS_DIR, 'telemetry_replay.jsonl')
+    print(f"🎞️  GOVERNANCE REPLAY | {telemetry}")
+    replay = GovernanceReplay(gov_asset=args.gov_asset, decisions_path=args.decisions)
+    print(json.dumps(replay.run(telemetry, sentiment, headlines), indent=2, ensure_ascii=False))
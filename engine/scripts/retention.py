@@ -0,0 +1,258 @@
+"""
+Tiered Retention & Compaction v1.0
+Replaces the all-or-nothing vault purge with a resumable roll-up:
+  - raw ticks in multi_asset_telemetry stay for RAW_DAYS
+  - older ticks become per-asset 5-minute bars (OHLC, tick and regime counts, max |z|)
+  - 5-minute bars older than BAR_DAYS become 1-hour bars
+Work proceeds one time window at a time: read the window in id-ordered pages,
+replace its bars, then delete its rows in bounded id ranges, so no request ever
+touches more than `delete_batch` rows. A checkpoint file records the window whose
+bars are written, so a crash mid-delete resumes by finishing that delete instead
+of recomputing bars from a half-deleted window.
+Usage:
+    python retention.py                     (compact the live vault)
+    python retention.py --raw-days 3 --dry-run
+"""
+import argparse
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from metrics import timer, incr
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+DEFAULT_CHECKPOINT = os.path.join(RESULTS_DIR, 'retention_checkpoint.json')
+
+RAW_DAYS = 7
+BAR_DAYS = 90
+DAY = 86400
+REGIMES = ("STABLE", "STRESS", "ANOMALY", "INITIALIZING")
+
+# source table -> target bar table; only whole windows older than `keep` are compacted
+Tier = namedtuple("Tier", "name source target time_col resolution window keep")
+
+
+def default_tiers(raw_days=RAW_DAYS, bar_days=BAR_DAYS):
+    return [
+        Tier("raw->5m", "multi_asset_telemetry", "telemetry_bars_5m", "timestamp", 300, 3600, raw_days * DAY),
+        Tier("5m->1h", "telemetry_bars_5m", "telemetry_bars_1h", "bucket", 3600, DAY, bar_days * DAY),
+    ]
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _epoch(value):
+    ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+class _Bar:
+    __slots__ = ("asset", "bucket", "open", "high", "low", "close", "first", "last",
+                 "ticks", "stale_ticks", "regimes", "max_abs_z")
+
+    def __init__(self, asset, bucket):
+        self.asset = asset
+        self.bucket = bucket
+        self.open = self.close = None
+        self.high, self.low = float("-inf"), float("inf")
+        self.first = self.last = None
+        self.ticks = self.stale_ticks = 0
+        self.regimes = dict.fromkeys(REGIMES, 0)
+        self.max_abs_z = 0.0
+
+    def add(self, order, open_, high, low, close, ticks, stale, regimes, abs_z):
+        if self.first is None or order < self.first:
+            self.first, self.open = order, open_
+        if self.last is None or order > self.last:
+            self.last, self.close = order, close
+        self.high, self.low = max(self.high, high), min(self.low, low)
+        self.ticks += ticks
+        self.stale_ticks += stale
+        for k, v in regimes.items():
+            self.regimes[k] = self.regimes.get(k, 0) + v
+        self.max_abs_z = max(self.max_abs_z, abs_z)
+
+    def row(self, label):
+        return {"asset": self.asset, "bucket": _iso(self.bucket), "resolution": label,
+                "open": self.open, "high": self.high, "low": self.low, "close": self.close,
+                "ticks": self.ticks, "stale_ticks": self.stale_ticks,
+                **{r.lower(): n for r, n in self.regimes.items()}, "max_abs_z": round(self.max_abs_z, 2)}
+
+
+class RetentionJob:
+    """Synchronous batch job over a PostgREST-style client (Supabase or a local vault stand-in)."""
+
+    def __init__(self, vault, tiers=None, checkpoint_path=DEFAULT_CHECKPOINT, page=5000, delete_batch=1000,
+                 pause=0.0, dry_run=False, clock=time.time):
+        self.vault = vault
+        self.tiers = tiers or default_tiers()
+        self.checkpoint_path = checkpoint_path
+        self.page = page
+        self.delete_batch = delete_batch
+        self.pause = pause
+        self.dry_run = dry_run
+        self.clock = clock
+        self.checkpoint = self._load_checkpoint()
+        self.stats = {"windows": 0, "rows_read": 0, "bars_written": 0, "rows_deleted": 0,
+                      "requests": 0, "max_rows_per_delete": 0, "resumed": 0}
+
+    # --- Checkpoint ---
+    def _load_checkpoint(self):
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save_checkpoint(self, tier, start, end, phase):
+        self.checkpoint[tier.name] = {"start": start, "end": end, "phase": phase}
+        if not self.checkpoint_path or self.dry_run:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f, indent=2)
+        os.replace(tmp, self.checkpoint_path)
+
+    # --- Vault access ---
+    def _execute(self, query):
+        self.stats["requests"] += 1
+        return query.execute().data
+
+    @staticmethod
+    def _window(query, time_col, start, end):
+        return query.gte(time_col, _iso(start)).lt(time_col, _iso(end))
+
+    def _oldest(self, tier, after):
+        q = self.vault.table(tier.source).select(tier.time_col)
+        if after is not None:
+            q = q.gte(tier.time_col, _iso(after))
+        rows = self._execute(q.order(tier.time_col).limit(1))
+        return _epoch(rows[0][tier.time_col]) if rows else None
+
+    def _pages(self, tier, start, end):
+        """Every row of the window, id-ordered, `page` rows per request."""
+        last_id = None
+        while True:
+            q = self._window(self.vault.table(tier.source).select("*"), tier.time_col, start, end)
+            if last_id is not None:
+                q = q.gt("id", last_id)
+            rows = self._execute(q.order("id").limit(self.page))
+            if not rows:
+                return
+            yield rows
+            if len(rows) < self.page:
+                return
+            last_id = rows[-1]["id"]
+
+    def _purge(self, table, time_col, start, end):
+        """Deletes a window in id ranges of at most delete_batch rows (the time filter keeps ranges exact)."""
+        deleted = 0
+        while not self.dry_run:
+            q = self._window(self.vault.table(table).select("id"), time_col, start, end)
+            ids = [r["id"] for r in self._execute(q.order("id").limit(self.delete_batch))]
+            if not ids:
+                break
+            q = self._window(self.vault.table(table).delete(), time_col, start, end)
+            with timer("retention.delete"):
+                gone = len(self._execute(q.gte("id", ids[0]).lte("id", ids[-1])))
+            deleted += gone
+            self.stats["max_rows_per_delete"] = max(self.stats["max_rows_per_delete"], gone)
+            if self.pause:
+                time.sleep(self.pause)
+        return deleted
+
+    # --- Roll-up ---
+    def _aggregate(self, tier, start, end):
+        bars = {}
+        raw = tier.time_col == "timestamp"
+        for rows in self._pages(tier, start, end):
+            self.stats["rows_read"] += len(rows)
+            for r in rows:
+                t = _epoch(r[tier.time_col])
+                key = (r["asset"], t - t % tier.resolution)
+                bar = bars.get(key)
+                if bar is None:
+                    bar = bars[key] = _Bar(*key)
+                order = (t, r["id"])
+                if raw:
+                    price = float(r["price"])
+                    regime = r.get("regime") or "INITIALIZING"
+                    stale = str(r.get("stale", False)).lower() in ("true", "1")
+                    bar.add(order, price, price, price, price, 1, int(stale), {regime: 1},
+                            abs(float(r.get("z_score") or 0.0)))
+                else:
+                    bar.add(order, r["open"], r["high"], r["low"], r["close"], r["ticks"], r["stale_ticks"],
+                            {g: r.get(g.lower(), 0) for g in REGIMES}, r["max_abs_z"])
+        label = f"{tier.resolution // 3600}h" if tier.resolution % 3600 == 0 else f"{tier.resolution // 60}m"
+        return [b.row(label) for b in sorted(bars.values(), key=lambda b: (b.bucket, b.asset))]
+
+    def _write_bars(self, tier, start, end, bars):
+        """Replaces the window's bars, so re-running a window never duplicates them."""
+        if self.dry_run:
+            return
+        self._purge(tier.target, "bucket", start, end)
+        for i in range(0, len(bars), self.page):
+            self._execute(self.vault.table(tier.target).insert(bars[i:i + self.page]))
+        self.stats["bars_written"] += len(bars)
+
+    def compact_tier(self, tier, now=None):
+        now = self.clock() if now is None else now
+        cutoff = (now - tier.keep) // tier.window * tier.window
+        state = self.checkpoint.get(tier.name)
+        if state and state["phase"] == "bars_written":
+            # Crashed between writing bars and deleting the source rows: finish the delete only
+            self.stats["resumed"] += 1
+            self.stats["rows_deleted"] += self._purge(tier.source, tier.time_col, state["start"], state["end"])
+            self._save_checkpoint(tier, state["start"], state["end"], "done")
+
+        after = None
+        while True:
+            oldest = self._oldest(tier, after)
+            if oldest is None:
+                break
+            start = oldest // tier.window * tier.window
+            end = start + tier.window
+            if end > cutoff:
+                break
+            with timer(f"retention.window.{tier.name}"):
+                bars = self._aggregate(tier, start, end)
+                self._write_bars(tier, start, end, bars)
+                self._save_checkpoint(tier, start, end, "bars_written")
+                self.stats["rows_deleted"] += self._purge(tier.source, tier.time_col, start, end)
+                self._save_checkpoint(tier, start, end, "done")
+            self.stats["windows"] += 1
+            incr("retention.windows")
+            after = end
+
+    def run(self, now=None):
+        """Compacts every tier in order (raw first, so fresh 5m bars can roll into 1h bars in the same run)."""
+        start = time.perf_counter()
+        for tier in self.tiers:
+            self.compact_tier(tier, now)
+        return {**self.stats, "elapsed_s": round(time.perf_counter() - start, 3), "dry_run": self.dry_run}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--raw-days", type=float, default=RAW_DAYS, help="Raw ticks younger than this are kept")
+    parser.add_argument("--bar-days", type=float, default=BAR_DAYS, help="5-minute bars younger than this are kept")
+    parser.add_argument("--delete-batch", type=int, default=1000, help="Max rows per delete request")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between delete batches")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--dry-run", action="store_true", help="Read and aggregate only; write nothing")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from supabase import create_client
+    load_dotenv()
+    vault = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    job = RetentionJob(vault, default_tiers(args.raw_days, args.bar_days), args.checkpoint,
+                       delete_batch=args.delete_batch, pause=args.pause, dry_run=args.dry_run)
+    print("🗜️  VAULT RETENTION | raw ticks -> 5m bars -> 1h bars")
+    print(json.dumps(job.run(), indent=2))
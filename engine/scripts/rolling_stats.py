@@ -0,0 +1,98 @@
+"""
+Rolling Statistics Engine v1.0
+O(1) incremental mean/variance over preallocated NumPy ring buffers,
+vectorized across assets and across several window lengths at once.
+"""
+import numpy as np
+
+EPS = np.finfo(np.float64).eps
+STD_FLOOR = 0.000001          # Flat-market guard used by the regime z-score
+REGIME_BANDS = (1.5, 3.0)     # STRESS / ANOMALY z-score thresholds
+
+
+class RollingWindowStats:
+    """Shifted running sums per (window, asset) backed by one ring buffer per asset."""
+
+    def __init__(self, windows=(50,), capacity=16):
+        self.windows = tuple(sorted({int(w) for w in windows}))
+        if not self.windows or self.windows[0] < 1:
+            raise ValueError(f"Window lengths must be positive: {windows}")
+        self.depth = self.windows[-1]
+        self._w = np.array(self.windows, dtype=np.int64)[:, None]
+        self.rows = {}
+        self._allocate(max(int(capacity), 1))
+
+    def _allocate(self, capacity):
+        n_w = len(self.windows)
+        self.ring = np.zeros((capacity, self.depth))
+        self.head = np.zeros(capacity, dtype=np.int64)    # Next write slot
+        self.count = np.zeros(capacity, dtype=np.int64)   # Values held (<= depth)
+        self.stale = np.zeros(capacity, dtype=np.int64)   # Pushes since last exact refresh
+        self.shift = np.zeros(capacity)                   # Re-centering offset per asset
+        self.peak = np.zeros(capacity)                    # Max |x - shift| since refresh
+        self.s1 = np.zeros((n_w, capacity))
+        self.s2 = np.zeros((n_w, capacity))
+
+    def _grow(self):
+        old = (self.ring, self.head, self.count, self.stale, self.shift, self.peak, self.s1, self.s2)
+        used = len(self.rows)
+        self._allocate(2 * self.ring.shape[0])
+        self.ring[:used], self.head[:used], self.count[:used] = old[0][:used], old[1][:used], old[2][:used]
+        self.stale[:used], self.shift[:used], self.peak[:used] = old[3][:used], old[4][:used], old[5][:used]
+        self.s1[:, :used], self.s2[:, :used] = old[6][:, :used], old[7][:, :used]
+
+    def row(self, key):
+        """Returns the buffer row for a series, allocating one on first sight."""
+        r = self.rows.get(key)
+        if r is None:
+            if len(self.rows) == self.ring.shape[0]:
+                self._grow()
+            r = self.rows[key] = len(self.rows)
+        return r
+
+    def window(self, r, n):
+        """Last n values of a row in chronological order (matches the old deque layout)."""
+        idx = (self.head[r] - n + np.arange(n)) % self.depth
+        return self.ring[r, idx]
+
+    def moments(self, rows):
+        """(mean, var, n, err_var, err_mean) arrays shaped (n_windows, len(rows))."""
+        n = np.minimum(self.count[rows], self._w)
+        safe_n = np.maximum(n, 1)
+        m1 = self.s1[:, rows] / safe_n
+        var = self.s2[:, rows] / safe_n - m1 * m1
+        # Forward error bound of the running sums since the last exact refresh
+        ops = (self.stale[rows] + n) * EPS * 4.0
+        err_s1 = ops * self.peak[rows]
+        err_var = ops * self.peak[rows] ** 2 / safe_n + 2.0 * np.abs(m1) * err_s1 / safe_n
+        return self.shift[rows] + m1, var, n, err_var, err_s1 / safe_n
+
+    def push(self, rows, values):
+        """Appends one value per (unique) row, evicting the oldest sample of each full window."""
+        values = np.asarray(values, dtype=np.float64)
+        fresh = self.count[rows] == 0
+        self.shift[rows[fresh]] = values[fresh]
+        h, c, k = self.head[rows], self.count[rows], self.shift[rows]
+        x = values - k
+        for i, w in enumerate(self.windows):
+            old = np.where(c >= w, self.ring[rows, (h - w) % self.depth] - k, 0.0)
+            self.s1[i, rows] += x - old
+            self.s2[i, rows] += x * x - old * old
+        self.ring[rows, h] = values
+        self.head[rows] = (h + 1) % self.depth
+        self.count[rows] = np.minimum(c + 1, self.depth)
+        self.peak[rows] = np.maximum(self.peak[rows], np.abs(x))
+        self.stale[rows] += 1
+        for r in rows[self.stale[rows] >= self.depth]:
+            self._refresh(r)
+
+    def _refresh(self, r):
+        """Exact O(depth) re-summation, amortized to O(1) by running once per depth pushes."""
+        vals = self.window(r, self.count[r])
+        k = vals[-1]
+        for i, w in enumerate(self.windows):
+            tail = vals[-w:] - k
+            self.s1[i, r], self.s2[i, r] = tail.sum(), (tail * tail).sum()
+        self.shift[r] = k
+        self.peak[r] = np.abs(vals - k).max()
+        self.stale[r] = 0
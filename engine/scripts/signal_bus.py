@@ -0,0 +1,283 @@
+"""
+Kill-Switch Signal Bus v1.0
+Replaces polling results/live_risk_signal.txt. The current risk signal lives in one
+memory-mapped record (magic, sequence, timestamp, level, reason) guarded by a
+seqlock, so any process reads it in about a microsecond and never sees a torn write.
+Each subscriber also binds a Unix datagram socket. Publishers ping every socket after
+writing, so sleeping engine loops wake at once instead of finishing a 15-30 s sleep.
+Where AF_UNIX is unavailable, subscribers fall back to polling the record every
+millisecond.
+A publisher that dies mid-write leaves the sequence odd: readers stop spinning after
+STUCK_WRITE_S and keep the last good signal (with a warning), and the next publisher
+to take the lock repairs the sequence.
+Usage:
+    python signal_bus.py --publish CRITICAL --reason "manual halt"
+    python signal_bus.py --watch
+"""
+import argparse
+import asyncio
+import contextlib
+import glob
+import hashlib
+import mmap
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+DEFAULT_BUS = os.path.join(RESULTS_DIR, 'risk_signal.bus')
+
+LEVELS = ("NORMAL", "WARNING", "CRITICAL")
+MAGIC = b"SNTLBUS1"
+# magic | seq (odd while a write is in progress) | wall-clock ts | level | pad | reason
+RECORD = struct.Struct("<8sQdB7x64s")
+SEQ = struct.Struct("<Q")
+SEQ_AT = 8
+STUCK_WRITE_S = 0.05  # A write this long is a crashed publisher, not a slow one
+
+Signal = namedtuple("Signal", "seq ts level reason")
+Signal.halt = property(lambda s: s.level == "CRITICAL")
+
+
+def halt_started(signal, previous_level, own_seq=None):
+    """True on a transition into CRITICAL published by someone else; routine NORMAL/WARNING
+    quorum updates and a loop's own publishes are not worth an expedited poll."""
+    return signal.halt and previous_level != "CRITICAL" and signal.seq != own_seq
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishers are serialized in-process only
+    fcntl = None
+
+
+class SignalBus:
+    def __init__(self, path=DEFAULT_BUS):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if not os.path.exists(self.path):
+            self._create()
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), RECORD.size)
+        if self._map[:8] != MAGIC:
+            raise ValueError(f"{self.path} is not a signal bus record")
+        # Socket paths must stay short (sun_path is ~100 bytes): keep them in the temp dir
+        digest = hashlib.sha1(self.path.encode("utf-8")).hexdigest()[:10]
+        self.wake_dir = os.path.join(tempfile.gettempdir(), f"sentinel-bus-{digest}")
+        self._lock = threading.Lock()
+        self._last_good = None
+        self._stuck_seq = None
+        if fcntl:  # Only with the cross-process lock can an odd sequence be told from a live write
+            with self._locked():
+                self._repair()
+
+    def _create(self):
+        """Writes the initial record aside and links it in, so racing processes never map a partial file."""
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(RECORD.pack(MAGIC, 0, time.time(), 0, b""))
+        try:
+            os.link(tmp, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(tmp)
+
+    # --- Read side ---
+    def _decode(self, seq):
+        _, _, ts, level, reason = RECORD.unpack_from(self._map)
+        return Signal(seq // 2, ts, LEVELS[min(level, len(LEVELS) - 1)], reason.rstrip(b"\0").decode("utf-8", "replace"))
+
+    def read(self):
+        """Latest consistent record (retries while a writer is mid-update, for at most STUCK_WRITE_S)."""
+        deadline = None
+        while True:
+            seq1 = SEQ.unpack_from(self._map, SEQ_AT)[0]
+            if not seq1 & 1:
+                signal = self._decode(seq1)
+                if SEQ.unpack_from(self._map, SEQ_AT)[0] == seq1:
+                    self._last_good = signal
+                    return signal
+            if deadline is None:
+                deadline = time.monotonic() + STUCK_WRITE_S
+            elif time.monotonic() >= deadline:
+                return self._stuck(seq1)
+
+    def _stuck(self, seq):
+        """A writer never finished: serve the last good signal (or the record as it stands)."""
+        signal = self._last_good or self._decode(seq & ~1)
+        if self._stuck_seq != seq:
+            self._stuck_seq = seq
+            print(f"⚠️ Signal bus {self.path}: write #{seq} never completed; serving #{signal.seq} {signal.level}")
+        return signal
+
+    def subscribe(self, wake=True, poll_interval=0.001):
+        return Subscription(self, wake, poll_interval)
+
+    # --- Write side ---
+    def publish(self, level, reason=""):
+        if level not in LEVELS:
+            raise ValueError(f"unknown level {level!r}; expected one of {LEVELS}")
+        reason_bytes = reason.encode("utf-8")[:64]
+        with self._locked():
+            seq = self._repair()
+            SEQ.pack_into(self._map, SEQ_AT, seq + 1)
+            ts = time.time()
+            RECORD.pack_into(self._map, 0, MAGIC, seq + 1, ts, LEVELS.index(level), reason_bytes)
+            SEQ.pack_into(self._map, SEQ_AT, seq + 2)
+        self._notify()
+        return Signal(seq // 2 + 1, ts, level, reason)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _repair(self):
+        """Even sequence to write from; an odd one under the lock is a publisher that died mid-write."""
+        seq = SEQ.unpack_from(self._map, SEQ_AT)[0]
+        if seq & 1:
+            seq += 1
+            SEQ.pack_into(self._map, SEQ_AT, seq)
+            print(f"🩹 Signal bus {self.path}: repaired sequence left odd by a crashed publisher")
+        return seq
+
+    def _notify(self):
+        if not hasattr(socket, "AF_UNIX"):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)
+            for path in glob.glob(os.path.join(self.wake_dir, "*.sock")):
+                try:
+                    sender.sendto(b"\x01", path)
+                except BlockingIOError:
+                    pass  # Subscriber's buffer is full: a wake-up is already pending
+                except (ConnectionRefusedError, FileNotFoundError):
+                    try:
+                        os.unlink(path)  # Subscriber died without cleaning up
+                    except OSError:
+                        pass
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+class Subscription:
+    """Interruptible sleeps: sleep()/asleep() return the new Signal as soon as one is published."""
+
+    def __init__(self, bus, wake=True, poll_interval=0.001):
+        self.bus = bus
+        self.poll_interval = poll_interval
+        self.last_seq = bus.read().seq
+        self.sock = None
+        if wake and hasattr(socket, "AF_UNIX"):
+            os.makedirs(bus.wake_dir, exist_ok=True)
+            self.sock_path = os.path.join(bus.wake_dir, f"{os.getpid()}-{id(self):x}.sock")
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self.sock.bind(self.sock_path)
+            self.sock.setblocking(False)
+
+    def poll(self):
+        """The current Signal if it is newer than the last one seen, else None."""
+        signal = self.bus.read()
+        if signal.seq != self.last_seq:
+            self.last_seq = signal.seq
+            return signal
+        return None
+
+    def _drain(self):
+        try:
+            while True:
+                self.sock.recv(64)
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def sleep(self, seconds):
+        deadline = time.monotonic() + seconds
+        while True:
+            signal = self.poll()
+            if signal:
+                return signal
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if self.sock is None:
+                time.sleep(min(remaining, self.poll_interval))
+                continue
+            self.sock.settimeout(remaining)
+            try:
+                self.sock.recv(64)
+            except (socket.timeout, InterruptedError):
+                pass
+            finally:
+                self.sock.setblocking(False)
+            self._drain()
+
+    async def asleep(self, seconds):
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + seconds
+        while True:
+            signal = self.poll()
+            if signal:
+                return signal
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            woken = loop.create_future()
+            try:
+                if self.sock is None:
+                    raise NotImplementedError
+                loop.add_reader(self.sock.fileno(), lambda: woken.done() or woken.set_result(None))
+            except NotImplementedError:  # No socket, or a proactor loop (Windows)
+                await asyncio.sleep(min(remaining, self.poll_interval))
+                continue
+            try:
+                await asyncio.wait_for(woken, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                loop.remove_reader(self.sock.fileno())
+            self._drain()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            try:
+                os.unlink(self.sock_path)
+            except OSError:
+                pass
+            self.sock = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bus", default=DEFAULT_BUS)
+    parser.add_argument("--publish", choices=LEVELS)
+    parser.add_argument("--reason", default="manual")
+    parser.add_argument("--watch", action="store_true")
+    args = parser.parse_args()
+
+    bus = SignalBus(args.bus)
+    if args.publish:
+        print(bus.publish(args.publish, args.reason))
+    print(f"📟 {bus.read()}")
+    if args.watch:
+        sub = bus.subscribe()
+        try:
+            while True:
+                signal = sub.sleep(3600)
+                if signal:
+                    print(f"⚡ #{signal.seq} {signal.level} ({signal.reason}) +{(time.time() - signal.ts) * 1e6:.0f}µs")
+        finally:
+            sub.close()
@@ -0,0 +1,88 @@
+"""
+Source Guard v1.0
+Per-source circuit breakers (closed -> open -> half-open probe) and hedged
+requests, so one slow or failing upstream never stalls the whole heartbeat.
+"""
+import asyncio
+import time
+from metrics import incr
+
+CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """Trips after consecutive failures; after a cool-off a single probe decides whether to close."""
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0, max_reset_timeout=300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_reset_timeout = reset_timeout
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def allow(self):
+        """True if a request may go out now (closed, or the one half-open probe)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            print(f"✅ Circuit {self.name}: recovered, closing.")
+        self.state, self.failures, self.probe_in_flight = CLOSED, 0, False
+        self.reset_timeout = self.base_reset_timeout
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            # Failed probe: back off harder before the next one
+            self.reset_timeout = min(self.reset_timeout * 2, self.max_reset_timeout)
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                incr(f"breaker.{self.name}.opened")
+                print(f"⚡ Circuit {self.name}: OPEN for {self.reset_timeout:.0f}s after {self.failures} failures.")
+            self.state, self.opened_at = OPEN, time.monotonic()
+        self.probe_in_flight = False
+
+    async def call(self, coro):
+        """Awaits a request on behalf of this source, recording the outcome (timeouts included)."""
+        try:
+            result = await coro
+        except BaseException:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+async def hedged(factory, hedge_after=None):
+    """Runs factory(); if it is still pending after hedge_after seconds, races a duplicate."""
+    first = asyncio.create_task(factory())
+    tasks = {first}
+    try:
+        if hedge_after is None:
+            return await first
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            incr("hedge.fired")
+            tasks.add(asyncio.create_task(factory()))
+        error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.exception() is None:
+                    return t.result()
+                error = t.exception()
+        raise error
+    finally:
+        for t in tasks:
+            t.cancel()
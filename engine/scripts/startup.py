@@ -0,0 +1,137 @@
+"""
+Fast-Start Toolkit v1.0
+Keeps heavy dependencies (ccxt, yfinance, supabase, torch/transformers) and the
+FinBERT model off the critical path of an engine restart:
+  - lazy_module(): module proxy that imports on first attribute access
+  - preload(): imports modules on a background thread while the entry point keeps going
+  - Lazy: a thread-safe, build-once value that can be warmed in the background
+  - StartupProfile: per-phase startup timings, measured from process launch
+"""
+import importlib
+import os
+import threading
+import time
+import types
+from metrics import gauge
+
+
+def _process_age():
+    """Seconds since this process was launched (Linux /proc), so interpreter start-up is counted too."""
+    try:
+        with open("/proc/self/stat", 'r') as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", 'r') as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+LAUNCHED = time.perf_counter() - _process_age()
+
+
+# --- 1. DEFERRED IMPORTS ---
+class _LazyModule(types.ModuleType):
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        if self._module is None:
+            self.__dict__["_module"] = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_module(name):
+    """ccxt = lazy_module("ccxt.async_support"): nothing is imported until ccxt.<attr> is touched."""
+    return _LazyModule(name)
+
+
+def preload(*names):
+    """Imports modules on a daemon thread; a later import of the same module waits for it instead of redoing it."""
+    def load():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass  # The caller's own import raises the real error where it matters
+    thread = threading.Thread(target=load, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- 2. DEFERRED VALUES ---
+class Lazy:
+    """Builds a value once, on first get() or on a background warm-up thread, whichever comes first."""
+
+    def __init__(self, factory, name="value", profile=None):
+        self.factory = factory
+        self.name = name
+        self.profile = profile
+        self._value = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def get(self):
+        if self._ready.is_set():
+            return self._value
+        with self._lock:
+            if not self._ready.is_set():
+                t0 = time.perf_counter()
+                self._value = self.factory()
+                self._ready.set()
+                if self.profile is not None:
+                    self.profile.record(self.name, time.perf_counter() - t0)
+        return self._value
+
+    def warm(self):
+        """Starts building in the background; a failure is reported and retried by the next get()."""
+        def build():
+            try:
+                self.get()
+            except Exception as e:
+                print(f"⚠️ Background warm-up of {self.name} failed (retrying on first use): {e}")
+        threading.Thread(target=build, name=f"warm-{self.name}", daemon=True).start()
+        return self
+
+
+# --- 3. TIMING REPORT ---
+class StartupProfile:
+    """Sequential phases via mark(), background phases via record(); report() prints and exports both."""
+
+    def __init__(self, name, t0=LAUNCHED):
+        self.name = name
+        self.t0 = t0
+        self.last = t0
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def mark(self, phase):
+        """Closes the phase that started at the previous mark (or at launch)."""
+        now = time.perf_counter()
+        seconds, self.last = now - self.last, now
+        return self.record(phase, seconds)
+
+    def record(self, phase, seconds):
+        with self._lock:
+            self.phases.append((phase, seconds))
+        gauge(f"startup.{phase}_s", round(seconds, 3))
+        return seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.t0
+
+    def report(self):
+        total = self.elapsed()
+        gauge("startup.total_s", round(total, 3))
+        with self._lock:
+            phases = " · ".join(f"{p} {s:.2f}s" for p, s in self.phases)
+        print(f"⏱️  STARTUP {self.name} | {phases} | {total:.2f}s since launch")
+        return total
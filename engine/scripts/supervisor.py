@@ -0,0 +1,391 @@
+"""
+Sentinel Supervisor v1.0
+One entry point for the whole edge node, instead of three terminals:
+  - the price engine (MultiAssetPulse) and both governance desks share the main asyncio loop;
+    each desk is a GovernanceBook that also runs one desk per asset and prints its transitions
+  - FinBERT lives in a dedicated worker process, fed headline batches over a queue
+  - the RSS feeds are crawled once per cycle and serve both the news quorum and FinBERT,
+    which scores every new headline into per-asset, time-decayed sentiment; the divergence
+    desk reads the plain mean over each feed's top headlines, as it was calibrated on
+Results move over multiprocessing queues and the kill-switch bus, never through the vault,
+so the price loop never waits on inference and the desks see the real RegimeClassifier
+z-scores instead of np.random.uniform.
+Usage:
+    python supervisor.py
+    python supervisor.py --backend int8 --threads 2 --gov-asset XAU
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+from datetime import datetime
+import pyarrow as pa
+from multi_asset_fetcher import MultiAssetPulse
+from feed_crawler import FeedCrawler, published_epoch
+from forensic_store import ForensicStore
+from governance import GovernanceBook, news_quorum, price_market_state, ai_market_state
+from metrics import timer, incr, gauge, observe, start_exporter
+from signal_bus import SignalBus, halt_started
+from startup import StartupProfile, preload
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+RESEARCH_DIR = os.path.normpath(os.path.join(BASE_DIR, "..", "..", "ai_research", "RnD", "scripts", "research"))
+LOGS_DIR = os.path.normpath(os.path.join(BASE_DIR, "..", "..", "logs"))
+
+# Union of both sentinels' feeds; FinBERT only scores the AI sentinel's subset
+FEEDS = {
+    'Yahoo Finance': "https://finance.yahoo.com/news/rssindex",
+    'Reuters Macro': "https://ir.thomsonreuters.com/rss/news-releases.xml?items=15",
+    'Kitco Gold': "https://www.kitco.com/rss/news.xml",
+    'ZeroHedge': "http://feeds.feedburner.com/zerohedge/feed"
+}
+SENTIMENT_FEEDS = ('Yahoo Finance', 'Reuters Macro', 'Kitco Gold')
+DESK_PER_FEED = 3  # Top headlines per feed behind the divergence desk's score (sentiment_pipeline.DESK_PER_FEED)
+DESK = "DESK"      # Governance book row that reproduces the single-operator desk
+
+# Cadences of the standalone loops (seconds); prices follow the adaptive poll scheduler
+NEWS_INTERVAL = 15
+AI_INTERVAL = 30
+
+RESULT_POLL_S = 0.5            # Longest a results read holds its thread, so shutdown never waits on it
+MAX_BACKLOG = 2000             # Headlines held while the worker is busy or down; the oldest go first
+RESTART_BACKOFF = (1.0, 60.0)  # First and longest wait before respawning a dead FinBERT worker
+
+PRICE_AUDIT_SCHEMA = {
+    'timestamp': pa.string(),
+    'market_z': pa.float64(),
+    'market_state': pa.string(),
+    'news_risk': pa.string(),
+    'behavior_report': pa.string()
+}
+AI_AUDIT_SCHEMA = {
+    "timestamp": pa.string(),
+    "z_score": pa.float64(),
+    "sentiment": pa.float64(),
+    "state": pa.string(),
+    "governance": pa.string()
+}
+
+
+# --- 1. FINBERT WORKER PROCESS ---
+def finbert_worker(requests, results, backend="eager", threads=None):
+    """Loads FinBERT once, then ingests headline bursts:
+    (seq, headlines, times, current) -> (seq, by_asset, desk, n, seconds)."""
+    t0 = time.perf_counter()
+    sys.path.insert(0, RESEARCH_DIR)
+    from finbert_backends import load_backend, load_pretrained
+    from inference_cache import HeadlineCache
+    from sentiment_pipeline import SentimentPipeline
+
+    model_id = "ProsusAI/finbert"
+    tokenizer, model = load_pretrained(model_id, os.path.join(LOGS_DIR, "finbert_snapshot"))
+    finbert = load_backend(backend, tokenizer, model, threads=threads,
+                           export_path=os.path.join(LOGS_DIR, "finbert.onnx"))
+    cache = HeadlineCache(f"{model_id}:{backend}", capacity=4096,
+                          path=os.path.join(LOGS_DIR, "finbert_cache.sqlite"))
+    pipeline = SentimentPipeline(finbert.predict, cache=cache)
+    results.put(("ready", None, None, 0, time.perf_counter() - t0))
+
+    while True:
+        item = requests.get()
+        if item is None:
+            pipeline.close()
+            return
+        seq, headlines, times, current = item
+        t0 = time.perf_counter()
+        n = pipeline.ingest(headlines, times)
+        results.put((seq, pipeline.snapshot(), pipeline.crawl_mean(current), n, time.perf_counter() - t0))
+
+
+class SentimentChannel:
+    """
+    Main-process side of the worker: non-blocking submit, latest per-asset scores read back
+    on a thread. A worker that dies is logged and respawned with exponential backoff.
+    """
+
+    def __init__(self, backend="eager", threads=None, profile=None):
+        self.ctx = mp.get_context("spawn")  # Never fork a process that already runs an event loop
+        self.worker_args = (backend, threads)
+        self.requests = self.results = self.process = None
+        self.ready = False
+        self.score = 0.0
+        self.by_asset = {}
+        self.desk = {}        # Plain per-asset mean over the current crawl's top headlines
+        self.current = []
+        self.scored_at = None
+        self.backlog = ([], [])  # Headlines of bursts the busy worker could not take yet
+        self.seq = 0
+        self.restarts = 0
+        self.profile = profile
+        self._reader = None
+        self._closing = False
+
+    def _spawn(self):
+        self.requests = self.ctx.Queue(maxsize=1)
+        self.results = self.ctx.Queue()
+        self.process = self.ctx.Process(target=finbert_worker, name="finbert-worker",
+                                        args=(self.requests, self.results, *self.worker_args), daemon=True)
+        self.process.start()
+
+    def start(self):
+        self._spawn()
+        self._reader = asyncio.create_task(self._read())
+        return self
+
+    def submit(self, headlines, times, current=()):
+        """Hands new headlines to the worker; while a burst is in flight they wait for the next submit.
+        current: the crawl's top headlines per feed, scored for the desk (the latest crawl wins)."""
+        self.current = list(current) or self.current
+        self.backlog[0].extend(headlines)
+        self.backlog[1].extend(times)
+        excess = len(self.backlog[0]) - MAX_BACKLOG
+        if excess > 0:
+            del self.backlog[0][:excess], self.backlog[1][:excess]
+            incr("supervisor.sentiment_dropped", excess)
+        if not self.backlog[0] and not current:
+            return False
+        self.seq += 1
+        try:
+            self.requests.put_nowait((self.seq, *self.backlog, self.current))
+        except queue.Full:
+            incr("supervisor.sentiment_deferred")
+            return False
+        self.backlog = ([], [])
+        return True
+
+    def score_for(self, asset=None):
+        """Desk sentiment of `asset`: plain mean over the current crawl (all headlines when None or not covered)."""
+        agg = self.desk.get(asset) or self.desk.get("ALL")
+        return agg["sentiment"] if agg else self.score
+
+    def _get(self):
+        try:
+            return self.results.get(timeout=RESULT_POLL_S)
+        except queue.Empty:
+            return None
+
+    async def _read(self):
+        backoff = RESTART_BACKOFF[0]
+        while not self._closing:
+            item = await asyncio.to_thread(self._get)
+            if item is None:
+                if not self.process.is_alive() and not self._closing:
+                    await self._restart(backoff)
+                    backoff = min(backoff * 2, RESTART_BACKOFF[1])
+                continue
+            seq, by_asset, desk, n, seconds = item
+            if seq == "ready":
+                self.ready = True
+                backoff = RESTART_BACKOFF[0]
+                if self.profile is not None:
+                    self.profile.record("model", seconds)
+                    self.profile = None
+                print(f"🧠 FinBERT worker ready ({seconds:.1f}s load, in the background).")
+                continue
+            self.by_asset, self.desk, self.scored_at = by_asset, desk, time.time()
+            self.score = desk.get("ALL", {}).get("sentiment", 0.0)
+            observe("supervisor.sentiment", seconds)
+            incr("supervisor.headlines_scored", n)
+
+    async def _restart(self, delay):
+        self.ready = False
+        self.restarts += 1
+        incr("supervisor.finbert_restarts")
+        print(f"💀 FinBERT worker died (exit code {self.process.exitcode}); restarting in {delay:.0f}s.")
+        try:  # A burst it never picked up goes back in front of the backlog
+            _, headlines, times, _ = self.requests.get_nowait()
+            self.backlog = (headlines + self.backlog[0], times + self.backlog[1])
+        except queue.Empty:
+            pass
+        await asyncio.sleep(delay)
+        if not self._closing:
+            self._spawn()
+
+    async def close(self):
+        self._closing = True
+        if self._reader is not None:
+            self._reader.cancel()
+        if self.process is None:
+            return
+        try:
+            self.requests.put(None, timeout=1.0)
+        except queue.Full:
+            pass
+        await asyncio.to_thread(self.process.join, 5.0)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+# --- 2. SUPERVISOR ---
+class Supervisor:
+    def __init__(self, pulse, sentiment, crawler=None, gov_asset=None, bus=None):
+        self.pulse = pulse
+        self.sentiment = sentiment
+        self.crawler = crawler or FeedCrawler(FEEDS, timeout=8.0)
+        self.gov_asset = gov_asset
+        self.bus = bus or SignalBus()
+        # One book row per desk: DESK reads the pinned (or worst) asset as the single desk did,
+        # and every asset also gets its own desk on its own z-score and sentiment
+        self.assets = list(pulse.registry.assets)
+        self.news_gov = GovernanceBook([DESK, *self.assets], rule="news")
+        self.ai_gov = GovernanceBook([DESK, *self.assets], rule="divergence")
+        self.z = {}
+        self.news_risk = "NORMAL"
+        self.published_seq = None  # Bus sequence of our own last news-quorum publish
+        self.price_audit = ForensicStore(os.path.join(RESULTS_DIR, 'integrated_audit'), PRICE_AUDIT_SCHEMA,
+                                         flush_rows=20)
+        self.ai_audit = ForensicStore(os.path.join(LOGS_DIR, 'integrated_audit'), AI_AUDIT_SCHEMA, flush_rows=10)
+
+    def market_z(self):
+        """|z| of the governance asset, or the worst asset when none is pinned."""
+        if self.gov_asset is not None:
+            return abs(self.z.get(self.gov_asset, 0.0))
+        return max((abs(z) for z in self.z.values()), default=0.0)
+
+    def desk_z(self):
+        """|z| per book row: DESK first, then each asset."""
+        return [self.market_z(), *(abs(self.z.get(a, 0.0)) for a in self.assets)]
+
+    @staticmethod
+    def govern(book, label, market_states, signal):
+        """One event for every desk; prints the per-asset transitions and returns DESK's report."""
+        for principal, state in book.evaluate(market_states, signal):
+            if principal != DESK:
+                print(f"🧭 {label} desk {principal}: {state}")
+        return book.report(DESK)
+
+    async def price_loop(self, startup=None):
+        signals = self.bus.subscribe()
+        level = self.bus.read().level
+        try:
+            while True:
+                rows = await self.pulse.poll()
+                for row in rows:
+                    self.z[row['asset']] = row['z_score']
+                if rows and startup is not None:
+                    startup.mark("first_tick")
+                    startup.report()
+                    startup = None
+                signal = await signals.asleep(self.pulse.scheduler.wait())
+                if signal:
+                    print(f"⚡ KILL-SWITCH SIGNAL #{signal.seq}: {signal.level} ({signal.reason})")
+                    # Our own news quorum already runs beside this loop; only an outside
+                    # halt is worth pulling the next price poll forward
+                    if halt_started(signal, level, self.published_seq):
+                        self.pulse.scheduler.expedite()
+                    level = signal.level
+        finally:
+            signals.close()
+
+    async def news_loop(self):
+        """One crawl feeds the quorum, the kill-switch bus, FinBERT and the price desk."""
+        signals = self.bus.subscribe()
+        seed = True
+        try:
+            while True:
+                with timer("supervisor.news"):
+                    feeds = await self.crawler.crawl()
+                self.news_risk = news_quorum({name: feed.titles for name, feed in feeds.items()})
+                if self.news_risk != self.bus.read().level:
+                    self.published_seq = self.bus.publish(self.news_risk, "news quorum").seq
+                    signals.poll()
+
+                # Every headline not seen before (all current ones on the first crawl) goes to FinBERT,
+                # along with the top headlines per feed the desk scores
+                now = time.time()
+                entries = [e for name in SENTIMENT_FEEDS if name in feeds
+                           for e in (feeds[name].latest if seed else feeds[name].new)]
+                self.sentiment.submit([e['title'] for e in entries],
+                                      [published_epoch(e.get('published'), now) for e in entries],
+                                      [t for name in SENTIMENT_FEEDS if name in feeds
+                                       for t in feeds[name].titles[:DESK_PER_FEED]])
+                seed = False
+
+                zs = self.desk_z()
+                states = [price_market_state(z) for z in zs]
+                z, market_state = zs[0], states[0]
+                report = self.govern(self.news_gov, "News", states, self.news_risk)
+                timestamp = datetime.now().strftime("%H:%M:%S")
+                print(f"[{timestamp}] Market: {market_state} ({z:.2f}) | News: {self.news_risk}")
+                print(f"👉 {report}")
+                self.price_audit.append({'timestamp': timestamp, 'market_z': round(z, 2),
+                                         'market_state': market_state, 'news_risk': self.news_risk,
+                                         'behavior_report': report})
+                await signals.asleep(NEWS_INTERVAL)
+        finally:
+            signals.close()
+
+    async def ai_loop(self):
+        signals = self.bus.subscribe()
+        try:
+            while True:
+                if self.sentiment.scored_at is not None:
+                    await self.evaluate_divergence()
+                await signals.asleep(AI_INTERVAL)
+        finally:
+            signals.close()
+
+    async def evaluate_divergence(self):
+        zs = self.desk_z()
+        states = [ai_market_state(z) for z in zs]
+        scores = [self.sentiment.score_for(a) for a in (self.gov_asset, *self.assets)]
+        z, market_state, score = zs[0], states[0], scores[0]
+        report = self.govern(self.ai_gov, "Divergence", states, scores)
+        ts = datetime.now().strftime("%H:%M:%S")
+        print(f"[{ts}] Market: {market_state} ({z:.2f}) | Sentiment: {score}")
+        print(f"🧠 {report}")
+        gauge("supervisor.sentiment_age_s", round(time.time() - self.sentiment.scored_at, 1))
+
+        row = {"timestamp": ts, "z_score": float(z), "sentiment": float(score),
+               "state": market_state, "governance": report}
+        asset_rows = [{"timestamp": ts, "asset": asset, **agg} for asset, agg in self.sentiment.by_asset.items()]
+        self.ai_audit.append(row)
+        try:
+            with timer("cloud_insert"):
+                await self.pulse.supabase.table("sentinel_logs").insert(row).execute()
+        except Exception as e:
+            incr("cloud_insert.errors")
+            print(f"⚠️ Persistence Error: {e}")
+        if asset_rows:
+            try:  # Separate push: a vault without sentiment_by_asset (engine/sql/003) keeps sentinel_logs
+                with timer("cloud_insert"):
+                    await self.pulse.supabase.table("sentiment_by_asset").insert(asset_rows).execute()
+            except Exception as e:
+                incr("cloud_insert.asset_errors")
+                print(f"⚠️ Asset Sentiment Persistence Error: {e}")
+
+    async def run(self, startup=None):
+        print("\n🛰️  SENTINEL SUPERVISOR: PRICE + FINBERT + GOVERNANCE\n" + "═" * 60)
+        start_exporter("supervisor")
+        self.pulse.sink.start()
+        try:
+            await asyncio.gather(self.price_loop(startup), self.news_loop(), self.ai_loop())
+        finally:
+            await self.sentiment.close()
+            await self.pulse.close()
+            self.price_audit.flush()
+            self.ai_audit.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default=os.getenv("FINBERT_BACKEND", "eager"), help="eager | int8 | onnx")
+    parser.add_argument("--threads", type=int, default=int(os.getenv("FINBERT_THREADS", "0")) or None)
+    parser.add_argument("--gov-asset", default=None, help="Asset whose |z| drives the desks (default: max over assets)")
+    args = parser.parse_args()
+    profile = StartupProfile("supervisor")
+    profile.mark("imports")
+    preload("ccxt.async_support", "yfinance", "supabase")
+
+    async def main():
+        # The worker starts first: FinBERT warms up while the price engine connects and ticks
+        sentiment = SentimentChannel(args.backend, args.threads, profile).start()
+        pulse = await MultiAssetPulse.create()
+        profile.mark("vault")
+        await Supervisor(pulse, sentiment, gov_asset=args.gov_asset).run(startup=profile)
+
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Symbol Registry v1.0
+Declarative asset universe (engine/config/symbols.json, or $SENTINEL_SYMBOLS): which
+source carries each asset, its upstream symbol, calibration factor, trading calendar
+and regime z-score bands. Groups expand one template over many bases, e.g.
+    {"source": "Binance", "asset": "{base}", "symbol": "{base}/USDT", "bases": ["ETH", "SOL"]}
+Calibration factors live in one array, so a whole tick is calibrated in a single multiply.
+"""
+import json
+import os
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.getenv("SENTINEL_SYMBOLS", os.path.join(BASE_DIR, '..', 'config', 'symbols.json'))
+SOURCE_KINDS = ("ccxt", "yahoo")
+THREAD_BOUND_KINDS = ("yahoo",)  # Blocking client in a worker thread: a hedge cannot cancel the first call
+
+
+class SymbolRegistry:
+    def __init__(self, spec):
+        self.sources = dict(spec["sources"])
+        for name, source in self.sources.items():
+            if source.get("kind") not in SOURCE_KINDS:
+                raise ValueError(f"Source '{name}' has unknown kind {source.get('kind')!r} (expected {SOURCE_KINDS})")
+            if source["kind"] in THREAD_BOUND_KINDS and source.get("hedge_after") is not None:
+                raise ValueError(f"Source '{name}' ({source['kind']}) runs in a thread and cannot be hedged")
+        defaults = {"calibration": 1.0, "bands": [1.5, 3.0], "calendar": "CRYPTO", **spec.get("defaults", {})}
+
+        entries = list(spec.get("assets", []))
+        for group in spec.get("groups", []):
+            template = {k: v for k, v in group.items() if k != "bases"}
+            for base in group["bases"]:
+                entries.append({k: v.format(base=base) if isinstance(v, str) else v for k, v in template.items()})
+
+        self.assets = []
+        self.index = {}
+        self.symbol = {}
+        self.source_of = {}
+        self.by_source = {}
+        self.calendar = {}
+        self.bands = {}
+        factors = []
+        for e in entries:
+            asset, source = e["asset"], e["source"]
+            if asset in self.index:
+                raise ValueError(f"Asset '{asset}' is declared twice")
+            if source not in self.sources:
+                raise ValueError(f"Asset '{asset}' uses undeclared source '{source}'")
+            self.index[asset] = len(self.assets)
+            self.assets.append(asset)
+            self.symbol[asset] = e.get("symbol", asset)
+            self.source_of[asset] = source
+            self.by_source.setdefault(source, []).append(asset)
+            self.calendar[asset] = e.get("calendar", defaults["calendar"])
+            stress, anomaly = e.get("bands", defaults["bands"])
+            self.bands[asset] = (float(stress), float(anomaly))
+            factors.append(float(e.get("calibration", defaults["calibration"])))
+        # Trailing 1.0 serves unknown assets (index -1): they pass through uncalibrated
+        self.factors = np.array(factors + [1.0])
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.assets)
+
+    def hedge_after(self, source):
+        return self.sources[source].get("hedge_after")
+
+    def quote_intervals(self):
+        """{source: seconds} between distinct quotes, for sources that declare one (Yahoo serves 1-minute bars)."""
+        return {name: float(s["quote_interval"]) for name, s in self.sources.items() if s.get("quote_interval")}
+
+    def calibrate(self, asset, price):
+        return float(price * self.factors[self.index.get(asset, -1)])
+
+    def calibrate_many(self, assets, prices):
+        """Calibrated prices for a whole tick in one vectorized multiply."""
+        idx = np.fromiter((self.index.get(a, -1) for a in assets), dtype=np.int64, count=len(assets))
+        return np.asarray(prices, dtype=np.float64) * self.factors[idx]
@@ -0,0 +1,155 @@
+"""
+Write-Behind Telemetry Sink v1.0
+Bounded asyncio queue -> multi-row vault inserts, with retry + jitter and an
+append-only local spool that replays automatically once the vault is reachable.
+Rows carry every column in engine/sql/001_telemetry_systemic_columns.sql; apply it
+to the live vault before deploying (LocalVault adds missing columns on its own).
+"""
+import asyncio
+import json
+import os
+import random
+import time
+from metrics import timer, incr, gauge
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.getenv("SENTINEL_RESULTS_DIR", os.path.join(BASE_DIR, "..", "results"))
+DEFAULT_SPOOL = os.path.join(RESULTS_DIR, 'telemetry_spool.jsonl')
+
+
+class WriteBehindSink:
+    """Decouples the tick loop from vault round-trips; the loop only pays for a queue put."""
+
+    def __init__(self, supabase_client, table="multi_asset_telemetry", max_batch=200, max_age=1.0,
+                 max_queue=10000, retries=3, backoff=0.5, backoff_cap=5.0, probe_interval=15.0,
+                 spool_path=DEFAULT_SPOOL):
+        self.supabase = supabase_client
+        self.table = table
+        self.max_batch = max_batch
+        self.max_age = max_age
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_cap = backoff_cap
+        self.probe_interval = probe_interval
+        self.spool_path = spool_path
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.stats = {"enqueued": 0, "flushed": 0, "batches": 0, "retries": 0, "spooled": 0, "replayed": 0}
+        self._task = None
+        self._last_probe = 0.0
+
+    # --- Producer side ---
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flusher())
+        return self
+
+    async def put(self, row):
+        """Blocks only when the queue is full (backpressure on the tick loop)."""
+        await self.queue.put(row)
+        self.stats["enqueued"] += 1
+
+    async def close(self):
+        """Drains everything already queued, then stops the flusher."""
+        if self._task is None:
+            return
+        await self.queue.put(None)
+        await self._task
+        self._task = None
+
+    # --- Flusher side ---
+    async def _flusher(self):
+        while True:
+            batch, closing = await self._collect()
+            if batch:
+                await self._flush(batch)
+            elif self._spool_pending() and time.monotonic() - self._last_probe >= self.probe_interval:
+                await self._replay()
+            if closing:
+                return
+
+    async def _collect(self):
+        """Gathers rows until the batch is full or the oldest row reaches max_age."""
+        try:
+            first = await asyncio.wait_for(self.queue.get(), timeout=self.probe_interval)
+        except asyncio.TimeoutError:
+            return [], False
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_age
+        while len(batch) < self.max_batch:
+            try:
+                row = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self.queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if row is None:
+                return batch, True
+            batch.append(row)
+        return batch, False
+
+    async def _send(self, rows):
+        """Multi-row insert with exponential backoff and full jitter; False once retries are spent."""
+        for attempt in range(self.retries + 1):
+            try:
+                with timer("persist.insert"):
+                    await self.supabase.table(self.table).insert(rows).execute()
+                return True
+            except Exception as e:
+                incr("persist.errors")
+                if attempt == self.retries:
+                    print(f"❌ Cloud Sync Error ({len(rows)} rows spooled): {e}")
+                    return False
+                self.stats["retries"] += 1
+                incr("persist.retries")
+                await asyncio.sleep(random.uniform(0, min(self.backoff_cap, self.backoff * 2 ** attempt)))
+
+    async def _flush(self, batch):
+        gauge("sink.queue_depth", self.queue.qsize())
+        if await self._send(batch):
+            incr("persist.rows", len(batch))
+            self.stats["flushed"] += len(batch)
+            self.stats["batches"] += 1
+            if self._spool_pending():
+                await self._replay()
+        else:
+            self._spool(batch)
+
+    # --- Local journal ---
+    def _spool_pending(self):
+        return os.path.exists(self.spool_path) and os.path.getsize(self.spool_path) > 0
+
+    def _spool(self, rows):
+        os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+        with open(self.spool_path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(r, default=str) + "\n" for r in rows)
+            f.flush()
+            os.fsync(f.fileno())
+        self.stats["spooled"] += len(rows)
+        incr("persist.spooled", len(rows))
+
+    async def _replay(self):
+        """Re-sends the journal oldest-first; whatever is left after a failure is kept on disk."""
+        self._last_probe = time.monotonic()
+        with open(self.spool_path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        sent = 0
+        while sent < len(rows):
+            chunk = rows[sent:sent + self.max_batch]
+            try:
+                await self.supabase.table(self.table).insert(chunk).execute()
+            except Exception:
+                break
+            sent += len(chunk)
+        self.stats["replayed"] += sent
+        tmp_path = self.spool_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(r, default=str) + "\n" for r in rows[sent:])
+        os.replace(tmp_path, self.spool_path)
+        if sent:
+            print(f"♻️ Spool Replay: {sent} rows restored to Cloud Vault ({len(rows) - sent} pending).")
@@ -0,0 +1,132 @@
+"""
+Bulk Yahoo Quote Layer v1.0
+One batched download per tick for every Yahoo symbol, with a TTL cache for
+closed-market fallback prices. Backends are pluggable so benchmarks can run
+against recorded responses instead of the network. yfinance keeps module-level
+state and is not thread-safe, so backend calls are serialized, including a call
+whose tick was cancelled but whose thread is still running.
+"""
+import asyncio
+import json
+import threading
+import time
+from metrics import timer, incr
+
+LIVE_WINDOW = ("1d", "1m")      # Intraday bars: the live price for open markets
+FALLBACK_WINDOW = ("5d", "1d")  # Last settlement: closed markets / weekends
+
+
+class YFinanceBackend:
+    """Live backend: one batched yf.download per window, every call on one shared session."""
+
+    def __init__(self, session=None):
+        self._yf = None
+        self.session = session
+        self.calls = 0
+
+    @property
+    def yf(self):
+        """yfinance (and pandas) load on the first download, which already runs off the event loop."""
+        if self._yf is None:
+            import yfinance as yf
+            self._yf = yf
+        return self._yf
+
+    def last_closes(self, symbols, period, interval):
+        """{symbol: last non-empty close or None} from a single upstream request."""
+        self.calls += 1
+        df = self.yf.download(list(symbols), period=period, interval=interval, progress=False,
+                              threads=False, auto_adjust=False, session=self.session)
+        if df is None or df.empty:
+            return {s: None for s in symbols}
+        close = df["Close"]
+        if close.ndim == 1:
+            close = close.to_frame(symbols[0])
+        out = {}
+        for s in symbols:
+            series = close[s].dropna() if s in close.columns else ()
+            out[s] = float(series.iloc[-1]) if len(series) else None
+        return out
+
+
+class RecordedYahooBackend:
+    """Replays captured last_closes() responses keyed by period/interval."""
+
+    def __init__(self, responses, latency=0.0):
+        self.responses = responses
+        self.latency = latency
+        self.calls = 0
+
+    @classmethod
+    def from_json(cls, path, latency=0.0):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), latency)
+
+    def last_closes(self, symbols, period, interval):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.responses.get(f"{period}/{interval}", {})
+        return {s: recorded.get(s) for s in symbols}
+
+
+class YahooQuoteBook:
+    """Per-tick quote resolution: live batch first, then cached or batched fallback for the gaps."""
+
+    def __init__(self, backend=None, fallback_ttl=900.0):
+        self.backend = backend or YFinanceBackend()
+        self.fallback_ttl = fallback_ttl
+        self.fallback = {}  # symbol -> (price, fetched_at)
+        self.calls_last_tick = 0
+        self._backend_lock = threading.Lock()  # One upstream call at a time, across threads
+        self._lock = None                      # One fetch at a time (fallback cache, call count)
+
+    async def fetch(self, symbols):
+        """Returns {symbol: price or None}; at most two upstream calls regardless of universe size."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            return await self._fetch(list(dict.fromkeys(symbols)))
+
+    def _last_closes(self, symbols, window):
+        with self._backend_lock:
+            return self.backend.last_closes(symbols, *window)
+
+    async def _fetch(self, symbols):
+        calls_before = self.backend.calls
+        prices = await self._batch(symbols, LIVE_WINDOW)
+
+        now = time.monotonic()
+        missing = []
+        for s in symbols:
+            if prices.get(s):
+                self.fallback.pop(s, None)
+                continue
+            cached = self.fallback.get(s)
+            if cached and now - cached[1] < self.fallback_ttl:
+                prices[s] = cached[0]
+                incr("yahoo.fallback.cached")
+            else:
+                missing.append(s)
+
+        if missing:
+            settled = await self._batch(missing, FALLBACK_WINDOW)
+            for s in missing:
+                if settled.get(s):
+                    prices[s] = settled[s]
+                    self.fallback[s] = (settled[s], now)
+                    incr("yahoo.fallback.fetched")
+                else:
+                    incr("yahoo.unresolved")
+
+        self.calls_last_tick = self.backend.calls - calls_before
+        return {s: prices.get(s) or None for s in symbols}
+
+    async def _batch(self, symbols, window):
+        stage = "yahoo.live" if window == LIVE_WINDOW else "yahoo.fallback"
+        try:
+            with timer(stage):
+                return await asyncio.to_thread(self._last_closes, symbols, window)
+        except Exception:
+            incr(f"{stage}.errors")
+            return {}
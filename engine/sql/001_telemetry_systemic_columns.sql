@@ -0,0 +1,11 @@
+-- multi_asset_telemetry columns added by the concurrent source fetch (stale) and the
+-- cross-asset monitor (systemic_stress, avg_corr, dispersion).
+-- Run once in the Supabase SQL editor before deploying the engine; idempotent.
+ALTER TABLE public.multi_asset_telemetry
+    ADD COLUMN IF NOT EXISTS stale boolean NOT NULL DEFAULT false,
+    ADD COLUMN IF NOT EXISTS systemic_stress double precision,
+    ADD COLUMN IF NOT EXISTS avg_corr double precision,
+    ADD COLUMN IF NOT EXISTS dispersion double precision;
+
+-- PostgREST caches the schema: make the new columns insertable right away
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,30 @@
+-- Bar tables written by the retention job (engine/scripts/retention.py) and read by the
+-- dashboard's long chart ranges: raw ticks older than RAW_DAYS become 5-minute bars,
+-- 5-minute bars older than BAR_DAYS become 1-hour bars.
+-- Run once in the Supabase SQL editor before scheduling retention; idempotent.
+CREATE TABLE IF NOT EXISTS public.telemetry_bars_5m (
+    id           bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    asset        text NOT NULL,
+    bucket       timestamptz NOT NULL,
+    resolution   text NOT NULL,
+    open         double precision,
+    high         double precision,
+    low          double precision,
+    close        double precision,
+    ticks        integer NOT NULL DEFAULT 0,
+    stale_ticks  integer NOT NULL DEFAULT 0,
+    stable       integer NOT NULL DEFAULT 0,
+    stress       integer NOT NULL DEFAULT 0,
+    anomaly      integer NOT NULL DEFAULT 0,
+    initializing integer NOT NULL DEFAULT 0,
+    max_abs_z    double precision
+);
+CREATE TABLE IF NOT EXISTS public.telemetry_bars_1h (LIKE public.telemetry_bars_5m INCLUDING ALL);
+
+-- Retention windows and purges filter on bucket; chart reads on (asset, bucket)
+CREATE INDEX IF NOT EXISTS telemetry_bars_5m_bucket ON public.telemetry_bars_5m (bucket);
+CREATE INDEX IF NOT EXISTS telemetry_bars_5m_asset_bucket ON public.telemetry_bars_5m (asset, bucket);
+CREATE INDEX IF NOT EXISTS telemetry_bars_1h_bucket ON public.telemetry_bars_1h (bucket);
+CREATE INDEX IF NOT EXISTS telemetry_bars_1h_asset_bucket ON public.telemetry_bars_1h (asset, bucket);
+
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,18 @@
+-- Per-asset FinBERT sentiment written each cycle by the AI sentinel and the supervisor
+-- (one row per asset with coverage: time-decayed mean, decayed weight, headlines seen)
+-- and read by the dashboard's telemetry poller on an id cursor.
+-- Run once in the Supabase SQL editor before deploying the sentiment pipeline; idempotent.
+CREATE TABLE IF NOT EXISTS public.sentiment_by_asset (
+    id         bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    timestamp  text NOT NULL,
+    asset      text NOT NULL,
+    sentiment  double precision NOT NULL,
+    weight     double precision,
+    headlines  integer NOT NULL DEFAULT 0
+);
+
+-- The poller reads newest-first on a cold start, then by id; per-asset history on (asset, id)
+CREATE INDEX IF NOT EXISTS sentiment_by_asset_asset_id ON public.sentiment_by_asset (asset, id);
+
+NOTIFY pgrst, 'reload schema';
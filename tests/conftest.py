@@ -0,0 +1,15 @@
+"""
+Puts the flat script directories on sys.path (the scripts import each other by module
+name) and keeps metrics and runtime files out of the tree.
+"""
+import os
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for part in (("engine", "scripts"), ("ai_research", "RnD", "scripts", "research"),
+             ("dashboard", "RnD", "scripts", "research")):
+    sys.path.insert(0, os.path.join(REPO_DIR, *part))
+
+os.environ.setdefault("SENTINEL_METRICS", "0")
+os.environ.setdefault("SENTINEL_RESULTS_DIR", tempfile.mkdtemp(prefix="sentinel-tests-"))
@@ -0,0 +1,76 @@
+import math
+import random
+from cross_asset import CrossAssetMonitor, SAMPLE_INTERVAL
+from poll_scheduler import PollScheduler, RequestBudget
+from symbol_registry import SymbolRegistry
+
+T0 = 1_750_000_020  # Saturday: only the 24/7 calendar matters below
+
+
+def comoving_path(seconds, seed=3):
+    """One log-price path sampled every 5 s; both assets follow it exactly."""
+    rng, x, path = random.Random(seed), 0.0, {}
+    for t in range(0, seconds, 5):
+        x += rng.gauss(0, 0.002)
+        path[t] = math.exp(x)
+    return path
+
+
+def test_staggered_cadences_still_read_fully_correlated():
+    monitor = CrossAssetMonitor(sample_interval=30.0)
+    path = comoving_path(4 * 3600)
+    metrics = None
+    for t, level in path.items():
+        # BTC polled every 5 s, XAU every 10 s: most ticks only carry BTC
+        rows = [{"asset": "BTC", "price": 60000 * level, "stale": False}]
+        if t % 10 == 0:
+            rows.append({"asset": "XAU", "price": 2000 * level, "stale": False})
+        metrics = monitor.annotate(rows, now=T0 + t)
+    assert metrics["avg_corr"] > 0.99
+    assert metrics["systemic_stress"] > 0.99
+
+
+def test_quotes_past_max_age_sit_the_snapshot_out():
+    monitor = CrossAssetMonitor(sample_interval=30.0, max_age=120.0)
+    monitor.annotate([{"asset": "XAU", "price": 2000.0}, {"asset": "BTC", "price": 60000.0}], now=T0)
+    monitor.annotate([{"asset": "BTC", "price": 60100.0}], now=T0 + 300)
+    assert set(monitor.sample(T0 + 300)) == {"BTC"}
+    assert math.isnan(monitor.last[monitor.slots["XAU"]])
+
+
+def test_sample_interval_covers_the_slowest_quote_refresh():
+    registry = SymbolRegistry.load()
+    sample_interval = max([SAMPLE_INTERVAL, *registry.quote_intervals().values()])
+    assert sample_interval == 60.0
+    path = comoving_path(4 * 3600)
+    readings = {}
+    for interval in (SAMPLE_INTERVAL, sample_interval):
+        monitor = CrossAssetMonitor(sample_interval=interval)
+        for t in range(0, 4 * 3600, 30):
+            # Both polled every 30 s; Yahoo's XAU quote only moves on 1-minute bars
+            rows = [{"asset": "BTC", "price": 60000 * path[t], "stale": False},
+                    {"asset": "XAU", "price": 2000 * path[t - t % 60], "stale": False}]
+            readings[interval] = monitor.annotate(rows, now=T0 + t)
+    assert readings[SAMPLE_INTERVAL]["avg_corr"] < 0.8  # Every other XAU return is a repeat
+    assert readings[sample_interval]["avg_corr"] > 0.99
+    assert readings[sample_interval]["systemic_stress"] > 0.99
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_anomaly_polls_yahoo_faster_than_the_fixed_heartbeat():
+    clock = Clock(T0)
+    scheduler = PollScheduler({"XAU": "yfinance", "BTC": "Binance"}, {"XAU": "CRYPTO", "BTC": "CRYPTO"},
+                              budget=RequestBudget(per_minute=600, burst=50, clock=clock), clock=clock)
+    assert scheduler.due() == {"yfinance": ["XAU"], "Binance": ["BTC"]}
+    scheduler.observe([{"asset": "XAU", "price": 2000.0, "regime": "ANOMALY"},
+                       {"asset": "BTC", "price": 60000.0, "regime": "ANOMALY"}])
+    assert scheduler.assets["XAU"].interval == 5.0 < 30.0
+    clock.now += 5
+    assert scheduler.due() == {"yfinance": ["XAU"], "Binance": ["BTC"]}
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from aiohttp import web
+from bench_feed_crawler import FeedServer
+from feed_crawler import FeedCrawler
+
+
+class FlakyServer(FeedServer):
+    """FeedServer whose feeds can be switched to answer 500."""
+
+    def __init__(self, n_feeds):
+        super().__init__(n_feeds, hung=0)
+        self.down = False
+
+    async def handle(self, request):
+        if self.down:
+            return web.Response(status=500)
+        return await super().handle(request)
+
+
+def test_failed_feed_serves_no_stale_headlines(tmp_path):
+    async def run():
+        server = await FlakyServer(2).start()
+        feeds = {f"feed-{i}": f"http://127.0.0.1:{server.port}/feed/{i}" for i in range(2)}
+        crawler = FeedCrawler(feeds, timeout=2.0, index_path=str(tmp_path / "index.sqlite"))
+        try:
+            fresh = await crawler.crawl()
+            unchanged = await crawler.crawl()
+            server.down = True
+            failed = await crawler.crawl()
+        finally:
+            await server.runner.cleanup()
+        return fresh, unchanged, failed
+
+    fresh, unchanged, failed = asyncio.run(run())
+    assert all(r.status == 200 and r.titles for r in fresh.values())
+    # A 304 still serves the remembered entries...
+    assert all(r.status == 304 and r.titles == fresh[n].titles for n, r in unchanged.items())
+    # ...an error does not
+    assert all(r.status == 500 and r.titles == [] and r.new == [] for r in failed.values())
+
+
+def test_seen_index_is_pruned_by_age(tmp_path):
+    crawler = FeedCrawler({}, index_path=str(tmp_path / "index.sqlite"), seen_days=7)
+    now = time.time()
+    crawler.db.executemany("INSERT INTO seen (key, first_seen) VALUES (?, ?)",
+                           [("old", now - 8 * 86400), ("recent", now - 86400)])
+    assert crawler.prune_seen(now) == 1
+    assert [k for (k,) in crawler.db.execute("SELECT key FROM seen")] == ["recent"]
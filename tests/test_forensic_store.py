@@ -0,0 +1,63 @@
+import os
+import pyarrow as pa
+import forensic_store
+from forensic_store import ForensicStore, SUPERSEDED
+
+DAY0 = 1_750_000_000  # 2025-06-15 UTC
+
+
+def make_store(root):
+    return ForensicStore(str(root), {"price": pa.float64()}, flush_rows=10_000)
+
+
+def test_compaction_defers_parts_a_reader_still_maps(tmp_path, monkeypatch):
+    store = make_store(tmp_path)
+    for i in range(3):  # Three parts on day 0
+        store.append({"price": float(i)}, ts=DAY0 + i)
+        store.flush()
+    held = store.read()  # Maps every part, like a dashboard holding a result
+    part_dir = os.path.join(str(tmp_path), "date=2025-06-15")
+
+    real_remove = os.remove
+    def mapped_remove(path):  # What Windows does while a view of the file is open
+        if os.path.basename(path).startswith("part-"):
+            raise PermissionError(13, "file is mapped", path)
+        real_remove(path)
+    monkeypatch.setattr(forensic_store.os, "remove", mapped_remove)
+
+    store.append({"price": 9.0}, ts=DAY0 + 86400)
+    store.flush()  # New day: compacts day 0
+    assert len(store._superseded(part_dir)) == 3
+    assert store.read_day("2025-06-15").column("price").to_pylist() == [0.0, 1.0, 2.0]
+    assert held.num_rows == 3
+
+    monkeypatch.setattr(forensic_store.os, "remove", real_remove)
+    del held
+    assert store.read_day("2025-06-15").num_rows == 3  # Next open deletes the leftovers
+    names = os.listdir(part_dir)
+    assert SUPERSEDED not in names
+    assert len([n for n in names if n.startswith("part-")]) == 1
+
+
+def test_crash_before_retiring_inputs_does_not_double_count(tmp_path, monkeypatch):
+    store = make_store(tmp_path)
+    for i in range(3):
+        store.append({"price": float(i)}, ts=DAY0 + i)
+        store.flush()
+    part_dir = os.path.join(str(tmp_path), "date=2025-06-15")
+
+    def crash(part_dir, names):  # Process dies right after the merged part is published
+        raise SystemExit("killed")
+    monkeypatch.setattr(store, "_retire", crash)
+    try:
+        store.compact("2025-06-15")
+    except SystemExit:
+        pass
+    assert len([n for n in os.listdir(part_dir) if n.startswith("part-")]) == 4
+    assert SUPERSEDED not in os.listdir(part_dir)
+
+    reopened = make_store(tmp_path)
+    assert reopened.read_day("2025-06-15").column("price").to_pylist() == [0.0, 1.0, 2.0]
+    names = os.listdir(part_dir)
+    assert SUPERSEDED not in names
+    assert len([n for n in names if n.startswith("part-")]) == 1
@@ -0,0 +1,56 @@
+import random
+import pytest
+from governance import (DivergenceGovernance, GovernanceBook, NewsGovernance, ai_market_state,
+                        price_market_state)
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def draw_z(rng):
+    """Mostly anomalous |z|, so counters climb to the lock as well as decay."""
+    return rng.uniform(3.0, 5.0) if rng.random() < 0.6 else rng.uniform(0.0, 3.5)
+
+
+@pytest.mark.parametrize("rule", ["news", "divergence"])
+def test_book_reports_match_the_single_desks(rule):
+    rng = random.Random(11)
+    clock = Clock(1_750_000_000.0)
+    principals = [f"trader-{i}" for i in range(6)]
+    book = GovernanceBook(principals, rule=rule, clock=clock)
+    desk_cls, evaluate = {"news": (NewsGovernance, "evaluate_human_risk"),
+                          "divergence": (DivergenceGovernance, "evaluate_risk")}[rule]
+    desks = [desk_cls(clock=clock) for _ in principals]
+    to_state = price_market_state if rule == "news" else ai_market_state
+    locks = 0
+    for _ in range(600):
+        states, signals = [], []
+        for _ in principals:  # Each principal sees its own market and signal
+            states.append(to_state(draw_z(rng)))
+            signals.append(rng.choice(("NORMAL", "WARNING", "CRITICAL")) if rule == "news"
+                           else round(rng.uniform(-0.6, 0.6), 4))
+        book.evaluate(states, signals)
+        for p, desk, state, signal in zip(principals, desks, states, signals):
+            expected = getattr(desk, evaluate)(state, signal)
+            assert book.report(p) == expected
+            locks += expected.startswith("⛔")
+        clock.now += rng.choice((5.0, 15.0, 30.0, 120.0))  # Irregular virtual clock
+    assert locks > 0  # The run reached the 300 s cooldown
+
+
+def test_divergence_scores_two_when_sentiment_is_quiet():
+    clock = Clock(0.0)
+    book = GovernanceBook(["quiet", "loud"], rule="divergence", clock=clock)
+    book.evaluate("ANOMALY", [0.1, 0.5])
+    assert book.anomaly_counter.tolist() == [2, 1]
+    transitions = [book.evaluate("ANOMALY", [0.1, 0.5]) for _ in range(2)]
+    assert transitions == [[], [("quiet", "ALERT")]]
+    clock.now += 299
+    assert book.evaluate("STABLE", [0.1, 0.5]) == [("quiet", "LOCKED")]
+    clock.now += 1
+    assert book.evaluate("STABLE", [0.1, 0.5]) == [("quiet", "NOMINAL")]
@@ -0,0 +1,81 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from kill_switch import run_kill_switch_protocol
+
+# The first chunk (4 rows) is all-integer; later chunks carry fractional profits
+CSV = """regime,profit_usd
+STABLE,10
+EXTREME,-25
+STABLE,3
+OUTLIER,-40
+STABLE,-25.5
+STABLE,7.25
+EXTREME,-60
+STABLE,12
+STABLE,-1.5
+"""
+
+
+def write_csv(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return path
+
+
+@pytest.mark.parametrize("ext", ["csv", "parquet"])
+def test_chunked_audit_matches_whole_file(tmp_path, ext):
+    data = write_csv(str(tmp_path / "regimes.csv"), CSV)
+    whole, chunked = str(tmp_path / f"whole.{ext}"), str(tmp_path / f"chunked.{ext}")
+
+    expected = run_kill_switch_protocol(data, whole)
+    result = run_kill_switch_protocol(data, chunked, chunksize=4)
+
+    assert result is not None and result == expected
+    if ext == "csv":
+        with open(whole, "rb") as a, open(chunked, "rb") as b:
+            assert a.read() == b.read()
+    read = pd.read_csv if ext == "csv" else pd.read_parquet
+    pd.testing.assert_frame_equal(read(chunked), read(whole))
+    assert not os.path.exists(chunked + ".partial")
+
+
+def test_failed_run_leaves_no_partial_audit(tmp_path):
+    # No regime column: the first chunk fails in apply_halt
+    data = write_csv(str(tmp_path / "regimes.csv"), "\n".join(l.split(",")[1] for l in CSV.splitlines()) + "\n")
+    out = str(tmp_path / "audit.csv")
+
+    assert run_kill_switch_protocol(data, out, chunksize=4) is None
+    assert not os.path.exists(out)
+    assert not os.path.exists(out + ".partial")
+
+
+def baseline_audit(data, out):
+    """The pre-streaming protocol: row-wise apply over the whole file."""
+    df = pd.read_csv(data)
+    df['mitigated_profit'] = df.apply(
+        lambda row: 0.0 if row['regime'] in ['EXTREME', 'OUTLIER'] else row['profit_usd'], axis=1)
+    df.to_csv(out, index=False)
+
+
+@pytest.mark.parametrize("text", [CSV, CSV.replace(".5", "").replace(".25", "").replace("-1.5", "-1")])
+@pytest.mark.parametrize("chunksize", [None, 4])
+def test_csv_audit_matches_the_baseline_bytes(tmp_path, text, chunksize):
+    data = write_csv(str(tmp_path / "regimes.csv"), text)
+    expected, out = str(tmp_path / "baseline.csv"), str(tmp_path / "audit.csv")
+    baseline_audit(data, expected)
+    run_kill_switch_protocol(data, out, chunksize=chunksize)
+    with open(expected, "rb") as a, open(out, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_parquet_chunks_keep_the_whole_file_dtype(tmp_path):
+    # int64 with a null in the second batch only: whole reads float64, the first batch int64
+    data = str(tmp_path / "regimes.parquet")
+    pq.write_table(pa.table({"regime": ["STABLE", "EXTREME", "STABLE", "STABLE"],
+                             "profit_usd": pa.array([47, -25, None, 3], pa.int64())}), data)
+    whole, chunked = str(tmp_path / "whole.parquet"), str(tmp_path / "chunked.parquet")
+    assert run_kill_switch_protocol(data, whole) == run_kill_switch_protocol(data, chunked, chunksize=2)
+    pd.testing.assert_frame_equal(pd.read_parquet(chunked), pd.read_parquet(whole))
@@ -0,0 +1,26 @@
+import json
+from datetime import datetime, timezone
+from replay_harness import GovernanceReplay
+
+T0 = 1_750_000_000
+
+
+def write_ticks(path, prices):
+    with open(path, "w") as f:
+        for i, price in enumerate(prices):
+            ts = datetime.fromtimestamp(T0 + 15 * i, timezone.utc).isoformat()
+            f.write(json.dumps({"timestamp": ts, "asset": "XAU", "price": price}) + "\n")
+    return str(path)
+
+
+def test_replayed_spike_halts(tmp_path):
+    calm = [2000.0 + (0.5 if i % 2 else -0.5) for i in range(60)]
+    telemetry = write_ticks(tmp_path / "ticks.jsonl", calm + [2100.0] + calm[:5])
+    decisions = tmp_path / "decisions.jsonl"
+
+    report = GovernanceReplay(decisions_path=str(decisions)).run(telemetry)
+
+    assert report["halts"] == 1 and report["halted_ticks"] >= 1
+    halts = [d for d in map(json.loads, decisions.read_text().splitlines())
+             if d["desk"] == "kill_switch" and d["report"] == "HALT"]
+    assert [(d["regime"], d["news_risk"]) for d in halts] == [("ANOMALY", "NORMAL")]
@@ -0,0 +1,76 @@
+import os
+import random
+from datetime import datetime, timezone
+import pytest
+from local_vault import SQLiteVault
+from retention import RetentionJob, default_tiers, DAY
+
+ASSETS = ("BTC", "XAU", "XAG")
+NOW = 1_750_000_000.0
+
+
+def populate(vault, n_rows=3000, days=20):
+    rng = random.Random(7)
+    t0, step = NOW - days * DAY, days * DAY / n_rows
+    rows = [{"asset": ASSETS[i % len(ASSETS)], "price": 100 + rng.gauss(0, 1), "source": "test", "stale": False,
+             "regime": rng.choice(("STABLE", "STRESS", "ANOMALY")), "z_score": round(rng.gauss(0, 1.5), 2),
+             "timestamp": datetime.fromtimestamp(t0 + i * step, timezone.utc).isoformat()} for i in range(n_rows)]
+    vault.table("multi_asset_telemetry").insert(rows).execute()
+    return n_rows
+
+
+def total_ticks(vault):
+    raw = len(vault.table("multi_asset_telemetry").select("id").execute().data)
+    return raw + sum(r["ticks"] for t in ("telemetry_bars_5m", "telemetry_bars_1h")
+                     for r in vault.table(t).select("ticks").execute().data)
+
+
+class _Crash(Exception):
+    pass
+
+
+class CrashingJob(RetentionJob):
+    """Dies after the bars of the third window are written, before its raw rows are deleted."""
+
+    def _save_checkpoint(self, tier, start, end, phase):
+        super()._save_checkpoint(tier, start, end, phase)
+        if phase == "bars_written" and self.stats["windows"] == 2:
+            raise _Crash()
+
+
+def test_resume_after_crash_conserves_every_tick(tmp_path):
+    vault = SQLiteVault()
+    n = populate(vault)
+    tiers = default_tiers(raw_days=7, bar_days=14)
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    with pytest.raises(_Crash):
+        CrashingJob(vault, tiers, checkpoint, delete_batch=50).run(NOW)
+    # The crashed window's rows are counted twice until the resume finishes its delete
+    assert total_ticks(vault) > n
+
+    report = RetentionJob(vault, tiers, checkpoint, delete_batch=50).run(NOW)
+    assert report["resumed"] == 1
+    assert report["max_rows_per_delete"] <= 50
+    assert total_ticks(vault) == n
+    oldest = vault.table("multi_asset_telemetry").select("timestamp").order("timestamp").limit(1).execute().data
+    assert datetime.fromisoformat(oldest[0]["timestamp"]).timestamp() >= NOW - 7 * DAY - 3600
+
+
+def test_rerun_is_idempotent(tmp_path):
+    vault = SQLiteVault()
+    n = populate(vault)
+    job = RetentionJob(vault, default_tiers(7, 14), str(tmp_path / "c.json"))
+    job.run(NOW)
+    bars = len(vault.table("telemetry_bars_5m").select("id").execute().data)
+    RetentionJob(vault, default_tiers(7, 14), str(tmp_path / "c.json")).run(NOW)
+    assert len(vault.table("telemetry_bars_5m").select("id").execute().data) == bars
+    assert total_ticks(vault) == n
+
+
+def test_runtime_files_follow_the_results_dir_override():
+    import metrics
+    import retention
+    results = os.environ["SENTINEL_RESULTS_DIR"]
+    assert metrics.DEFAULT_DIR == os.path.join(results, "metrics")
+    assert retention.DEFAULT_CHECKPOINT == os.path.join(results, "retention_checkpoint.json")
@@ -0,0 +1,63 @@
+import collections
+import random
+import numpy as np
+from multi_asset_fetcher import RegimeClassifier
+
+
+class DequeClassifier:
+    """The pre-ring-buffer RegimeClassifier: np.mean/np.std over a deque on every tick."""
+
+    def __init__(self, window_size=50):
+        self.buffers = collections.defaultdict(lambda: collections.deque(maxlen=window_size))
+
+    def classify(self, asset, price):
+        buffer = self.buffers[asset]
+        if len(buffer) < 20:
+            buffer.append(price)
+            return "INITIALIZING", 0.0
+        mean, std = np.mean(buffer), np.std(buffer)
+        z_score = (price - mean) / std if std > 0.000001 else 0.0
+        buffer.append(price)
+        regime = "ANOMALY" if abs(z_score) >= 3.0 else "STRESS" if abs(z_score) >= 1.5 else "STABLE"
+        return regime, round(float(z_score), 2)
+
+
+def seeded_ticks(n, seed=5):
+    """Rounds of (asset, price): random walks at very different price levels, with jumps,
+    flat stretches (the zero-std guard) and repeated quotes."""
+    rng = random.Random(seed)
+    prices = {"BTC": 64000.0, "XAU": 2350.0, "MCX_SILVER": 324000.0, "PENNY": 0.0421}
+    for i in range(n):
+        tick = []
+        for asset in prices:
+            if rng.random() < 0.15:
+                continue  # Asset missing from this tick
+            if (i // 300) % 5 == 4:
+                pass  # Flat market: the price repeats
+            elif rng.random() < 0.01:
+                prices[asset] *= 1 + rng.choice((-0.03, 0.03))
+            else:
+                prices[asset] = round(prices[asset] * (1 + rng.gauss(0, 0.0008)), 6)
+            tick.append((asset, prices[asset]))
+        yield tick
+
+
+def test_rolling_classifier_labels_match_the_deque_classifier():
+    reference = DequeClassifier()
+    single = RegimeClassifier()
+    batched = RegimeClassifier(windows=(20, 500))
+    streamed = RegimeClassifier()  # Two ticks per call: repeated assets in one micro-batch
+    labels = collections.Counter()
+    pending = []
+    for i, tick in enumerate(seeded_ticks(3000)):
+        expected = [reference.classify(a, p) for a, p in tick]
+        assert [single.classify(a, p) for a, p in tick] == expected
+        assert batched.classify_many([a for a, _ in tick], [p for _, p in tick]) == expected
+        pending.append((tick, expected))
+        if i % 2:
+            rows = [row for t, _ in pending for row in t]
+            assert streamed.classify_many([a for a, _ in rows], [p for _, p in rows]) == \
+                [score for _, e in pending for score in e]
+            pending = []
+        labels.update(label for label, _ in expected)
+    assert labels["ANOMALY"] and labels["STRESS"] and labels["STABLE"]
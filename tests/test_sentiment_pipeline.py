@@ -0,0 +1,55 @@
+import pytest
+from sentiment_pipeline import ALL, HALF_LIFE, DecayedSentiment, SentimentPipeline
+
+T0 = 1_750_000_000.0
+
+
+def fixed_probs(table):
+    """Stand-in FinBERT: [positive, negative, neutral] per headline from a lookup table."""
+    return lambda headlines: [table[h] for h in headlines]
+
+
+def test_decay_halves_weight_without_moving_the_mean():
+    book = DecayedSentiment(clock=lambda: T0)
+    book.add("XAU", -0.5, T0)
+    book.add("XAU", -0.3, T0)
+    assert book.snapshot(T0)["XAU"] == {"sentiment": -0.4, "weight": 2.0, "headlines": 2}
+    later = book.snapshot(T0 + HALF_LIFE)["XAU"]
+    assert later["weight"] == pytest.approx(1.0, abs=1e-3)
+    assert later["sentiment"] == -0.4  # No prior: quiet periods do not pull the score to 0
+
+
+def test_decay_weights_recent_headlines_more():
+    book = DecayedSentiment()
+    book.add(ALL, 1.0, T0)
+    book.add(ALL, -1.0, T0 + HALF_LIFE)
+    # The older headline carries half the weight: (0.5 - 1) / 1.5
+    assert book.snapshot(T0 + HALF_LIFE)[ALL]["sentiment"] == pytest.approx(-1 / 3, abs=1e-4)
+
+
+def test_prior_is_opt_in_shrinkage():
+    book = DecayedSentiment(prior=1.0)
+    book.add("BTC", -1.0, T0)
+    assert book.snapshot(T0)["BTC"]["sentiment"] == -0.5
+    assert book.snapshot(T0 + 10 * HALF_LIFE)["BTC"]["sentiment"] == pytest.approx(0.0, abs=1e-3)
+
+
+def test_desk_reads_the_plain_mean_of_the_current_crawl():
+    table = {"Gold rallies on rate cut bets": [0.9, 0.05, 0.05],
+             "Bitcoin slides as ETF outflows mount": [0.1, 0.8, 0.1],
+             "Markets flat ahead of payrolls": [0.2, 0.2, 0.6]}
+    clock = lambda: T0 + 4 * HALF_LIFE
+    pipeline = SentimentPipeline(fixed_probs(table), clock=clock, max_latency=0.01)
+    try:
+        # Book: one old, strongly negative headline
+        pipeline.ingest(["Bitcoin slides as ETF outflows mount"], [T0])
+        desk = pipeline.crawl_mean(list(table))
+        assert desk[ALL] == {"sentiment": round((0.85 - 0.7 + 0.0) / 3, 4), "headlines": 3}
+        assert desk["XAU"]["sentiment"] == 0.85 and desk["BTC"]["sentiment"] == -0.7
+        # A single strong headline reads at full strength, not shrunk toward 0
+        assert pipeline.crawl_mean(["Bitcoin slides as ETF outflows mount"])[ALL]["sentiment"] == -0.7
+        # Scoring the crawl leaves the decayed book alone
+        assert pipeline.snapshot()[ALL]["headlines"] == 1
+        assert pipeline.score() == -0.7
+    finally:
+        pipeline.close()
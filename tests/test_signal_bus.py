@@ -0,0 +1,68 @@
+import time
+from signal_bus import SignalBus, SEQ, SEQ_AT, STUCK_WRITE_S
+
+
+def crash_mid_write(bus):
+    """Leaves the sequence odd and the record half-updated, as a publisher killed mid-write would."""
+    seq = SEQ.unpack_from(bus._map, SEQ_AT)[0]
+    SEQ.pack_into(bus._map, SEQ_AT, seq + 1)
+    bus._map[24] = 2  # level byte -> CRITICAL, never committed
+
+
+def test_reader_survives_a_crashed_publisher(tmp_path):
+    path = str(tmp_path / "risk.bus")
+    reader = SignalBus(path)
+    before = reader.subscribe(wake=False)
+    assert reader.publish("WARNING", "quorum").level == "WARNING"
+    assert reader.read().level == "WARNING"
+
+    crash_mid_write(reader)
+    start = time.monotonic()
+    signal = reader.read()
+    assert time.monotonic() - start < STUCK_WRITE_S + 0.5
+    assert (signal.level, signal.reason) == ("WARNING", "quorum")
+
+    # The next publisher repairs the sequence and readers move on
+    writer = SignalBus(path)
+    published = writer.publish("CRITICAL", "manual halt")
+    assert SEQ.unpack_from(reader._map, SEQ_AT)[0] % 2 == 0
+    assert reader.read() == published
+    assert before.poll() == published
+    crash_mid_write(writer)
+    assert writer.publish("NORMAL", "clear").seq == published.seq + 2
+    assert reader.read().level == "NORMAL"
+
+
+def test_only_an_outside_transition_into_critical_expedites():
+    from signal_bus import Signal, halt_started
+    assert not halt_started(Signal(2, 0.0, "WARNING", "news quorum"), "NORMAL")
+    assert halt_started(Signal(3, 0.0, "CRITICAL", "manual halt"), "WARNING")
+    assert not halt_started(Signal(4, 0.0, "CRITICAL", "manual halt"), "CRITICAL")
+    assert not halt_started(Signal(5, 0.0, "CRITICAL", "news quorum"), "NORMAL", own_seq=5)
+
+
+def test_price_engine_expedites_once_per_halt():
+    import asyncio
+    from local_vault import LocalVault
+    from multi_asset_fetcher import MultiAssetPulse
+
+    async def scenario():
+        pulse = MultiAssetPulse(LocalVault(latency=0.0))
+        expedited = []
+        pulse.scheduler.wait = lambda now=None: 5.0
+        pulse.scheduler.expedite = lambda now=None: expedited.append(SignalBus().read().level)
+
+        async def no_ticks():
+            return []
+        pulse.poll = no_ticks
+        engine = asyncio.create_task(pulse.run())
+        publisher = SignalBus()
+        for level in ("NORMAL", "WARNING", "NORMAL", "CRITICAL", "CRITICAL", "NORMAL", "CRITICAL"):
+            await asyncio.sleep(0.05)
+            publisher.publish(level, "test")
+        await asyncio.sleep(0.05)
+        engine.cancel()
+        await pulse.sink.close()
+        return expedited
+
+    assert asyncio.run(scenario()) == ["CRITICAL", "CRITICAL"]
@@ -0,0 +1,30 @@
+from local_vault import SQLiteVault
+from retention import RetentionJob, default_tiers
+from telemetry_history import read_history, _epoch
+from test_retention import populate, NOW
+
+
+def test_long_range_reads_bars_then_raw_without_gaps(tmp_path):
+    vault = SQLiteVault()
+    populate(vault, n_rows=6000, days=20)
+    RetentionJob(vault, default_tiers(raw_days=7, bar_days=14), str(tmp_path / "cp.json")).run(NOW)
+
+    requests = vault.requests
+    df = read_history(vault, "BTC", 24 * 30, now=NOW)
+    assert vault.requests - requests == 3  # 1h bars, 5m bars, then the ~700 raw BTC ticks of the last 7 days
+
+    t = df["timestamp"].map(_epoch)
+    assert t.is_monotonic_increasing
+    assert t.iloc[0] < NOW - 14 * 86400      # 1-hour bars reach back past BAR_DAYS
+    assert t.iloc[-1] > NOW - 3600           # ...and raw ticks reach the present
+    assert set(df["regime"]) <= {"STABLE", "STRESS", "ANOMALY", "INITIALIZING"}
+    assert df["price"].notna().all()
+
+
+def test_short_range_reads_raw_ticks_only():
+    vault = SQLiteVault()
+    populate(vault, n_rows=600, days=2)
+    df = read_history(vault, "XAU", 24, now=NOW)
+    assert vault.requests == 2  # The insert, then one page
+    assert list(df.columns) == ["timestamp", "price", "regime"]
+    assert len(df) == 100
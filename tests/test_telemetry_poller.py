@@ -0,0 +1,70 @@
+from local_vault import LocalVault, VaultUnavailable
+from telemetry_poller import TelemetryPoller
+
+
+class FlakyPageVault(LocalVault):
+    """Fails the n-th telemetry page read after arm()."""
+
+    def __init__(self):
+        super().__init__(latency=0.0, is_async=False)
+        self.fail_at = None
+
+    def arm(self, n):
+        self.fail_at = n
+
+    def _apply_locked(self, q):
+        if self.fail_at is not None and q.table_name == "multi_asset_telemetry" and q.action == "select":
+            self.fail_at -= 1
+            if self.fail_at == 0:
+                self.fail_at = None
+                raise VaultUnavailable("page dropped")
+        return super()._apply_locked(q)
+
+
+def insert_ticks(vault, start, n):
+    vault.table("multi_asset_telemetry").insert(
+        [{"asset": "XAU", "timestamp": f"2026-01-01T00:{start + i:02d}:00+00:00", "price": 2000.0 + start + i,
+          "regime": "STABLE"} for i in range(n)]).execute()
+
+
+def test_failed_page_does_not_advance_the_cursor():
+    vault = FlakyPageVault()
+    insert_ticks(vault, 0, 10)
+    poller = TelemetryPoller(vault, page=5)
+    poller.poll_once()
+    assert poller.last_id == 10 and len(poller.buffers["XAU"]) == 10
+
+    insert_ticks(vault, 10, 12)
+    vault.arm(2)  # First page of the 12 new rows succeeds, the second fails
+    poller.poll_once()
+    assert poller.stats["errors"] == 1
+    assert poller.last_id == 10
+
+    poller.poll_once()
+    assert poller.last_id == 22
+    assert [r["id"] for r in poller.buffers["XAU"]] == list(range(1, 23))
+    assert len(poller.snapshot()[0]) == 22
+
+
+class NoAssetSentimentVault(LocalVault):
+    """A vault that never got engine/sql/003: every sentiment_by_asset request fails."""
+
+    def __init__(self):
+        super().__init__(latency=0.0, is_async=False)
+
+    def _apply_locked(self, q):
+        if q.table_name == "sentiment_by_asset":
+            raise VaultUnavailable('relation "public.sentiment_by_asset" does not exist')
+        return super()._apply_locked(q)
+
+
+def test_missing_asset_sentiment_table_keeps_the_telemetry():
+    vault = NoAssetSentimentVault()
+    insert_ticks(vault, 0, 10)
+    vault.table("sentinel_logs").insert({"sentiment": -0.3}).execute()
+    poller = TelemetryPoller(vault, page=5)
+    poller.poll_once()
+    frame, sentiment, version = poller.snapshot()
+    assert len(frame) == 10 and sentiment == -0.3 and version == 1
+    assert poller.stats["errors"] == 0 and poller.stats["asset_sentiment_errors"] == 1
+    assert poller.asset_sentiment() == {}
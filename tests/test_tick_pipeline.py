@@ -0,0 +1,17 @@
+import asyncio
+import tick_pipeline
+from tick_pipeline import ReplaySource, TickPipeline, write_synthetic_replay
+
+
+def test_latency_samples_stay_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(tick_pipeline, "LATENCY_SAMPLES", 100)
+    path = write_synthetic_replay(str(tmp_path / "replay.jsonl"), 500)
+    stored = []
+
+    async def persist(row):
+        stored.append(row)
+    pipeline = TickPipeline([ReplaySource(path)], persist=persist)
+    report = asyncio.run(pipeline.run())
+    assert report["ticks"] == len(stored) == 500
+    assert len(pipeline.latencies) == 100
+    assert report["p99_ms"] >= report["p50_ms"] >= 0.0